@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+""" Reports the bytes retained per validated record by the compact Result representation,
+compared to the dictionary list previously stored by Collection.run() and to a batch.BatchReport
+of the same results, which keeps failures but not values. Failing records have distinct values,
+so their error messages differ. Strings are shared by every representation and are not counted;
+the arguments a report keeps in place of messages are.
+
+Usage: python benchmarks/memory_bench.py [records]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from validator import batch, collection, field, result, rules
+
+def sizeof(obj, seen):
+    """ Returns the size of obj and every container it references, counting each object once. """
+    if id(obj) in seen or isinstance(obj, basestring):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(sizeof(k, seen) + sizeof(v, seen) for k, v in obj.iteritems())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(sizeof(v, seen) for v in obj)
+    elif isinstance(obj, result.Result):
+        size += sum(sizeof(getattr(obj, name), seen) for name in result.Result.__slots__)
+    elif isinstance(obj, batch.BatchReport):
+        size += sizeof(obj.tables, seen) + sizeof(obj.columns, seen) + sizeof(obj.arguments, seen)
+    elif isinstance(obj, batch.Table):
+        size += sizeof(obj.values, seen) + sizeof(obj.ids, seen)
+    return size
+
+
+def main(n):
+    schema = collection.Collection().append([
+        field.Field('username').append([
+              rules.IsRequired()
+            , rules.IsAlphaNumeric()
+            , rules.IsLengthBetween(3, 10)
+        ]),
+        field.Field('email').append([
+              rules.IsRequired()
+            , rules.IsEmail()
+        ]),
+        field.Field('password').append([
+              rules.IsRequired()
+            , rules.IsLengthBetween(2, 10)
+        ]),
+        field.Field('password-confirm').append([
+            rules.Matches('root')
+        ])
+    ]).schema()
+
+    for label, fail_every in [('passing', 0), ('10% failing', 10), ('all failing', 1)]:
+        records = [
+            {'username': 'user{:08d}'.format(i), 'email': 'foo', 'password': 'root', 'password-confirm': 'toor{}'.format(i)}
+            if fail_every and i % fail_every == 0 else
+            {'username': 'wilhelm', 'email': 'wilhelm@gmail.com', 'password': 'root', 'password-confirm': 'root'}
+            for i in xrange(n)
+        ]
+        results = [schema.validate(r) for r in records]
+
+        seen = set()
+        compact = sum(sizeof(r, seen) for r in results)
+        seen = set()
+        collated = sum(sizeof(r.results(), seen) for r in results)
+        report = sizeof(batch.BatchReport(schema.titles).extend(results), set())
+
+        print '{:<12} dict list: {:>6.0f} B/record   compact: {:>6.0f} B/record   report: {:>6.1f} B/record'.format(
+            label, float(collated) / n, float(compact) / n, float(report) / n
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+""" Compares validating an order with a 10k-item array of line items using nested.Repeated
+against flattening the order into one synthetic Field per item value.
+
+Usage: python benchmarks/nested_bench.py [items]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from validator import collection, field, nested, rules
+
+def item_fields():
+    return [
+        field.Field('sku').append([rules.IsRequired(), rules.IsAlphaNumeric(), rules.IsLengthBetween(3, 12)]),
+        field.Field('quantity').append([rules.IsRequired(), rules.IsNumeric()]),
+        field.Field('currency').append([rules.IsInList(['AUD', 'EUR', 'USD'])])
+    ]
+
+
+def flattened(order):
+    """ Builds a Collection with a Field per value, titled by its path, as done before nested fields. """
+    fields = [field.Field('id', order['id']).append([rules.IsRequired()])]
+    for i, item in enumerate(order['items']):
+        for f in item_fields():
+            f.title = 'items[{}].{}'.format(i, f.title)
+            f.value = item.get(f.title.rsplit('.', 1)[1], '')
+            fields.append(f)
+    return collection.Collection().append(fields)
+
+
+def best(function, repeat=3):
+    times = []
+    for _ in range(repeat):
+        started = time.time()
+        function()
+        times.append(time.time() - started)
+    return min(times)
+
+
+def main(n):
+    schema = collection.Collection().append([
+        field.Field('id').append([rules.IsRequired()]),
+        nested.Repeated('items', nested.Nested('item', item_fields()))
+    ]).schema()
+
+    for label, fail_every in [('passing', 0), ('10% failing', 10)]:
+        order = {'id': '1', 'items': [
+            {'sku': '', 'quantity': 'x', 'currency': 'GBP'} if fail_every and i % fail_every == 0 else
+            {'sku': 'ABC{}'.format(i), 'quantity': str(i), 'currency': 'AUD'}
+            for i in xrange(n)
+        ]}
+        flat = best(lambda: flattened(order).run())
+        tree = best(lambda: schema.validate(order))
+        print '{:<12} flattened: {:>8.1f} ms   nested: {:>8.1f} ms   speedup: {:.1f}x'.format(
+            label, flat * 1e3, tree * 1e3, flat / tree
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
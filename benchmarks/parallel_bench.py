@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+""" Compares serial validation through Collection.run_many against Collection.run_parallel for
+a range of worker counts. Speedup depends on the number of CPUs available.
+
+Usage: python benchmarks/parallel_bench.py [records] [chunk_size]
+"""
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from validator import collection, field, rules
+
+def main(n, chunk_size):
+    form = collection.Collection().append([
+        field.Field('username').append([
+              rules.IsRequired()
+            , rules.IsAlphaNumeric()
+            , rules.IsLengthBetween(3, 10)
+        ]),
+        field.Field('email').append([
+              rules.IsRequired()
+            , rules.IsEmail()
+        ]),
+        field.Field('password').append([
+              rules.IsRequired()
+            , rules.IsLengthBetween(2, 10)
+        ])
+    ])
+    records = [
+        {'username': 'user{}'.format(i), 'email': 'user{}@gmail.com'.format(i), 'password': 'root'}
+        for i in xrange(n)
+    ]
+
+    start = time.time()
+    form.run_many(records)
+    serial = time.time() - start
+    print 'serial:    {:.2f}s'.format(serial)
+
+    workers = 1
+    while workers <= multiprocessing.cpu_count():
+        start = time.time()
+        form.run_parallel(records, workers, chunk_size)
+        elapsed = time.time() - start
+        print '{:>2} workers: {:.2f}s ({:.2f}x)'.format(workers, elapsed, serial / elapsed)
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    )
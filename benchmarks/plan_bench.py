@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+""" Compares the interpreted Field.check path against a compiled Plan for passing and failing
+values.
+
+Usage: python benchmarks/plan_bench.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from validator import field, rules
+
+NUMBER = 200000
+
+def measure(fn, value):
+    return min(timeit.repeat(lambda: fn(value), number=NUMBER, repeat=3)) / NUMBER * 1e6
+
+
+def main():
+    f = field.Field('username').append([
+          rules.IsRequired()
+        , rules.IsAlphaNumeric(pass_on_blank=True)
+        , rules.IsAlpha(pass_on_blank=True)
+        , rules.IsLengthBetween(3, 10, strip=True, pass_on_blank=True)
+        , rules.IsNotInList(['root', 'admin'])
+    ])
+    p = f.compile()
+
+    print '{:<10} {:>14} {:>14} {:>14} {:>9}'.format('value', 'check (us)', 'plan (us)', 'passes (us)', 'speedup')
+    for value in ['wilhelm', 'root', 'w1lhelm']:
+        interpreted = measure(f.check, value)
+        compiled = measure(p, value)
+        passes = measure(p.passes, value)
+        print '{:<10} {:>14.3f} {:>14.3f} {:>14.3f} {:>8.2f}x'.format(
+            value, interpreted, compiled, passes, interpreted / compiled
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+""" Compares the per-call cost of compiling a regular expression on every run against the
+precompiled patterns used by rules.Regex and its derivatives.
+
+Usage: python benchmarks/regex_bench.py
+"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from validator import rules
+
+NUMBER = 200000
+
+class CompilePerCall(rules.Regex):
+    """ Reproduces the previous behaviour of compiling the expression on every call. """
+    def run(self, field_value):
+        try:
+            regex = re.compile(self.expression)
+            if not regex.match(field_value):
+                return False
+        except Exception, e:
+            raise ValueError("Expression `{}` failed with the following error: {}".format(self.expression, e))
+        return True
+
+
+def main():
+    value = 'wilhelm.murdoch@gmail.com'
+    old = CompilePerCall(rules.PATTERNS['email'].pattern)
+    new = rules.IsEmail()
+
+    before = min(timeit.repeat(lambda: old.run(value), number=NUMBER, repeat=3)) / NUMBER
+    after = min(timeit.repeat(lambda: new.run(value), number=NUMBER, repeat=3)) / NUMBER
+
+    print 'compile per call: {:.3f} us/call'.format(before * 1e6)
+    print 'precompiled:      {:.3f} us/call'.format(after * 1e6)
+    print 'speedup:          {:.2f}x'.format(before / after)
+
+
+if __name__ == '__main__':
+    main()
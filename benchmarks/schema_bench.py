@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+""" Compares the time taken to obtain 500 schemas declared as plain data: built from scratch,
+as on a cold start, loaded from pickles written by an earlier worker, and found in memory.
+
+Usage: python benchmarks/schema_bench.py [schemas]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from validator import loader
+
+def declaration(i):
+    """ Returns a distinct declaration of the README's registration form. """
+    return {
+        'username': ['IsRequired', 'IsAlphaNumeric', {'rule': 'IsLengthBetween', 'args': [3, 10 + i]}],
+        'email': ['IsRequired', 'IsEmail', {'rule': 'IsNotInList', 'args': [['root@localhost', 'admin@localhost']]}],
+        'password': ['IsRequired', {'rule': 'IsLengthBetween', 'args': [8, 64]}],
+        'country': [{'rule': 'IsInList', 'args': [['AU', 'DE', 'GB', 'NZ', 'US']], 'casefold': True, 'strip': True}],
+        'postcode': [{'rule': 'Regex', 'args': [r'^[0-9]{4,5}$'], 'pass_on_blank': True}],
+        'password-confirm': [{'rule': 'Matches', 'args': ['secret-{}'.format(i)]}]
+    }
+
+
+def timed(declarations, cache):
+    started = time.time()
+    for d in declarations:
+        loader.load(d, cache=cache)
+    return time.time() - started
+
+
+def main(n):
+    declarations = [declaration(i) for i in xrange(n)]
+    directory = tempfile.mkdtemp()
+    try:
+        cold = timed(declarations, loader.SchemaCache())
+        timed(declarations, loader.SchemaCache(directory))
+        disk = timed(declarations, loader.SchemaCache(directory))
+        cache = loader.SchemaCache()
+        timed(declarations, cache)
+        memory = timed(declarations, cache)
+    finally:
+        shutil.rmtree(directory)
+
+    print '{} schemas'.format(n)
+    print 'cold start, built:        {:>8.1f} ms'.format(cold * 1e3)
+    print 'warm start, from disk:    {:>8.1f} ms'.format(disk * 1e3)
+    print 'warm, from memory:        {:>8.1f} ms'.format(memory * 1e3)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
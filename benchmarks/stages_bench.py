@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+""" Compares a field whose rules each strip and lower-case the value themselves against the same
+field normalising the value once with stages shared by every rule.
+
+Usage: python benchmarks/stages_bench.py [values]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from validator import field, rules
+
+COUNTRIES = ['au', 'de', 'fr', 'gb', 'nz', 'us']
+
+def per_rule():
+    """ Every rule normalises the value itself, as done before normalisation stages. """
+    return field.Field('country', stop_on_first_error=False).append([
+          rules.IsRequired()
+        , rules.IsLength(2, strip=True)
+        , rules.IsLengthBetween(2, 3, strip=True)
+        , rules.IsInList(COUNTRIES, strip=True, casefold=True)
+        , rules.IsNotInList(['xx'], strip=True, casefold=True)
+    ])
+
+
+def staged():
+    """ The value is stripped and lower-cased once, and rules read the view they need. """
+    return field.Field('country', stop_on_first_error=False, normalise=['strip', 'casefold']).append([
+          rules.IsRequired()
+        , rules.IsLength(2).using('strip')
+        , rules.IsLengthBetween(2, 3).using('strip')
+        , rules.IsInList(COUNTRIES).using('casefold')
+        , rules.IsNotInList(['xx']).using('casefold')
+    ])
+
+
+def best(function, repeat=3):
+    times = []
+    for _ in range(repeat):
+        started = time.time()
+        function()
+        times.append(time.time() - started)
+    return min(times)
+
+
+def main(n):
+    values = ['  {}  '.format(COUNTRIES[i % len(COUNTRIES)].upper()) for i in xrange(n)]
+    before, after = per_rule(), staged()
+    compiled_before, compiled_after = before.compile(), after.compile()
+    assert [before.check(v)[0] for v in values[:100]] == [after.check(v)[0] for v in values[:100]]
+
+    for label, a, b in [
+        ('check', lambda: [before.check(v) for v in values], lambda: [after.check(v) for v in values]),
+        ('check_column', lambda: before.check_column(values), lambda: after.check_column(values)),
+        ('compile', lambda: [compiled_before(v) for v in values], lambda: [compiled_after(v) for v in values])
+    ]:
+        x, y = best(a), best(b)
+        print '{:<14} per rule: {:>8.1f} ms   stages: {:>8.1f} ms   speedup: {:.2f}x'.format(
+            label, x * 1e3, y * 1e3, x / y
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+""" Streams a large generator of records through Schema.stream and reports the peak resident
+set size at regular intervals. The peak should stay flat regardless of the number of records.
+
+Usage: python benchmarks/stream_bench.py [records]
+"""
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from validator import collection, field, rules
+
+def records(n):
+    for i in xrange(n):
+        if i % 1000 == 0:
+            yield {'username': 'w', 'email': 'foo'}
+        else:
+            yield {'username': 'wilhelm', 'email': 'wilhelm@gmail.com'}
+
+
+def main(n):
+    schema = collection.Collection().append([
+        field.Field('username').append([
+              rules.IsRequired()
+            , rules.IsAlphaNumeric()
+            , rules.IsLengthBetween(3, 10)
+        ]),
+        field.Field('email').append([
+              rules.IsRequired()
+            , rules.IsEmail()
+        ])
+    ]).schema()
+
+    interval = max(n // 10, 1)
+    failures = 0
+    start = time.time()
+    for index, result in schema.stream(records(n), failures_only=True):
+        failures += 1
+        if index % interval == 0:
+            print '{:>12} records: peak rss {} KB'.format(index, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+    print '{} records, {} failures in {:.1f}s, peak rss {} KB'.format(
+        n, failures, time.time() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 7)
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+""" Measures the latency of every built-in rule and the throughput of Collection.run() and
+Schema.validate() for the README's registration form, including very large lists, high failure
+rates and memory retained per record. Results are printed as JSON, mapping each benchmark to a
+measurement where lower is better, and are optionally compared against a stored baseline.
+Baselines are specific to the machine and interpreter they were recorded with.
+
+Usage: python benchmarks/suite.py [--quick] [--output results.json] [--baseline benchmarks/baseline.json] [--threshold 0.3] [--save]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from validator import batch, collection, field, index, rules
+from memory_bench import sizeof
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Fraction by which a benchmark may exceed its baseline before it is reported as a regression.
+THRESHOLD = 0.3
+
+# Number of entries in the large lists used by IsInList and IsInIndex.
+LARGE_LIST = 100000
+
+PASSING = {'username': 'wilhelm', 'email': 'wilhelm@gmail.com', 'password': 'root', 'password-confirm': 'root'}
+FAILING = {'username': 'w', 'email': 'foo', 'password': 'root', 'password-confirm': 'toor'}
+
+def form(stop_on_first_error=True):
+    """ Returns the registration form used throughout the README. """
+    return collection.Collection().append([
+        field.Field('username', stop_on_first_error=stop_on_first_error).append([
+              rules.IsRequired()
+            , rules.IsAlphaNumeric()
+            , rules.IsLengthBetween(3, 10)
+        ]),
+        field.Field('email', stop_on_first_error=stop_on_first_error).append([
+              rules.IsRequired()
+            , rules.IsEmail()
+        ]),
+        field.Field('password', stop_on_first_error=stop_on_first_error).append([
+              rules.IsRequired()
+            , rules.IsLengthBetween(2, 10)
+        ]),
+        field.Field('password-confirm', stop_on_first_error=stop_on_first_error).append([
+            rules.Matches('root')
+        ])
+    ])
+
+
+def records(n, fail_every=0, distinct=False):
+    """ Returns n records, every fail_every-th of which fails validation. Failing records have
+    distinct values, and so distinct error messages, if distinct is True. """
+    return [
+        (failing(i) if distinct else FAILING) if fail_every and i % fail_every == 0 else PASSING
+        for i in xrange(n)
+    ]
+
+
+def failing(i):
+    """ Returns a failing record whose values are unique to i. """
+    return {'username': 'user{:08d}'.format(i), 'email': 'foo', 'password': 'root', 'password-confirm': 'toor{}'.format(i)}
+
+
+def measure(function, number, repeat=5):
+    """ Returns the best time, in microseconds, of a single call to function. """
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e6
+
+
+def rule_cases(directory):
+    """ Returns a list of (name, rule, passing value, failing value) tuples covering every built-in rule. """
+    entries = ['{:06d}'.format(i) for i in xrange(LARGE_LIST)]
+    path = os.path.join(directory, 'large.idx')
+    index.build(entries, path)
+
+    return [
+        ('Matches', rules.Matches('root'), 'root', 'toor'),
+        ('Regex', rules.Regex(r'^\d{3}-\d{4}$'), '555-1234', '5551234'),
+        ('IsEmail', rules.IsEmail(), 'wilhelm@gmail.com', 'wilhelm'),
+        ('IsNumeric', rules.IsNumeric(), '1234567890', '12345abc'),
+        ('IsAlpha', rules.IsAlpha(), 'wilhelm', 'wilhelm1'),
+        ('IsAlphaNumeric', rules.IsAlphaNumeric(), 'wilhelm1', 'wilhelm!'),
+        ('IsRequired', rules.IsRequired(), 'wilhelm', ''),
+        ('IsLength', rules.IsLength(7), 'wilhelm', 'w'),
+        ('IsLength.chars', rules.IsLength(4, unit='chars'), u'ünïc'.encode('utf-8'), 'w'),
+        ('IsLengthBetween', rules.IsLengthBetween(3, 10), 'wilhelm', 'w'),
+        ('IsInList', rules.IsInList(['red', 'green', 'blue']), 'green', 'pink'),
+        ('IsInList.casefold', rules.IsInList(['red', 'green', 'blue'], True, casefold=True), ' Green ', 'pink'),
+        ('IsInList.large', rules.IsInList(entries), '054321', 'abcdef'),
+        ('IsNotInList', rules.IsNotInList(['root', 'admin']), 'wilhelm', 'root'),
+        ('IsInIndex.large', rules.IsInIndex(path), '054321', 'abcdef'),
+        ('IsType', rules.IsType(''), 'wilhelm', 1),
+    ]
+
+
+def run(quick=False):
+    """ Runs every benchmark and returns a dict mapping its name to its measurement. """
+    scale = 10 if quick else 1
+    results = {}
+
+    directory = tempfile.mkdtemp()
+    try:
+        for name, r, passing, failing in rule_cases(directory):
+            results['rule.{}.pass.us'.format(name)] = measure(lambda: r.run(passing), 100000 // scale)
+            results['rule.{}.fail.us'.format(name)] = measure(lambda: r.message(failing) if not r.run(failing) else None, 100000 // scale)
+    finally:
+        shutil.rmtree(directory)
+
+    f = form()
+    for name, record in [('pass', PASSING), ('fail', FAILING)]:
+        def validate():
+            for _field in f:
+                _field.value = record.get(_field.title, '')
+            return f.run()
+        results['collection.run.{}.us'.format(name)] = measure(validate, 20000 // scale)
+
+        def validate_fail_fast():
+            for _field in f:
+                _field.value = record.get(_field.title, '')
+            return f.run(fail_fast=True)
+        results['collection.run.fail_fast.{}.us'.format(name)] = measure(validate_fail_fast, 20000 // scale)
+
+    f = form(stop_on_first_error=False)
+    def validate_all_errors():
+        for _field in f:
+            _field.value = FAILING.get(_field.title, '')
+        f.run()
+        return f.errors()
+    results['collection.run.fail.all_errors.us'] = measure(validate_all_errors, 20000 // scale)
+
+    schema = form().schema()
+    for name, fail_every in [('pass', 0), ('fail10', 10), ('fail100', 1)]:
+        sample = records(10000 // scale, fail_every)
+        results['schema.validate.{}.us'.format(name)] = measure(
+            lambda: [schema.validate(r) for r in sample], 1
+        ) / len(sample)
+        results['schema.validate_many.{}.us'.format(name)] = measure(
+            lambda: schema.validate_many(sample), 1
+        ) / len(sample)
+
+    for name, fail_every in [('pass', 0), ('fail100', 1)]:
+        validated = [schema.validate(r) for r in records(10000 // scale, fail_every, distinct=True)]
+        seen = set()
+        results['memory.result.{}.bytes'.format(name)] = float(
+            sum(sizeof(r, seen) for r in validated)
+        ) / len(validated)
+        results['memory.report.{}.bytes'.format(name)] = float(
+            sizeof(batch.BatchReport(schema.titles).extend(validated), set())
+        ) / len(validated)
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """ Returns a list of (name, baseline, result, change) tuples for benchmarks exceeding their
+    baseline by more than the given fraction. Benchmarks missing from either side are not
+    compared; function `main` reports those missing from the baseline.
+
+    Keyword arguments:
+    results dict    -- Measurements returned by function `run`.
+    baseline dict   -- Stored measurements to compare against.
+    threshold float -- Allowed fractional increase over the baseline. (optional)
+    """
+    regressions = []
+    for name in sorted(results):
+        if name not in baseline or not baseline[name]:
+            continue
+        change = results[name] / baseline[name] - 1
+        if change > threshold:
+            regressions.append((name, baseline[name], results[name], change))
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Runs the benchmark suite.')
+    parser.add_argument('--quick', action='store_true', help='run fewer iterations')
+    parser.add_argument('--output', help='write results as JSON to this path rather than standard output')
+    parser.add_argument('--baseline', help='compare results against this JSON file')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='allowed fractional regression')
+    parser.add_argument('--save', action='store_true', help='store results as the baseline instead of comparing')
+    args = parser.parse_args(argv)
+
+    results = run(args.quick)
+    encoded = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(encoded + '\n')
+    else:
+        print encoded
+
+    path = args.baseline or BASELINE
+    if args.save:
+        with open(path, 'w') as fh:
+            fh.write(encoded + '\n')
+        return 0
+    if not args.baseline:
+        return 0
+
+    with open(path) as fh:
+        baseline = json.load(fh)
+    regressions = compare(results, baseline, args.threshold)
+    for name in sorted(set(results) - set(baseline)):
+        sys.stderr.write('MISSING    {:<45} not in baseline; record one with --save\n'.format(name))
+    for name, before, after, change in regressions:
+        sys.stderr.write('REGRESSION {:<45} {:>12.3f} -> {:>12.3f} (+{:.0%})\n'.format(name, before, after, change))
+    if regressions:
+        return 1
+    sys.stderr.write('{} benchmarks within {:.0%} of baseline\n'.format(len(results), args.threshold))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -16,6 +16,9 @@ setup(
     author_email='wilhelm.murdoch@gmail.com',
     url='https://github.com/wilhelm-murdoch/validator',
     packages=find_packages(exclude=['tests', 'tests.*']),
+    extras_require={
+        'numpy': ['numpy']
+    },
     setup_requires=[
           'nose==1.3.1'
         , 'yanc==0.2.4'
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+from validator import batch, collection, field, nested, result, rules
+import json
+import StringIO
+import sys
+import unittest
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.collection = collection.Collection().append([
+            field.Field('username', stop_on_first_error=False).append([
+                  rules.IsRequired()
+                , rules.IsAlphaNumeric()
+                , rules.IsLengthBetween(3, 10)
+            ]),
+            field.Field('email').append([
+                  rules.IsRequired()
+                , rules.IsEmail()
+            ])
+        ])
+        self.schema = self.collection.schema()
+        self.records = [
+            {'username': 'wilhelm', 'email': 'wilhelm@gmail.com'},
+            {'username': 'w!', 'email': 'foo'},
+            {'username': 'wilhelm', 'email': 'foo'},
+            {'username': 'wilhelm'}
+        ]
+
+    def test_table(self):
+        t = batch.Table(['a', 'b'])
+        self.assertEquals(t.intern('b'), 1)
+        self.assertEquals(t.intern('c'), 2)
+        self.assertEquals(t.intern('a'), 0)
+        self.assertEquals(len(t), 3)
+        self.assertEquals(t[2], 'c')
+
+    def test_report_matches_results(self):
+        report = self.schema.report(iter(self.records), chunk_size=3)
+        results = self.schema.validate_many(self.records)
+        self.assertEquals(len(report), 4)
+        self.assertEquals(report.failed(), [1, 2, 3])
+        for i, r in enumerate(results):
+            self.assertEquals(report.errors(i), r.errors())
+            self.assertEquals(report.codes(i), r.codes())
+        self.assertEquals(list(report.failures()), [(i, r.errors()) for i, r in enumerate(results) if not r.passed])
+
+    def test_interned(self):
+        report = self.schema.report(self.records * 100)
+        self.assertEquals(len(report.columns['rows']), 500)
+        self.assertEquals(len(report.tables['templates']), 4)
+        self.assertEquals(report.columns['rows'].typecode, 'I')
+        self.assertEquals(report.counts(), {
+            'username': {'alpha_numeric': 100, 'length_between': 100},
+            'email': {'email': 200, 'required': 100}
+        })
+
+    def test_distinct_values(self):
+        records = [{'username': 'user{:08d}'.format(i), 'email': 'foo'} for i in xrange(1000)]
+        report = self.schema.report(records)
+        self.assertEquals(len(report.tables['templates']), 2)
+        self.assertEquals(report.errors(7), self.schema.validate(records[7]).errors())
+        self.assertEquals(report.errors(7)['username'], ['String `user00000007` length is not within `3` and `10`'])
+
+    def test_formatted_when_added(self):
+        class IsFoo(rules.IsRequired):
+            def message(self, field_value):
+                return 'Not foo: {}'.format(field_value)
+
+        s = collection.Collection().append([
+            field.Field('foo').append(IsFoo()),
+            field.Field('bar').append(rules.IsType(0)),
+            nested.Nested('baz', [field.Field('qux').append(rules.IsLength(3))])
+        ]).schema()
+        record = {'foo': '', 'bar': 'a', 'baz': {'qux': 'ab'}}
+        report = s.report([record])
+        self.assertEquals(report.errors(0), s.validate(record).errors())
+        self.assertEquals(report.codes(0), s.validate(record).codes())
+        self.assertEquals(report.errors(0)['foo'], ['Not foo: '])
+
+        fh = StringIO.StringIO()
+        report.dump(fh)
+        fh.seek(0)
+        self.assertEquals(batch.BatchReport.load(fh).errors(0), report.errors(0))
+
+    def test_messages_without_failures(self):
+        report = batch.BatchReport()
+        report.add(result.Result(('a', 'b'), (1, 2), [None, ['Custom error.']]))
+        self.assertEquals(report.errors(0), {'b': ['Custom error.']})
+        self.assertEquals(report.codes(0), {'b': [None]})
+
+    def test_write_jsonl(self):
+        fh = StringIO.StringIO()
+        report = self.collection.run_report(self.records)
+        self.assertEquals(report.write_jsonl(fh), 3)
+        lines = [json.loads(line) for line in fh.getvalue().splitlines()]
+        self.assertEquals([line['row'] for line in lines], [1, 2, 3])
+        self.assertEquals(lines[2]['errors'], {'email': ['This field requires a value.']})
+
+        streamed = StringIO.StringIO()
+        self.assertEquals(batch.write_jsonl(self.schema.stream(self.records), streamed), 3)
+        self.assertEquals(streamed.getvalue(), fh.getvalue())
+
+    def test_dump_and_load(self):
+        report = self.schema.report(self.records)
+        fh = StringIO.StringIO()
+        report.dump(fh)
+        fh.seek(0)
+        loaded = batch.BatchReport.load(fh)
+        self.assertEquals(len(loaded), 4)
+        for i in xrange(4):
+            self.assertEquals(loaded.errors(i), report.errors(i))
+        self.assertEquals(loaded.counts(), report.counts())
+        self.assertRaises(ValueError, batch.BatchReport.load, StringIO.StringIO('nope'))
+
+    def test_load_other_byteorder(self):
+        report = self.schema.report(self.records)
+        expected = report.errors(1)
+        for column in report.columns.values():
+            column.byteswap()
+        byteorder = sys.byteorder
+        sys.byteorder = 'big' if byteorder == 'little' else 'little'
+        try:
+            fh = StringIO.StringIO()
+            report.dump(fh)
+        finally:
+            sys.byteorder = byteorder
+        fh.seek(0)
+        loaded = batch.BatchReport.load(fh)
+        self.assertEquals(loaded.failed(), [1, 2, 3])
+        self.assertEquals(loaded.errors(1), expected)
+
+    def test_load_other_itemsize(self):
+        report = self.schema.report(self.records)
+        offsets = report.columns['offsets']
+        report.columns['offsets'] = batch.array.array('I' if offsets.itemsize == 8 else 'L', offsets)
+        fh = StringIO.StringIO()
+        report.dump(fh)
+        fh.seek(0)
+        loaded = batch.BatchReport.load(fh)
+        self.assertEquals(loaded.columns['offsets'].itemsize, offsets.itemsize)
+        self.assertEquals(list(loaded.failures()), list(self.schema.report(self.records).failures()))
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+from validator import cache, collection, field, rule, rules
+import pickle
+import unittest
+
+class Counting(rule.Rule):
+    pure = True
+
+    def __init__(self):
+        super(Counting, self).__init__('Not foo.')
+        self.calls = 0
+
+    def run(self, field_value):
+        self.calls += 1
+        return field_value == 'foo'
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CacheTest(unittest.TestCase):
+    def test_hits_and_misses(self):
+        c = cache.RuleCache()
+        r = Counting()
+
+        self.assertTrue(c.run(r, 'foo'))
+        self.assertTrue(c.run(r, 'foo'))
+        self.assertFalse(c.run(r, 'bar'))
+        self.assertFalse(c.run(r, 'bar'))
+
+        self.assertEquals(r.calls, 2)
+        self.assertEquals(c.stats(), {'hits': 2, 'misses': 2, 'evictions': 0, 'size': 2})
+
+    def test_keyed_by_rule_and_type(self):
+        c = cache.RuleCache()
+        r = rules.IsType(False)
+
+        self.assertTrue(c.run(r, True))
+        self.assertFalse(c.run(r, 1))
+        self.assertFalse(c.run(rules.IsType(''), 1))
+        self.assertEquals(c.stats()['misses'], 3)
+
+    def test_lru_eviction(self):
+        c = cache.RuleCache(2)
+        r = Counting()
+
+        c.run(r, 'a')
+        c.run(r, 'b')
+        c.run(r, 'a')
+        c.run(r, 'c')
+        c.run(r, 'a')
+
+        self.assertEquals(r.calls, 3)
+        self.assertEquals(c.stats(), {'hits': 2, 'misses': 3, 'evictions': 1, 'size': 2})
+        self.assertRaises(ValueError, cache.RuleCache, 0)
+
+    def test_ttl(self):
+        clock = Clock()
+        c = cache.RuleCache(ttl=10, clock=clock)
+        r = Counting()
+
+        c.run(r, 'foo')
+        clock.now = 9
+        c.run(r, 'foo')
+        clock.now = 10
+        c.run(r, 'foo')
+
+        self.assertEquals(r.calls, 2)
+        self.assertEquals(c.stats(), {'hits': 1, 'misses': 2, 'evictions': 1, 'size': 1})
+
+    def test_impure_and_unhashable(self):
+        c = cache.RuleCache()
+        r = Counting()
+        r.pure = False
+
+        c.run(r, 'foo')
+        c.run(r, 'foo')
+        c.run(rules.IsInList([[1]]), [1])
+
+        self.assertEquals(r.calls, 2)
+        self.assertEquals(c.stats()['size'], 0)
+
+    def test_field(self):
+        c = cache.RuleCache()
+        r = Counting()
+        f = field.Field('foo', 'bar', cache=c).append([rules.IsRequired(), r])
+
+        self.assertEquals(f.run(), (False, ['Not foo.']))
+        self.assertEquals(f.run(), (False, ['Not foo.']))
+        self.assertFalse(f.passes('bar'))
+        self.assertEquals([p for p, _ in f.check_column(['foo', 'bar', 'foo'])], [True, False, True])
+        self.assertEquals(r.calls, 2)
+
+    def test_schema(self):
+        c = cache.RuleCache()
+        s = collection.Collection().append(
+            field.Field('email', cache=c).append(rules.IsEmail())
+        ).schema()
+
+        for _ in range(3):
+            s.validate({'email': 'wilhelm@gmail.com'})
+        self.assertEquals(c.stats()['hits'], 2)
+
+    def test_pickle(self):
+        c = cache.RuleCache(10, 60)
+        c.run(rules.IsRequired(), 'foo')
+
+        c = pickle.loads(pickle.dumps(c))
+        self.assertEquals((c.size, c.ttl), (10, 60))
+        self.assertEquals(c.stats()['size'], 0)
+        self.assertTrue(c.run(rules.IsRequired(), 'foo'))
@@ -101,3 +101,68 @@ class CollectionTest(unittest.TestCase):
             if f['field'] == 'foo':
                 self.assertFalse(f['passed'])
                 self.assertEquals(len(f['errors']), 1)
+
+
+    def test_run_many(self):
+        records = [
+            {'username': 'wilhelm', 'email': 'wilhelm@gmail.com', 'password': 'root', 'password-confirm': 'root'},
+            {'username': 'w', 'email': 'foo', 'password': 'root', 'password-confirm': 'toor'},
+            {'username': 'wilhelm'}
+        ]
+
+        r = self.c.run_many(iter(records))
+
+        self.assertEquals(len(r), 3)
+        self.assertTrue(r[0].passed)
+        self.assertIsNone(r[0].errors())
+        self.assertEquals(len(r[0].results()), 4)
+        self.assertFalse(r[1].passed)
+        self.assertEquals(r[1].errors(), {
+            'username': ['String `w` length is not within `3` and `10`'],
+            'email': ['This is not a valid email address.'],
+            'password-confirm': ['Values `toor` and `root` do not match.']
+        })
+        self.assertEquals(sorted(r[2].errors().keys()), ['email', 'password', 'password-confirm'])
+
+        for record, res in zip(records, r):
+            self.assertEquals(res.results(), self.c.schema().validate(record).results())
+
+    def test_run_fail_fast(self):
+        self.assertTrue(self.c.run(fail_fast=True))
+        self.assertIsNone(self.c.errors())
+
+        self.c[1].value = 'foo'
+        self.c[3].value = 'toor'
+        self.assertFalse(self.c.run(fail_fast=True))
+        self.assertEquals(self.c.order().stats()['skipped'], 3)
+
+        self.assertFalse(self.c.run(fail_fast=True, priority=['email']))
+        self.assertEquals(self.c.order().order[0], 1)
+        self.assertEquals(self.c.order().stats()['skipped_rules'], 6)
+
+        self.assertFalse(self.c.run())
+        self.assertEquals(sorted(self.c.errors()), ['email', 'password-confirm'])
+        self.assertRaises(ValueError, self.c.run, True, True)
+
+    def test_order_rebuilt(self):
+        o = self.c.order(['email'])
+        self.assertIs(self.c.order(), o)
+        self.c.append(field.Field('foo', 'bar'))
+        self.assertIsNot(self.c.order(), o)
+        self.assertEquals(self.c.order().priority, ['email'])
+
+    def test_cross_field(self):
+        self.c[3].rules = []
+        self.c[3].append(rules.EqualsField('password'))
+        self.assertTrue(self.c.run())
+
+        self.c[3].value = 'toor'
+        self.assertFalse(self.c.run())
+        self.assertEquals(self.c.errors(), {'password-confirm': ['Value of `toor` does not match field `password`']})
+        self.assertFalse(self.c.run(fail_fast=True))
+        self.assertFalse(self.c.run_async())
+        self.assertEquals(self.c.codes(), {'password-confirm': ['equals_field']})
+
+        self.c[2].value = ''
+        self.assertFalse(self.c.run())
+        self.assertEquals(sorted(self.c.errors()), ['password'])
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+from validator import collection, columns, field, rules
+import array
+import unittest
+
+class ColumnsTest(unittest.TestCase):
+    def setUp(self):
+        self.values = ['', ' ', 'abc', ' abc ', '123', '12a', 'AU', ' au', 'abcdefghijk', '12\n', u'caf\xe9', u'\xb2']
+        self.rules = [
+              rules.IsLength(3)
+            , rules.IsLength(3, True, pass_on_blank=True)
+            , rules.IsLengthBetween(1, 4)
+            , rules.IsLengthBetween(1, 4, strip=True, pass_on_blank=True)
+            , rules.IsNumeric()
+            , rules.IsNumeric(pass_on_blank=True)
+            , rules.IsAlpha()
+            , rules.IsAlphaNumeric()
+            , rules.IsInList(['AU', 'abc'])
+            , rules.IsInList(['AU', 'abc'], strip=True, casefold=True)
+            , rules.IsInList(['AU', 'abc'], normalise=lambda v: v.upper())
+            , rules.IsInList([])
+            , rules.IsType(u'')
+            , rules.IsType(0, pass_on_blank=True)
+            , rules.IsEmail()
+        ]
+        self.c = collection.Collection().append([
+            field.Field('username').append([rules.IsAlphaNumeric(), rules.IsLengthBetween(3, 10)]),
+            field.Field('age').append(rules.IsType(0)),
+        ])
+
+    def test_mask_list(self):
+        for r in self.rules:
+            self.assertEquals(columns.mask(r, self.values), [r.run(v) for v in self.values])
+
+    def test_mask_array(self):
+        r = rules.IsInList([1, 2, 3])
+        self.assertEquals(columns.mask(r, array.array('i', [1, 4, 3])), [True, False, True])
+
+    def test_run_columns(self):
+        report = self.c.run_columns({
+            'username': ['wilhelm', 'w', 'root!', 'root'],
+            'age': array.array('l', [30, 40, 50, 60])
+        })
+
+        self.assertEquals(len(report), 4)
+        self.assertEquals(report.passed, [True, False, False, True])
+        self.assertEquals(report.failed(), [1, 2])
+        self.assertEquals(report.errors(), {'username': [1, 2]})
+
+    def test_run_columns_missing_and_length(self):
+        report = self.c.run_columns({'username': ['wilhelm']})
+        self.assertEquals(report.errors(), {'age': [0]})
+
+        self.assertRaises(ValueError, self.c.run_columns, {'username': ['a'], 'age': [1, 2]})
+
+
+@unittest.skipIf(columns.numpy is None, 'numpy is not installed')
+class NumpyColumnsTest(ColumnsTest):
+    def test_mask_numpy(self):
+        numpy = columns.numpy
+
+        for dtype in ('U', 'S'):
+            values = [v for v in self.values if dtype == 'U' or not isinstance(v, unicode)]
+            a = numpy.array(values, dtype=dtype)
+            for r in self.rules:
+                m = columns.mask(r, a)
+                self.assertEquals(m.dtype, bool)
+                self.assertEquals(m.tolist(), [r.run(v) for v in a.tolist()], (dtype, type(r).__name__))
+
+    def test_mask_numpy_casefold(self):
+        numpy = columns.numpy
+        r = rules.IsInList([u'\xe9cole'.encode('utf-8')], casefold=True)
+        values = [u'\xc9COLE'.encode('utf-8'), 'ecole', '\xff']
+        self.assertEquals(columns.mask(r, numpy.array(values[:2], dtype='S')).tolist(), [True, False])
+        self.assertEquals(columns.mask(r, numpy.array(values, dtype='S')).tolist(), [True, False, False])
+
+    def test_mask_numpy_mixed_entries(self):
+        numpy = columns.numpy
+        r = rules.IsInList([u'M\xfcnchen', 'Berlin', u'K\xf6ln'.encode('utf-8'), u'Paris'])
+        for dtype in ('U', 'S'):
+            values = ['Berlin', 'Paris', u'M\xfcnchen'.encode('utf-8'), 'Rome']
+            if dtype == 'U':
+                values = [v.decode('utf-8') for v in values] + [u'M\xfcnchen']
+            self.assertEquals(
+                columns.mask(r, numpy.array(values, dtype=dtype)).tolist(),
+                [r.run(v) for v in values],
+                dtype
+            )
+        report = collection.Collection().append(field.Field('city').append(r)).run_columns({'city': numpy.array(['Berlin'])})
+        self.assertEquals(report.failed(), [])
+
+    def test_mask_numpy_typed(self):
+        numpy = columns.numpy
+        a = numpy.array([1, 2, 3])
+
+        self.assertEquals(columns.mask(rules.IsType(0), a).tolist(), [True] * 3)
+        self.assertEquals(columns.mask(rules.IsType(''), a).tolist(), [False] * 3)
+        self.assertEquals(columns.mask(rules.IsInList([1, 3]), a).tolist(), [True, False, True])
+        self.assertEquals(columns.mask(rules.IsType(0), numpy.array([1, 'a'], dtype=object)).tolist(), [True, False])
+
+    def test_run_columns_numpy(self):
+        numpy = columns.numpy
+        report = self.c.run_columns({
+            'username': numpy.array(['wilhelm', 'w', 'root!', 'root']),
+            'age': numpy.array([30, 40, 50, 60])
+        })
+
+        self.assertEquals(report.passed.tolist(), [True, False, False, True])
+        self.assertEquals(report.failed(), [1, 2])
+        self.assertEquals({k: v.tolist() for k, v in report.errors().items()}, {'username': [1, 2]})
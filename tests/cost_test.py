@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+from validator import cost, field, profiler, rule, rules, schema
+import pickle
+import unittest
+
+class Counting(rule.Rule):
+    def __init__(self, passed, cost=10):
+        super(Counting, self).__init__('Failed.')
+        self.passed = passed
+        self.cost = cost
+        self.calls = 0
+
+    def run(self, field_value):
+        self.calls += 1
+        return self.passed
+
+
+class CostTest(unittest.TestCase):
+    def test_static_order(self):
+        f = field.Field('email', reorder='cost').append([
+              rules.IsEmail()
+            , rules.IsRequired()
+            , rules.IsLengthBetween(3, 10)
+        ])
+
+        self.assertEquals(f.order().order, [1, 2, 0])
+        self.assertEquals(f.check('ab'), (False, ['This is not a valid email address.']))
+        self.assertEquals(f.check('a@b.com'), (True, []))
+        self.assertEquals(f.check('abc'), (False, ['This is not a valid email address.']))
+        self.assertEquals(f.order().stats(), {
+            'validations': 3,
+            'executions': 9,
+            'saved': -4,
+            'order': [1, 2, 0]
+        })
+
+    def test_ties_keep_declared_order(self):
+        f = field.Field('foo', reorder='cost').append([Counting(True), Counting(True), Counting(False, 1)])
+        self.assertEquals(f.order().order, [2, 0, 1])
+
+    def test_declared_order(self):
+        self.assertIsNone(field.Field('foo').order())
+        self.assertIsNone(field.Field('foo', None, False, reorder='cost').order())
+        self.assertRaises(ValueError, field.Field, 'foo', reorder='fast')
+
+    def test_adaptive(self):
+        rare, common = Counting(True), Counting(False)
+        f = field.Field('foo', reorder='adaptive').append([rare, common])
+        f.order().interval = 10
+
+        for _ in range(10):
+            self.assertFalse(f.passes('foo'))
+        self.assertEquals(rare.calls, 10)
+        self.assertEquals(f.order().order, [1, 0])
+
+        for _ in range(10):
+            self.assertFalse(f.passes('foo'))
+        self.assertEquals(rare.calls, 10)
+        self.assertEquals(f.order().stats()['saved'], 10)
+
+    def test_append_resets_order(self):
+        f = field.Field('foo', reorder='cost').append(rules.IsEmail())
+        self.assertEquals(f.order().order, [0])
+
+        f.append(rules.IsRequired())
+        self.assertEquals(f.order().order, [1, 0])
+        self.assertIsNone(f.copy().cost_order)
+
+    def test_matches_column_and_plan(self):
+        f = field.Field('foo', reorder='cost').append([
+              rules.IsAlpha()
+            , rules.IsLength(3)
+            , rules.IsInList(['abc', 'abcd', '12'])
+        ])
+        values = ['abc', 'abcd', '12', 'a1', '']
+        p = f.compile()
+
+        self.assertEquals(f.check_column(values), [f.check(v) for v in values])
+        self.assertEquals([p(v) for v in values], [f.check(v) for v in values])
+
+    def test_errors_in_declared_order(self):
+        f = field.Field('foo', reorder='adaptive').append([rules.IsLengthBetween(3, 10), rules.IsInList(['aaaaa'])])
+        f.order().interval = 10
+        expected = (False, ['String `x` length is not within `3` and `10`'])
+        self.assertEquals(f.check('x'), expected)
+        for _ in range(20):
+            f.check('bbbbb')
+        self.assertEquals(f.order().order, [1, 0])
+
+        values = ['x', 'bbbbb', 'aaaaa']
+        self.assertEquals(f.check('x'), expected)
+        self.assertEquals(f.check_column(values), [expected, (False, ['Value of `bbbbb` is not within the list']), (True, [])])
+        with profiler.profile():
+            self.assertEquals(f.check('x'), expected)
+
+        f = field.Field('email', reorder='cost').append([
+            rules.IsEmail(), rules.IsRequired(), rules.IsLengthBetween(3, 10)
+        ])
+        p = f.compile()
+        self.assertIn('earlier_', p.source)
+        values = ['ab', '', 'abc', 'a@b.com', 'abcdefghijklm']
+        self.assertEquals([p(v) for v in values], [f.check(v) for v in values])
+        self.assertEquals(p('ab'), (False, ['This is not a valid email address.']))
+
+    def test_saved_counts_rules_run_early(self):
+        f = field.Field('foo', reorder='cost').append([rules.Regex('^a'), rules.IsLengthBetween(1, 5)])
+        self.assertEquals(f.order().order, [1, 0])
+        for _ in range(10):
+            self.assertFalse(f.passes('bb'))
+        self.assertEquals(f.order().stats()['saved'], -10)
+
+    def test_column_records(self):
+        rare, common = Counting(True), Counting(False)
+        f = field.Field('foo', reorder='adaptive').append([rare, common])
+        f.order().interval = 10
+
+        self.assertEquals(f.check_column(['foo'] * 10), [(False, ['Failed.'])] * 10)
+        self.assertEquals(f.order().stats(), {'validations': 10, 'executions': 20, 'saved': 0, 'order': [1, 0]})
+        f.check_column(['foo'] * 5)
+        self.assertEquals(rare.calls, 15)
+        self.assertEquals(f.order().stats()['saved'], 0)
+
+    def test_pickle_used_order(self):
+        f = field.Field('foo', reorder='adaptive').append([rules.IsRequired(), rules.IsEmail()])
+        s = schema.Schema([f])
+        self.assertFalse(s.validate({'foo': 'bar'}).passed)
+
+        c = pickle.loads(pickle.dumps(s))
+        self.assertEquals(c.fields[0].order().stats(), s.fields[0].order().stats())
+        self.assertFalse(c.validate({'foo': 'bar'}).passed)
+        self.assertEquals(c.fields[0].order().stats()['validations'], 2)
+
+    def test_probability(self):
+        c = cost.CostOrder([rules.IsRequired()])
+        self.assertEquals(c.probability(0), 0.5)
+
+    def test_fail_fast_order(self):
+        fields = [
+            field.Field('email').append([rules.IsRequired(), rules.IsEmail()]),
+            field.Field('confirm').append([rules.Matches('root')]),
+            field.Field('username').append([rules.IsRequired(), rules.IsAlpha(), rules.IsLengthBetween(3, 10)])
+        ]
+        self.assertEquals(cost.FailFast(fields).order, [1, 2, 0])
+        self.assertEquals(cost.FailFast(fields, ['username']).order, [2, 1, 0])
+        self.assertEquals(cost.FailFast(fields, lambda f: -len(f.rules)).order, [2, 0, 1])
+
+    def test_fail_fast_counters(self):
+        fields = [
+            field.Field('email').append([rules.IsRequired(), rules.IsEmail()]),
+            field.Field('confirm').append([rules.Matches('root')])
+        ]
+        c = cost.FailFast(fields)
+        self.assertTrue(c.passes(['foo@bar.com', 'root']))
+        self.assertFalse(c.passes(['foo@bar.com', 'toor']))
+        self.assertFalse(c.passes(['foo', 'root']))
+        self.assertEquals(c.stats(), {
+            'validations': 3, 'failures': 2, 'checked': 5, 'skipped': 1, 'skipped_rules': 2, 'order': [1, 0]
+        })
+
+        c = pickle.loads(pickle.dumps(c))
+        self.assertEquals(c.stats()['validations'], 0)
+        self.assertEquals(c.order, [1, 0])
@@ -99,3 +99,16 @@ class FieldTest(unittest.TestCase):
         r2 = self.f.rules[0]
 
         self.assertEquals(type(r1), type(r2))
+
+
+    def test_check_column(self):
+        values = ['wilhelm', '123', '', '1234567']
+
+        for stop_on_first_error in (True, False):
+            f = field.Field('username', None, stop_on_first_error).append([
+                  rules.IsRequired()
+                , rules.IsNumeric()
+                , rules.IsLengthBetween(1, 4)
+            ])
+
+            self.assertEquals(f.check_column(values), [f.check(v) for v in values])
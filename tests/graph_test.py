@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+from validator import collection, columns, field, graph, rules, schema
+import pickle
+import unittest
+
+class GraphTest(unittest.TestCase):
+    def setUp(self):
+        self.fields = [
+            field.Field('confirm').append([rules.IsRequired(), rules.EqualsField('password')]),
+            field.Field('password').append([rules.IsRequired(), rules.IsLengthBetween(4, 10)]),
+            field.Field('phone').append(rules.AtLeastOneOf(['email'])),
+            field.Field('email').append(rules.IsEmail(pass_on_blank=True))
+        ]
+
+    def test_relations_kept_apart(self):
+        self.assertEquals(len(self.fields[0].rules), 1)
+        self.assertEquals(len(self.fields[0].relations), 1)
+        self.assertEquals(self.fields[0].check('toor'), (True, []))
+        self.assertEquals(len(self.fields[0].copy().relations), 1)
+
+    def test_order(self):
+        g = graph.Graph(self.fields)
+        self.assertEquals(g.dependencies, [(1,), (), (3,), ()])
+        self.assertEquals(g.order, (0, 2))
+
+        fields = [
+            field.Field('a').append(rules.EqualsField('b')),
+            field.Field('b').append(rules.EqualsField('c')),
+            field.Field('c')
+        ]
+        self.assertEquals(graph.Graph(fields).order, (1, 0))
+
+    def test_unknown_and_circular(self):
+        self.assertRaises(ValueError, graph.Graph, [field.Field('a').append(rules.EqualsField('b'))])
+        self.assertRaises(ValueError, graph.Graph, [
+            field.Field('a').append(rules.EqualsField('b')),
+            field.Field('b').append(rules.EqualsField('a'))
+        ])
+
+    def test_relate(self):
+        s = schema.Schema(self.fields)
+        self.assertTrue(s.validate({'confirm': 'root', 'password': 'root', 'email': 'a@b.com'}).passed)
+        self.assertTrue(s.passes({'confirm': 'root', 'password': 'root', 'phone': '555'}))
+
+        r = s.validate({'confirm': 'toor', 'password': 'root'})
+        self.assertEquals(r.errors(), {
+            'confirm': ['Value of `toor` does not match field `password`'],
+            'phone': ['This field requires a value if none of `email` are given']
+        })
+        self.assertEquals(r.codes(), {'confirm': ['equals_field'], 'phone': ['at_least_one_of']})
+        self.assertFalse(s.passes({'confirm': 'toor', 'password': 'root', 'phone': '555'}))
+
+    def test_skipped_if_dependency_failed(self):
+        s = schema.Schema(self.fields)
+        r = s.validate({'confirm': 'ro', 'password': 'ro', 'email': 'foo'})
+        self.assertEquals(sorted(r.codes()), ['email', 'password'])
+        self.assertEquals(r.codes()['password'], ['length_between'])
+
+    def test_validate_many(self):
+        s = schema.Schema(self.fields)
+        records = [
+            {'confirm': 'root', 'password': 'root', 'phone': '555'},
+            {'confirm': 'toor', 'password': 'root', 'phone': '555'},
+            {'confirm': 'root', 'password': 'root'}
+        ]
+        self.assertEquals(
+            [r.codes() for r in s.validate_many(records)],
+            [s.validate(r).codes() for r in records]
+        )
+        self.assertEquals(pickle.loads(pickle.dumps(s)).graph.order, (0, 2))
+
+    def test_columns(self):
+        report = collection.Collection().append(self.fields).run_columns({
+            'confirm': ['root', 'toor', 'ro'],
+            'password': ['root', 'root', 'ro'],
+            'phone': ['555', '', ''],
+            'email': ['', 'a@b.com', '']
+        })
+        self.assertEquals(report.errors(), {'confirm': [1], 'password': [2], 'phone': [2]})
+
+    @unittest.skipIf(columns.numpy is None, 'numpy is not installed')
+    def test_columns_numpy(self):
+        numpy = columns.numpy
+        report = collection.Collection().append(self.fields).run_columns({
+            'confirm': numpy.array(['root', 'toor']),
+            'password': numpy.array(['root', 'root']),
+            'phone': numpy.array(['555', '555'])
+        })
+        self.assertEquals({k: list(v) for k, v in report.errors().items()}, {'confirm': [1]})
+
+    def test_views(self):
+        s = schema.Schema([
+            field.Field('pw').append(rules.IsRequired()),
+            field.Field('confirm', normalise=['strip', 'casefold']).append(rules.EqualsField('pw').using('strip'))
+        ])
+        self.assertTrue(s.validate({'pw': 'a', 'confirm': ' a '}).passed)
+        self.assertTrue(s.passes({'pw': 'a', 'confirm': ' a '}))
+        self.assertEquals(s.validate({'pw': 'a', 'confirm': ' A '}).errors(), {
+            'confirm': ['Value of `A` does not match field `pw`']
+        })
+        self.assertFalse(s.passes({'pw': 'a', 'confirm': ' A '}))
+        self.assertEquals(s.graph.positions, [(), (1,)])
+
+        report = s.validate_columns({'pw': ['a', 'a'], 'confirm': [' a ', 'A']})
+        self.assertEquals(report.errors(), {'confirm': [1]})
+        self.assertRaises(ValueError, field.Field('confirm').append, rules.EqualsField('pw').using('strip'))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+from validator import index, rules
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+class IndexTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'codes.idx')
+        self.entries = ['3000', '2000', '6000', '2000', u'caf\xe9', 'SW1A 1AA']
+        index.build(self.entries, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_contains(self):
+        i = index.SortedIndex(self.path)
+
+        self.assertEquals(len(i), 5)
+        for entry in self.entries:
+            self.assertIn(entry, i)
+        for entry in ['', '1000', '30000', '300', 'zzz', u'cafe', 3000, None]:
+            self.assertNotIn(entry, i)
+        i.close()
+
+    def test_empty(self):
+        index.build([], self.path)
+        self.assertNotIn('foo', index.SortedIndex(self.path))
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as fh:
+            fh.write('not an index')
+        self.assertRaises(ValueError, index.SortedIndex, self.path)
+        self.assertRaises(TypeError, index.build, ['foo', 1], self.path)
+
+    def test_pickle(self):
+        i = pickle.loads(pickle.dumps(index.SortedIndex(self.path)))
+        self.assertIn('SW1A 1AA', i)
+
+    def test_main(self):
+        source = os.path.join(self.dir, 'codes.txt')
+        with open(source, 'wb') as fh:
+            fh.write('Foo\n bar \r\n\nBAZ\n')
+
+        self.assertEquals(index.main([source, self.path]), 0)
+        self.assertEquals(len(index.SortedIndex(self.path)), 3)
+        self.assertIn(' bar ', index.SortedIndex(self.path))
+
+        self.assertEquals(index.main(['--strip', '--casefold', source, self.path]), 0)
+        self.assertIn('bar', index.SortedIndex(self.path))
+        self.assertIn('foo', index.SortedIndex(self.path))
+
+    def test_casefold(self):
+        self.assertEquals(index.casefold('GrEeN'), 'green')
+        self.assertEquals(index.casefold(u'GrEeN'), u'green')
+        self.assertEquals(index.casefold(u'\xc9COLE'), u'\xe9cole')
+        self.assertEquals(index.casefold(u'\xc9COLE'.encode('utf-8')), u'\xe9cole'.encode('utf-8'))
+        self.assertEquals(index.casefold('\xc9COLE'), '\xc9cole')
+
+    def test_casefold_non_ascii(self):
+        source = os.path.join(self.dir, 'names.txt')
+        with open(source, 'wb') as fh:
+            fh.write(u'\xc9cole\n'.encode('utf-8'))
+        self.assertEquals(index.main(['--casefold', source, self.path]), 0)
+
+        r = rules.IsInIndex(self.path, casefold=True)
+        self.assertTrue(r.run(u'\xc9cole'))
+        self.assertTrue(r.run(u'\xc9cole'.encode('utf-8')))
+        self.assertTrue(r.run(u'\xc9COLE'.encode('utf-8')))
+        self.assertFalse(r.run('\xc9cole'))
+
+        l = rules.IsInList([u'\xc9cole'.encode('utf-8')], casefold=True)
+        self.assertTrue(l.run(u'\xe9COLE'.encode('utf-8')))
+        self.assertEquals(index.casefold('\xff\xfeA'), '\xff\xfea')
+
+    def test_is_in_index(self):
+        r = rules.IsInIndex(self.path)
+        self.assertTrue(r.run('3000'))
+        self.assertFalse(r.run('4000'))
+        self.assertEquals(r.message('4000'), 'Value of `4000` is not within the list')
+        self.assertEquals(r.run_column(['3000', '4000', u'caf\xe9']), [True, False, True])
+
+        r = rules.IsInIndex(index.SortedIndex(self.path), strip=True, pass_on_blank=True)
+        self.assertTrue(r.run(' 3000 '))
+        self.assertTrue(r.run(' '))
+        self.assertEquals(r.run_column([' 3000', '4000', ' ']), [True, False, True])
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+from validator import loader, rule, rules
+import collections
+import os
+import shutil
+import tempfile
+import unittest
+
+DECLARATION = '''{
+    "username": ["IsRequired", "IsAlphaNumeric", {"rule": "IsLengthBetween", "args": [3, 10]}],
+    "email": {"stop_on_first_error": false, "rules": ["IsRequired", "IsEmail"]},
+    "country": [{"rule": "IsInList", "args": [["AU", "DE"]], "casefold": true, "pass_on_blank": true}]
+}'''
+
+class LoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_build(self):
+        s = loader.load(DECLARATION, cache=loader.SchemaCache())
+        self.assertEquals(s.titles, ('username', 'email', 'country'))
+        self.assertFalse(s[1].stop_on_first_error)
+        self.assertEquals([type(r) for r in s[0].rules], [rules.IsRequired, rules.IsAlphaNumeric, rules.IsLengthBetween])
+        self.assertEquals((s[0].rules[2].minimum, s[0].rules[2].maximum), (3, 10))
+        self.assertTrue(s[2].rules[0].casefold)
+
+        self.assertTrue(s.validate({'username': 'wilhelm', 'email': 'foo@bar.com', 'country': 'de'}))
+        self.assertEquals(s.validate({'username': 'w', 'email': '', 'country': ''}).codes(), {
+            'username': ['length_between'], 'email': ['required', 'email']
+        })
+
+    def test_order(self):
+        declaration = collections.OrderedDict([('b', ['IsRequired']), ('a', ['IsRequired'])])
+        cache = loader.SchemaCache()
+        self.assertEquals(cache.load(declaration).titles, ('b', 'a'))
+        self.assertEquals(cache.load([('b', ['IsRequired']), ('a', ['IsRequired'])]).titles, ('b', 'a'))
+        self.assertEquals(cache.load({'b': ['IsRequired'], 'a': ['IsRequired']}).titles, ('a', 'b'))
+
+    def test_memory_cache(self):
+        cache = loader.SchemaCache()
+        s = cache.load(DECLARATION)
+        self.assertIs(cache.load(DECLARATION), s)
+        self.assertIsNot(cache.load(DECLARATION, missing=None), s)
+        self.assertEquals(cache.stats(), {'hits': 1, 'loads': 0, 'builds': 2, 'size': 2})
+
+        cache.clear()
+        self.assertIsNot(cache.load(DECLARATION), s)
+
+    def test_disk_cache(self):
+        s = loader.SchemaCache(self.directory).load(DECLARATION)
+        self.assertEquals(len(os.listdir(self.directory)), 1)
+
+        cache = loader.SchemaCache(self.directory)
+        loaded = cache.load(DECLARATION)
+        self.assertEquals(cache.stats()['loads'], 1)
+        self.assertEquals(loaded.titles, s.titles)
+        record = {'username': 'w', 'email': 'foo', 'country': 'XX'}
+        self.assertEquals(loaded.validate(record).results(), s.validate(record).results())
+
+    def test_unwritable_directory(self):
+        path = os.path.join(self.directory, 'file')
+        open(path, 'w').close()
+        cache = loader.SchemaCache(os.path.join(path, 'schemas'))
+        self.assertEquals(cache.load(DECLARATION).titles, ('username', 'email', 'country'))
+        self.assertEquals(cache.stats()['builds'], 1)
+        self.assertEquals(os.listdir(self.directory), ['file'])
+
+    def test_corrupt_file(self):
+        cache = loader.SchemaCache(self.directory)
+        key = loader.digest(loader.parse(DECLARATION))
+        with open(cache.path(key), 'wb') as fh:
+            fh.write('merp')
+        self.assertEquals(cache.load(DECLARATION).titles, ('username', 'email', 'country'))
+        self.assertEquals(cache.stats()['builds'], 1)
+
+    def test_invalid(self):
+        cache = loader.SchemaCache()
+        self.assertRaises(ValueError, cache.load, {'foo': ['IsMerp']})
+        self.assertRaises(ValueError, cache.load, {'foo': [{'args': [1]}]})
+        self.assertRaises(ValueError, cache.load, {'foo': {'rules': [], 'merp': True}})
+
+    def test_register(self):
+        class IsFoo(rule.Rule):
+            def run(self, field_value):
+                return field_value == 'foo'
+
+        loader.register(IsFoo)
+        try:
+            s = loader.SchemaCache().load({'foo': ['IsFoo']})
+            self.assertTrue(s.passes({'foo': 'foo'}))
+        finally:
+            del loader.REGISTRY['IsFoo']
+        self.assertRaises(TypeError, loader.register, object)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+from validator import collection, field, nested, rules
+import pickle
+import unittest
+
+class NestedTest(unittest.TestCase):
+    def setUp(self):
+        self.item = nested.Nested('item', [
+            field.Field('sku').append([rules.IsRequired(), rules.IsAlphaNumeric()]),
+            field.Field('quantity').append([rules.IsNumeric()])
+        ])
+        self.order = nested.Nested('order', [
+            field.Field('id').append([rules.IsRequired()]),
+            nested.Nested('address', [field.Field('postcode').append([rules.IsNumeric(), rules.IsLength(4)])], required=False),
+            nested.Repeated('items', self.item).append([rules.IsLengthBetween(1, 3)]),
+            nested.Repeated('tags', field.Field('tag').append([rules.IsAlpha()]), required=False)
+        ])
+
+    def test_passes(self):
+        value = {'id': '1', 'items': [{'sku': 'a1', 'quantity': '2'}], 'tags': ['red']}
+        self.assertTrue(self.order.passes(value))
+        self.assertEquals(self.order.check(value), (True, []))
+
+    def test_paths(self):
+        value = {
+            'id': '',
+            'address': {'postcode': 'abc'},
+            'items': [{'sku': 'a1', 'quantity': '2'}, {'sku': '', 'quantity': 'x'}, {'sku': 'b!', 'quantity': '1'}],
+            'tags': ['red', '1']
+        }
+        self.assertFalse(self.order.passes(value))
+        passed, errors = self.order.check(value)
+        self.assertFalse(passed)
+        self.assertEquals([e.path for e in errors], [
+            ('order', 'id'),
+            ('order', 'address', 'postcode'),
+            ('order', 'items', 1, 'sku'),
+            ('order', 'items', 1, 'quantity'),
+            ('order', 'items', 2, 'sku'),
+            ('order', 'tags', 1)
+        ])
+        self.assertEquals([e.code for e in errors], ['required', 'numeric', 'required', 'numeric', 'alpha_numeric', 'alpha'])
+        self.assertEquals(errors[3], 'order.items[1].quantity: ' + rules.IsNumeric().message('x'))
+        self.assertIs(errors[2].location.parent, errors[3].location.parent)
+
+    def test_stop_on_first_error(self):
+        items = nested.Repeated('items', self.item, stop_on_first_error=True)
+        passed, errors = items.check([{'sku': 'a1'}, {'sku': ''}, {'sku': ''}])
+        self.assertEquals([e.path for e in errors], [('items', 1, 'sku')])
+
+        item = nested.Nested('item', self.item.fields, stop_on_first_error=True)
+        passed, errors = item.check({'sku': '', 'quantity': 'x'})
+        self.assertEquals(len(errors), 1)
+
+    def test_containers(self):
+        passed, errors = self.order.check({'id': '1', 'items': 'merp'})
+        self.assertEquals([(e.path, e.code) for e in errors], [(('order', 'items'), 'list')])
+
+        passed, errors = self.order.check({'id': '1', 'items': []})
+        self.assertEquals([(e.path, e.code) for e in errors], [(('order', 'items'), 'length_between')])
+
+        passed, errors = self.order.check('merp')
+        self.assertEquals([(e.path, e.code) for e in errors], [(('order',), 'dict')])
+
+    def test_collection(self):
+        c = collection.Collection().append([field.Field('user', 'wilhelm').append([rules.IsAlpha()]), self.order])
+        self.order.value = {'id': '1', 'items': [{'sku': '', 'quantity': '1'}]}
+        self.assertFalse(c.run())
+        self.assertEquals(c.codes(), {'order': ['required']})
+        self.assertEquals(c.errors(), {'order': ['order.items[0].sku: ' + rules.IsRequired().error]})
+
+        s = c.schema()
+        records = [{'user': 'w', 'order': {'id': '1', 'items': [{'sku': 'a'}]}}, {'user': 'w', 'order': {}}]
+        self.assertEquals([r.codes() for r in s.validate_many(records)], [None, {'order': ['required', 'list']}])
+        self.assertEquals(pickle.loads(pickle.dumps(s)).validate(records[1]).codes(), {'order': ['required', 'list']})
+
+    def test_cross_field(self):
+        account = nested.Nested('account', [
+            field.Field('pw').append([rules.IsRequired()]),
+            field.Field('confirm').append([rules.EqualsField('pw')])
+        ])
+        self.assertTrue(account.passes({'pw': 'a', 'confirm': 'a'}))
+        self.assertFalse(account.passes({'pw': 'a', 'confirm': 'b'}))
+
+        passed, errors = account.check({'pw': 'a', 'confirm': 'b'})
+        self.assertFalse(passed)
+        self.assertEquals([e.path for e in errors], [('account', 'confirm')])
+        self.assertEquals(errors[0].code, 'equals_field')
+
+        passed, errors = account.check({'pw': '', 'confirm': 'b'})
+        self.assertEquals([e.path for e in errors], [('account', 'pw')])
+
+        users = nested.Repeated('users', account)
+        self.assertEquals([e.path for e in users.check([{'pw': 'a', 'confirm': 'a'}, {'pw': 'a'}])[1]], [
+            ('users', 1, 'confirm')
+        ])
+        self.assertFalse(pickle.loads(pickle.dumps(account)).passes({'pw': 'a', 'confirm': 'b'}))
+
+    def test_item_must_be_field(self):
+        self.assertRaises(TypeError, nested.Repeated, 'items', rules.IsRequired())
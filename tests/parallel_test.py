@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+from validator import collection, field, parallel, rule, rules
+import pickle
+import threading
+import time
+import unittest
+
+class LookupService(object):
+    """ Fake blocking lookup service that records how many lookups run at the same time. """
+    def __init__(self, taken, delay=0.05):
+        self.taken = set(taken)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+
+    def exists(self, value):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.calls.append(value)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return value in self.taken
+
+
+class IsUnique(rule.AsyncRule):
+    def __init__(self, service, error='`{}` is already taken.', pass_on_blank=False):
+        super(IsUnique, self).__init__(error, pass_on_blank)
+        self.service = service
+
+    def run(self, field_value):
+        return not self.service.exists(field_value)
+
+    def message(self, field_value):
+        return self.error.format(field_value)
+
+
+class IsCallingThread(rule.Rule):
+    def __init__(self):
+        super(IsCallingThread, self).__init__('Not run inline.')
+        self.thread = threading.current_thread()
+
+    def run(self, field_value):
+        return threading.current_thread() is self.thread
+
+
+class ParallelTest(unittest.TestCase):
+    def setUp(self):
+        self.c = collection.Collection().append([
+            field.Field('username').append([
+                  rules.IsRequired()
+                , rules.IsAlphaNumeric()
+                , rules.IsLengthBetween(3, 10)
+            ]),
+            field.Field('email').append([
+                  rules.IsRequired()
+                , rules.IsEmail()
+            ]),
+            field.Field('country').append([
+                rules.IsInList(['AU', 'DE', 'US'])
+            ]),
+        ])
+        self.records = [
+            {'username': 'user{}'.format(i), 'email': 'foo' if i % 7 == 0 else 'user@gmail.com', 'country': 'AU'}
+            for i in range(250)
+        ]
+
+    def test_chunks(self):
+        self.assertEquals(list(parallel.chunks(iter(range(7)), 3)), [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEquals(list(parallel.chunks([], 3)), [])
+        self.assertRaises(ValueError, list, parallel.chunks([1], 0))
+
+    def test_pickle(self):
+        s = pickle.loads(pickle.dumps(self.c.schema(), pickle.HIGHEST_PROTOCOL))
+
+        for record in self.records[:10]:
+            self.assertEquals(s.validate(record).results(), self.c.schema().validate(record).results())
+
+    def test_run_parallel(self):
+        r = self.c.run_parallel(iter(self.records), workers=2, chunk_size=16)
+
+        self.assertEquals(len(r), len(self.records))
+        self.assertEquals(
+            [res.results() for res in r],
+            [res.results() for res in self.c.run_many(self.records)]
+        )
+        self.assertEquals([i for i, res in enumerate(r) if not res.passed], range(0, 250, 7))
+
+
+    def test_run_async(self):
+        service = LookupService(['taken'])
+        c = collection.Collection().append([
+            field.Field('f{}'.format(i), 'taken' if i == 2 else 'free{}'.format(i)).append([
+                  rules.IsRequired()
+                , IsUnique(service)
+            ])
+            for i in range(4)
+        ] + [
+            field.Field('inline', 'foo').append(IsCallingThread())
+        ])
+
+        start = time.time()
+        r = c.run_async(True, max_concurrency=4)
+        elapsed = time.time() - start
+
+        self.assertTrue(elapsed < service.delay * 3)
+        self.assertEquals(service.peak, 4)
+        self.assertEquals([f['field'] for f in r], ['f0', 'f1', 'f2', 'f3', 'inline'])
+        self.assertEquals(c.errors(), {'f2': ['`taken` is already taken.']})
+        self.assertEquals(r, c.run(True))
+
+    def test_run_async_max_concurrency(self):
+        service = LookupService([], 0.01)
+        s = collection.Collection().append([
+            field.Field('f{}'.format(i)).append(IsUnique(service))
+            for i in range(6)
+        ]).schema()
+
+        self.assertTrue(s.validate_async({}, max_concurrency=2))
+        self.assertEquals(service.peak, 2)
+        self.assertEquals(len(service.calls), 6)
+        self.assertRaises(ValueError, s.validate_async, {}, 0)
+
+    def test_thread_pool_shared(self):
+        s = collection.Collection().append(
+            field.Field('f').append(IsUnique(LookupService([], 0)))
+        ).schema()
+        pool = parallel.thread_pool(3)
+        self.assertTrue(parallel.thread_pool(3) is pool)
+        self.assertFalse(parallel.thread_pool(2) is pool)
+
+        start = time.time()
+        for _ in range(20):
+            self.assertTrue(s.validate_async({}, max_concurrency=3))
+        self.assertTrue(time.time() - start < 0.5)
+        self.assertTrue(parallel.thread_pool(3) is pool)
+
+    def test_run_async_stop_on_first_error(self):
+        service = LookupService([])
+        c = collection.Collection().append([
+            field.Field('foo', '').append([
+                  rules.IsRequired()
+                , IsUnique(service)
+            ]),
+            field.Field('bar', 'bar', False).append([
+                  rules.IsNumeric()
+                , IsUnique(service)
+            ])
+        ])
+
+        self.assertFalse(c.run_async())
+        self.assertEquals(service.calls, ['bar'])
+        self.assertEquals(c.errors(), {
+            'foo': ['This field requires a value.'],
+            'bar': ['This is not a number.']
+        })
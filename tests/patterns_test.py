@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+from validator import field, patterns, rules
+import re
+import unittest
+import warnings
+
+class PatternsTest(unittest.TestCase):
+    def test_engine(self):
+        e = patterns.engine([rules.PATTERNS['alpha'], rules.PATTERNS['numeric'], re.compile('^f')])
+        self.assertIs(patterns.engine([rules.PATTERNS['alpha'], rules.PATTERNS['numeric'], re.compile('^f')]), e)
+        self.assertEquals(len(e), 3)
+        self.assertEquals(e.scan('foo'), ('foo', None, 'f'))
+        self.assertEquals(e.failed('123'), [0, 2])
+        self.assertEquals(e.failed(''), [2])
+        self.assertEquals(e.failed(u'bar'), [1, 2])
+
+    def test_not_combinable(self):
+        self.assertRaises(ValueError, patterns.Engine, [])
+        self.assertRaises(ValueError, patterns.Engine, [re.compile('^(a)\\1$'), re.compile('^a')])
+        self.assertRaises(ValueError, patterns.Engine, [re.compile('^a', re.I), re.compile('^a')])
+        self.assertRaises(ValueError, patterns.Engine, [re.compile('^a # comment', re.X)])
+
+    def test_backtracking(self):
+        for expression in [r'^(a+)+$', r'^(\w+\s?)*$', r'^(\d+)*$', r'^(\w|\d)+$', r'(?i)^(?:[A-Z]+a)+$',
+                           r'^(a|aa)+$', r'^(?:\d|\d\d)+$']:
+            self.assertTrue(patterns.backtracking(re.compile(expression)), expression)
+        for expression in [r'^(?:[a-z]+\.)+[a-z]+$', r'^(ab|cd)+$', r'^([a-z]+,)*[a-z]+$', r'^\d{3}-\d{4}$',
+                           r'^(a|ab)*$', r'^(?:ab|a)*$', r'^(?:a|b)?c+$']:
+            self.assertEquals(patterns.backtracking(re.compile(expression)), [], expression)
+        for regex in rules.PATTERNS.values():
+            self.assertEquals(patterns.backtracking(regex), [])
+
+    def test_warning_and_budget(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            rules.Regex(r'^(a+)+$')
+            rules.IsEmail()
+            r = rules.Regex(r'^(a+)+$', max_length=10)
+        self.assertEquals([w.category for w in caught], [patterns.BacktrackingWarning])
+
+        self.assertTrue(r.run('aaaa'))
+        self.assertFalse(r.run('a' * 11))
+        self.assertEquals(r.run_column(['aaaa', 'a' * 40 + '!']), [True, False])
+
+        f = field.Field('foo').append([rules.IsRequired(), r])
+        p = f.compile()
+        self.assertEquals(p('a' * 40 + '!'), f.check('a' * 40 + '!'))
+        self.assertNotIn('regex_1', p.source)
+
+    def test_plan_scans_merged_failures(self):
+        f = field.Field('foo', stop_on_first_error=False).append([
+            rules.IsAlphaNumeric(), rules.IsAlpha(), rules.Regex('^[a-z]'), rules.Regex('^.{3,12}$')
+        ])
+        p = f.compile()
+        self.assertEquals(p.source.count('scanned = '), 1)
+        for v in ['wilhelm', 'wilhelm1', '1!', 'W', '']:
+            self.assertEquals(p(v), f.check(v))
+            self.assertEquals(p.passes(v), f.passes(v))
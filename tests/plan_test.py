@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+from validator import cache, field, plan, rule, rules
+import unittest
+
+class IsFoo(rule.Rule):
+    def __init__(self, pass_on_blank=False):
+        super(IsFoo, self).__init__('Not foo.', pass_on_blank)
+
+    def run(self, field_value):
+        if self.pass_on_blank and not field_value.strip():
+            return True
+        return field_value == 'foo'
+
+
+def outcome(function, value):
+    """ Returns what function returns for value, or the type of exception it raises. """
+    try:
+        return function(value)
+    except Exception as e:
+        return type(e)
+
+
+class PlanTest(unittest.TestCase):
+    def setUp(self):
+        self.values = ['', ' ', 'foo', ' foo ', 'abc', '123', 'AU', ' au', 'a@b.com', 'abcdefghijkl']
+        self.rules = [
+              rules.IsRequired()
+            , rules.IsAlphaNumeric(pass_on_blank=True)
+            , rules.IsNumeric(pass_on_blank=True)
+            , rules.IsAlpha()
+            , rules.IsLengthBetween(3, 10, strip=True)
+            , rules.IsLength(3, pass_on_blank=True)
+            , rules.IsInList(['AU', 'foo'], strip=True)
+            , rules.IsNotInList(['abc'])
+            , rules.Matches('foo', pass_on_blank=True)
+            , rules.IsType('')
+            , rules.IsEmail()
+            , rules.Regex('^(a)+$')
+            , IsFoo(True)
+        ]
+
+    def assertPlanMatches(self, f):
+        p = f.compile()
+
+        self.assertEquals(type(p), plan.Plan)
+        for v in self.values:
+            self.assertEquals(p(v), f.check(v))
+            self.assertEquals(p.passes(v), f.check(v)[0])
+
+    def test_matches_interpreted(self):
+        for stop_on_first_error in (True, False):
+            for i in range(len(self.rules)):
+                for j in range(i, len(self.rules) + 1):
+                    self.assertPlanMatches(
+                        field.Field('foo', None, stop_on_first_error).append(self.rules[i:j])
+                    )
+
+    def test_all_pass(self):
+        f = field.Field('foo').append([rules.IsRequired(), rules.IsAlpha(), rules.IsLength(3)])
+        p = f.compile()
+
+        self.assertTrue(p.passes('foo'))
+        self.assertEquals(p('foo'), (True, []))
+
+    def test_merges_adjacent_regex(self):
+        p = field.Field('foo').append([
+              rules.IsRequired()
+            , rules.IsAlphaNumeric()
+            , rules.IsAlpha()
+            , rules.Regex('^f')
+            , rules.IsLength(3)
+            , rules.IsAlpha(pass_on_blank=True)
+            , rules.IsAlphaNumeric(pass_on_blank=True)
+        ]).compile()
+
+        self.assertEquals([len(s['rules']) for s in p.steps], [1, 3, 1, 2])
+        self.assertEquals(p('foo'), (True, []))
+        self.assertEquals(p('fo1'), (False, ['This is not an alpha-only string.']))
+        self.assertEquals(p('boo'), (False, ['Could not match `boo` with expression `^f`']))
+
+    def test_does_not_merge_groups(self):
+        p = field.Field('foo').append([rules.Regex('^(a)\\1$'), rules.IsAlpha()]).compile()
+
+        self.assertEquals(len(p.steps), 2)
+        self.assertTrue(p.passes('aa'))
+
+    def test_hoists_strip(self):
+        p = field.Field('foo', None, False).append([
+              rules.IsAlpha(pass_on_blank=True)
+            , rules.IsLength(3, True, pass_on_blank=True)
+            , rules.IsLengthBetween(1, 3, strip=True)
+        ]).compile()
+
+        self.assertEquals(p.source.count('value.strip()'), 4)
+        self.assertNotIn('not value.strip()', p.source)
+        for value in ['', ' ', ' ab ', 'abcd', ' abcd ']:
+            self.assertEquals(p(value), p.field.check(value))
+
+    def test_non_string_values(self):
+        cases = [
+            (rules.IsLength(3, pass_on_blank=True), [None, 0, '', ' ', 'abc']),
+            (rules.IsLength(3, True, pass_on_blank=True), [None, 0, '', ' ', ' abc ']),
+            (rules.IsType(0, pass_on_blank=True), [0, 1, None, '', 'a']),
+            (rules.IsInList([0, 1], pass_on_blank=True), [0, 1, 2, None])
+        ]
+        for r, values in cases:
+            for stop_on_first_error in (True, False):
+                f = field.Field('foo', None, stop_on_first_error).append(r)
+                p = f.compile()
+                for value in values:
+                    self.assertEquals(outcome(p, value), outcome(f.check, value))
+                    self.assertEquals(outcome(p.passes, value), outcome(f.passes, value))
+
+    def test_snapshot(self):
+        f = field.Field('foo').append(rules.IsRequired())
+        p = f.compile()
+        f.append(rules.IsNumeric())
+
+        self.assertTrue(p.passes('abc'))
+        self.assertFalse(f.passes('abc'))
+
+    def test_cache(self):
+        c = cache.RuleCache()
+        p = field.Field('foo', cache=c).append([rules.IsRequired(), rules.IsAlpha()]).compile()
+
+        self.assertTrue(p.passes('abc'))
+        self.assertEquals(p('abc'), (True, []))
+        self.assertEquals(c.stats()['hits'], 2)
+
+    def test_bytes_like_values(self):
+        f = field.Field('foo', stop_on_first_error=False).append([
+            rules.IsRequired(), rules.IsNumeric(pass_on_blank=True), rules.IsLength(3, True, unit='chars')
+        ])
+        p = f.compile()
+        for value in ['123', ' 12 ', 'abc', ' ', u'ü12'.encode('utf-8')]:
+            for wrap in [str, bytearray, memoryview]:
+                self.assertEquals(p(wrap(value)), f.check(wrap(value)))
+                self.assertEquals(p.passes(wrap(value)), f.passes(wrap(value)))
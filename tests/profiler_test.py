@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+from validator import collection, field, profiler, rules
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.form = collection.Collection().append([
+            field.Field('username', 'wilhelm').append([rules.IsRequired(), rules.IsAlpha()]),
+            field.Field('email', 'foo', stop_on_first_error=False).append([rules.IsEmail(), rules.IsLength(3)])
+        ])
+
+    def tearDown(self):
+        profiler.disable()
+
+    def test_disabled(self):
+        self.assertIs(profiler.sink, None)
+        self.assertFalse(self.form.run())
+
+    def test_profile(self):
+        with profiler.profile() as timings:
+            self.assertFalse(self.form.run())
+            self.assertFalse(self.form.run())
+        self.assertIs(profiler.sink, None)
+
+        stats = dict(((s['kind'], s['name']), s) for s in timings.stats())
+        self.assertEquals(sorted(stats), [
+            ('field', 'email'), ('field', 'username'),
+            ('rule', 'IsAlpha'), ('rule', 'IsEmail'), ('rule', 'IsLength'), ('rule', 'IsRequired')
+        ])
+        self.assertEquals(stats['rule', 'IsEmail']['calls'], 2)
+        self.assertEquals(stats['rule', 'IsEmail']['failed'], 2)
+        self.assertEquals(stats['rule', 'IsLength']['passed'], 2)
+        self.assertEquals(stats['field', 'email']['failed'], 2)
+        self.assertEquals(stats['field', 'username']['passed'], 2)
+        self.assertTrue(stats['field', 'email']['p99'] >= stats['field', 'email']['p50'] > 0)
+
+        self.assertEquals([s['kind'] for s in timings.stats('rule')], ['rule'] * 4)
+        self.assertEquals(len(profiler.report(timings, 2).splitlines()), 3)
+
+    def test_same_results(self):
+        expected = self.form.run(True)
+        many = self.form.schema().validate_many([{'username': 'w1', 'email': 'foo@bar.com'}])
+        with profiler.profile():
+            self.assertEquals(self.form.run(True), expected)
+            self.assertEquals(
+                self.form.schema().validate_many([{'username': 'w1', 'email': 'foo@bar.com'}])[0].results(),
+                many[0].results()
+            )
+
+    def test_cost_order(self):
+        f = field.Field('foo', reorder='adaptive').append([rules.IsEmail(), rules.IsRequired()])
+        with profiler.profile() as timings:
+            self.assertEquals(f.check(''), (False, [rules.IsEmail().message('')]))
+        self.assertEquals(f.order().stats()['validations'], 1)
+        self.assertEquals(sorted(s['name'] for s in timings.stats('rule')), ['IsEmail', 'IsRequired'])
+
+    def test_percentile(self):
+        self.assertEquals(profiler.percentile([], 0.5), 0.0)
+        self.assertEquals(profiler.percentile(range(101), 0.5), 50)
+        self.assertEquals(profiler.percentile(range(101), 0.99), 99)
+
+        t = profiler.Timing(10)
+        for i in range(100):
+            t.add(i, True)
+        self.assertEquals(len(t.samples), 10)
+        self.assertEquals(t.stats()['calls'], 100)
+
+    def test_prometheus_file(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'validator.prom')
+            with profiler.profile(profiler.PrometheusFile(path, interval=0)):
+                self.form.run()
+            text = open(path).read()
+            self.assertIn('# TYPE validator_rule_seconds summary', text)
+            self.assertIn('validator_rule_seconds_count{rule="IsEmail"} 1', text)
+            self.assertIn('validator_field_outcomes_total{field="email",outcome="failed"} 1', text)
+            self.assertEquals(os.listdir(directory), ['validator.prom'])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_prometheus_file_threads(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'validator.prom')
+            sink = profiler.PrometheusFile(path, interval=0)
+            schema = self.form.schema()
+            errors = []
+            def validate():
+                try:
+                    for _ in range(50):
+                        schema.validate({'username': 'wilhelm', 'email': 'foo'})
+                except Exception as e:
+                    errors.append(e)
+            with profiler.profile(sink):
+                threads = [threading.Thread(target=validate) for _ in range(8)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+            self.assertEquals(errors, [])
+            self.assertEquals(os.listdir(directory), ['validator.prom'])
+
+            sink.path = os.path.join(directory, 'missing', 'validator.prom')
+            with profiler.profile(sink):
+                schema.validate({})
+            self.assertRaises(OSError, sink.write)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_label(self):
+        self.assertEquals(profiler.label('a"b\\c\n'), 'a\\"b\\\\c\\n')
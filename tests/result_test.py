@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from validator import collection, field, result, rules
+import pickle
+import unittest
+
+class ResultTest(unittest.TestCase):
+    def setUp(self):
+        self.r = result.Result(('username', 'email'), ['wilhelm', 'foo'], [None, ['This is not a valid email address.']])
+
+    def test_results(self):
+        self.assertFalse(self.r)
+        self.assertEquals(len(self.r), 2)
+        self.assertEquals(self.r.results(), [
+            {'field': 'username', 'value': 'wilhelm', 'passed': True, 'errors': None},
+            {'field': 'email', 'value': 'foo', 'passed': False, 'errors': ['This is not a valid email address.']}
+        ])
+        self.assertIs(self.r.results(), self.r.results())
+        self.assertEquals(self.r[1]['field'], 'email')
+        self.assertEquals([f['field'] for f in self.r], ['username', 'email'])
+
+    def test_errors(self):
+        self.assertEquals(self.r.errors(), {'email': ['This is not a valid email address.']})
+        self.assertIsNone(result.Result(('username',), ['wilhelm'], [None]).errors())
+
+    def test_form(self):
+        self.assertEquals(self.r.form(), {'username': 'wilhelm', 'email': 'foo'})
+
+    def test_slots(self):
+        c = collection.Collection().append(
+            field.Field('foo', 'bar').append([
+                  rules.IsRequired()
+                , rules.IsEmail()
+                , rules.IsLengthBetween(1, 2)
+                , rules.IsInList(['bar'])
+            ])
+        )
+        c.run()
+
+        for obj in [self.r, c, c.result, c[0]] + c[0].rules:
+            self.assertFalse(hasattr(obj, '__dict__'))
+
+    def test_pickle(self):
+        c = collection.Collection().append(
+            field.Field('foo', 'bar').append([rules.IsRequired(), rules.IsEmail()])
+        )
+        c.run()
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            p = pickle.loads(pickle.dumps(c, protocol))
+            self.assertEquals(p.errors(), c.errors())
+            self.assertEquals(p.run(True), c.run(True))
+            self.assertEquals(pickle.loads(pickle.dumps(self.r, protocol)).results(), self.r.results())
+
+    def test_codes(self):
+        f = field.Field('email').append([rules.IsRequired(), rules.IsEmail()])
+        c = collection.Collection().append([f])
+        f.value = 'foo'
+
+        self.assertEquals(c.codes(), None)
+        c.run()
+        self.assertEquals(c.codes(), {'email': ['email']})
+        self.assertEquals(c.errors(), {'email': [rules.IsEmail().message('foo')]})
+        self.assertEquals(self.r.codes(), {'email': [None]})
+
+        f.value = 'foo@bar.com'
+        c.run()
+        self.assertEquals(c.codes(), None)
@@ -4,4 +4,40 @@ import unittest
 
 class RuleTest(unittest.TestCase):
     def test_raises_notimplemented_error(self):
-        self.assertRaises(NotImplementedError, rule.Rule().run, None)
\ No newline at end of file
+        self.assertRaises(NotImplementedError, rule.Rule().run, None)
+
+    def test_run_column_falls_back_to_run(self):
+        class IsFoo(rule.Rule):
+            def run(self, field_value):
+                return field_value == 'foo'
+
+        self.assertEquals(IsFoo().run_column(['foo', 'bar', 'foo']), [True, False, True])
+
+    def test_failure_is_formatted_lazily(self):
+        class IsFoo(rule.Rule):
+            code = 'foo'
+            formatted = []
+
+            def run(self, field_value):
+                return field_value == 'foo'
+
+            def arguments(self, field_value):
+                self.formatted.append(field_value)
+                return (field_value,)
+
+        r = IsFoo('`{}` is not foo')
+        f = r.failure('bar')
+        self.assertEquals(f.code, 'foo')
+        self.assertEquals(f.template, '`{}` is not foo')
+        self.assertEquals(IsFoo.formatted, [])
+
+        self.assertEquals(str(f), '`bar` is not foo')
+        self.assertEquals(unicode(f), u'`bar` is not foo')
+        self.assertEquals(f, '`bar` is not foo')
+        self.assertEquals(f, r.failure('bar'))
+        self.assertNotEquals(f, r.failure('baz'))
+        self.assertEquals(f.arguments, ('bar',))
+        self.assertEquals(rule.render([f, 'merp']), ['`bar` is not foo', 'merp'])
+
+    def test_message_without_arguments(self):
+        self.assertEquals(rule.Rule('{} is left as is').message('foo'), '{} is left as is')
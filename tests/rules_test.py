@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 from validator import rules
+import re
+import unicodedata
 import unittest
 
 class RulesTest(unittest.TestCase):
@@ -29,6 +31,28 @@ class RulesTest(unittest.TestCase):
         r = rules.Regex(regex).run(n3)
         self.assertFalse(r)
 
+    def test_regex_flags(self):
+        r = rules.Regex('^foo$', flags=re.I)
+        self.assertTrue(r.run('FOO'))
+
+        r = rules.Regex('^foo$')
+        self.assertFalse(r.run('FOO'))
+
+    def test_regex_raises_on_construction(self):
+        self.assertRaises(ValueError, rules.Regex, '')
+        self.assertRaises(ValueError, rules.Regex, '^[0-1+$')
+
+    def test_regex_interned(self):
+        self.assertIs(rules.Regex('^merp$').regex, rules.Regex('^merp$').regex)
+        self.assertIsNot(rules.Regex('^merp$').regex, rules.Regex('^merp$', flags=re.I).regex)
+        self.assertIs(rules.IsEmail().regex, rules.PATTERNS['email'])
+        self.assertIs(rules.IsNumeric().regex, rules.IsNumeric().regex)
+
+    def test_regex_cache_size(self):
+        for i in range(rules.CACHE_SIZE + 10):
+            rules.compile_expression('^{}$'.format(i))
+        self.assertTrue(len(rules._cache) <= rules.CACHE_SIZE)
+
     def test_is_email(self):
         e1 = 'wilhelm.murdoch@gmail.com'
         e2 = ',1320df9d,3.9kd'
@@ -114,6 +138,48 @@ class RulesTest(unittest.TestCase):
         r = rules.IsInList(l).run(i2)
         self.assertFalse(r) 
 
+    def test_is_in_list_index(self):
+        r = rules.IsInList(['AU', ' DE ', 'US'], strip=True)
+        self.assertEquals(r.index, frozenset(['AU', 'DE', 'US']))
+        self.assertTrue(r.run(' DE'))
+        self.assertFalse(r.run('au'))
+
+        r = rules.IsInList(['AU', 'DE', 'US'], casefold=True)
+        self.assertTrue(r.run('au'))
+        self.assertTrue(r.run(u'De'))
+        self.assertFalse(r.run('NZ'))
+
+        r = rules.IsInList([u'caf\xe9'], normalise=lambda v: unicodedata.normalize('NFC', v))
+        self.assertTrue(r.run(u'cafe\u0301'))
+
+    def test_is_in_list_unhashable(self):
+        r = rules.IsInList([[1, 2], 3])
+        self.assertIsNone(r.index)
+        self.assertTrue(r.run([1, 2]))
+        self.assertTrue(r.run(3))
+        self.assertFalse(r.run(4))
+
+        r = rules.IsInList([(1, 2), 3])
+        self.assertIsNotNone(r.index)
+        self.assertTrue(r.run((1, 2)))
+        self.assertFalse(r.run([1, 2]))
+        self.assertEquals(r.run_column([(1, 2), [1, 2], 3]), [True, False, True])
+
+    def test_is_not_in_list(self):
+        l = ['root', 'admin']
+
+        r = rules.IsNotInList(l)
+        self.assertTrue(r.run('wilhelm'))
+        self.assertFalse(r.run('root'))
+        self.assertEquals(r.message('root'), 'Value of `root` is within the list')
+
+        r = rules.IsNotInList(l, strip=True, casefold=True)
+        self.assertFalse(r.run(' ADMIN '))
+
+        r = rules.IsNotInList(l, pass_on_blank=True)
+        self.assertTrue(r.run('  '))
+        self.assertEquals(r.run_column(['  ', 'root', 'foo']), [True, False, True])
+
     def test_is_type(self):
         t1 = ()
         t2 = {}
@@ -144,4 +210,121 @@ class RulesTest(unittest.TestCase):
         r = rules.IsType({}, error='custom')
         self.assertFalse(r.run(True))
         self.assertEquals(r.error, 'custom')
-        
\ No newline at end of file
+        
+
+    def test_message(self):
+        r = rules.IsLengthBetween(1, 2)
+
+        self.assertFalse(r.run('foo'))
+        self.assertEquals(r.message('foo'), 'String `foo` length is not within `1` and `2`')
+        self.assertFalse(r.run('bar'))
+        self.assertEquals(r.message('bar'), 'String `bar` length is not within `1` and `2`')
+        self.assertEquals(r.error, "String `{}` length is not within `{}` and `{}`")
+
+    def test_message_does_not_mutate(self):
+        for r, v in [
+              (rules.Matches('foo'), 'bar')
+            , (rules.Regex('^[0-1]+$'), 'bar')
+            , (rules.IsLength(1), 'bar')
+            , (rules.IsLengthBetween(1, 2), 'bar')
+            , (rules.IsInList(['foo']), 'bar')
+            , (rules.IsType({}), 'bar')
+        ]:
+            error = r.error
+            self.assertFalse(r.run(v))
+            self.assertNotEquals(r.message(v), error)
+            self.assertEquals(r.error, error)
+
+
+    def test_run_column(self):
+        values = ['', ' ', 'abc', ' abc ', '123', 'a@b.com', 'merp', 'abcdefghijk']
+        for r in [
+              rules.Matches('merp')
+            , rules.Matches('merp', pass_on_blank=True)
+            , rules.Regex('^[a-c]+$')
+            , rules.IsEmail(pass_on_blank=True)
+            , rules.IsNumeric()
+            , rules.IsAlpha()
+            , rules.IsAlphaNumeric(pass_on_blank=True)
+            , rules.IsRequired()
+            , rules.IsRequired(pass_on_blank=True)
+            , rules.IsLength(3)
+            , rules.IsLength(3, True, pass_on_blank=True)
+            , rules.IsLengthBetween(1, 4)
+            , rules.IsLengthBetween(1, 4, strip=True, pass_on_blank=True)
+            , rules.IsInList(['abc', 'merp'])
+            , rules.IsInList(['abc', 'merp'], True, pass_on_blank=True)
+            , rules.IsInList(['ABC', 'merp'], casefold=True)
+            , rules.IsNotInList(['abc', 'merp'])
+            , rules.IsNotInList(['abc', 'merp'], True, pass_on_blank=True)
+            , rules.IsType('')
+            , rules.IsType(0, pass_on_blank=True)
+        ]:
+            self.assertEquals(r.run_column(values), [r.run(v) for v in values])
+
+        values = [None, 0, 'abc', '', 'abcdefghijk']
+        for r in [
+              rules.IsLength(3, pass_on_blank=True)
+            , rules.IsLength(3, True, pass_on_blank=True, unit='chars')
+            , rules.IsLengthBetween(1, 4, pass_on_blank=True)
+            , rules.IsLengthBetween(1, 4, strip=True, pass_on_blank=True, unit='bytes')
+        ]:
+            self.assertEquals(r.run_column(values), [r.run(v) for v in values])
+
+    def test_bytes_like_values(self):
+        for wrap in [str, bytearray, memoryview]:
+            self.assertTrue(rules.IsEmail().run(wrap('a@b.com')))
+            self.assertFalse(rules.IsNumeric().run(wrap('abc')))
+            self.assertTrue(rules.IsNumeric(pass_on_blank=True).run(wrap('  ')))
+            self.assertFalse(rules.IsRequired().run(wrap('')))
+            self.assertTrue(rules.IsLength(3, True).run(wrap(' abc ')))
+            self.assertTrue(rules.IsLengthBetween(1, 3, strip=True).run(wrap(' abc ')))
+            self.assertTrue(rules.IsInList(['abc']).run(wrap('abc')))
+            self.assertTrue(rules.IsInList(['ABC'], True, casefold=True).run(wrap(' abc ')))
+            self.assertFalse(rules.IsNotInList(['abc']).run(wrap('abc')))
+            self.assertEquals(rules.IsNumeric().message(wrap('abc')), rules.IsNumeric().message('abc'))
+
+        values = [memoryview('123'), memoryview('abc'), memoryview(' ')]
+        r = rules.IsNumeric(pass_on_blank=True)
+        self.assertEquals(r.run_column(values), [True, False, True])
+
+    def test_length_units(self):
+        s = u'ünï'
+        b = s.encode('utf-8')
+
+        self.assertTrue(rules.IsLength(3, unit='chars').run(b))
+        self.assertTrue(rules.IsLength(3, unit='chars').run(memoryview(b)))
+        self.assertTrue(rules.IsLength(3, unit='chars').run(s))
+        self.assertTrue(rules.IsLength(5, unit='bytes').run(b))
+        self.assertTrue(rules.IsLength(5, unit='bytes').run(s))
+        self.assertTrue(rules.IsLength(5).run(b))
+        self.assertTrue(rules.IsLengthBetween(1, 3, unit='chars').run(bytearray(b)))
+        self.assertFalse(rules.IsLengthBetween(1, 3, unit='bytes').run(b))
+
+        r = rules.IsLength(3, unit='chars')
+        self.assertEquals(r.run_column([b, s, 'abcd']), [True, True, False])
+
+        self.assertRaises(ValueError, rules.IsLength, 3, unit='words')
+        self.assertRaises(ValueError, rules.IsLengthBetween, 1, 3, unit='words')
+
+    def test_printable(self):
+        r = rules.IsNumeric(error=u'`{}` is not numeric')
+        self.assertEquals(r.message(memoryview(u'ü'.encode('utf-8'))), u'`ü` is not numeric')
+        self.assertEquals(rules.IsNumeric(error='`{}` is not numeric').message(bytearray('a')), '`a` is not numeric')
+
+    def test_cross_field(self):
+        record = {'password': 'root', 'country': 'US', 'email': '', 'phone': ' '}
+        self.assertTrue(rules.EqualsField('password').run('root', record))
+        self.assertFalse(rules.EqualsField('password').run('toor', record))
+        self.assertTrue(rules.EqualsField('password', pass_on_blank=True).run('', record))
+        self.assertEquals(rules.EqualsField('password').message('toor'), 'Value of `toor` does not match field `password`')
+
+        self.assertFalse(rules.RequiredIf('country').run('', record))
+        self.assertTrue(rules.RequiredIf('country', 'CA').run('', record))
+        self.assertTrue(rules.RequiredIf('email').run(None, record))
+        self.assertTrue(rules.RequiredIf('country').run('NY', record))
+
+        self.assertFalse(rules.AtLeastOneOf(['email', 'phone']).run(None, record))
+        self.assertTrue(rules.AtLeastOneOf(['email', 'country']).run(None, record))
+        self.assertEquals(rules.AtLeastOneOf(['email', 'phone']).failure('').code, 'at_least_one_of')
+        self.assertRaises(NotImplementedError, rules.EqualsField('password').run_column, ['root'])
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+from validator import collection, field, result, rules, schema
+import resource
+import threading
+import unittest
+
+class SchemaTest(unittest.TestCase):
+    def setUp(self):
+        self.c = collection.Collection().append([
+            field.Field('username').append([
+                  rules.IsRequired()
+                , rules.IsAlphaNumeric()
+                , rules.IsLengthBetween(3, 10)
+            ]),
+            field.Field('email').append([
+                  rules.IsRequired()
+                , rules.IsEmail()
+            ]),
+        ])
+        self.s = self.c.schema()
+
+    def test_validate_pass(self):
+        r = self.s.validate({'username': 'wilhelm', 'email': 'wilhelm@gmail.com'})
+
+        self.assertEquals(type(r), result.Result)
+        self.assertTrue(r)
+        self.assertTrue(r.passed)
+        self.assertIsNone(r.errors())
+        self.assertEquals(len(r.results()), 2)
+        self.assertEquals(r.form(), {'username': 'wilhelm', 'email': 'wilhelm@gmail.com'})
+
+    def test_validate_fail(self):
+        r = self.s.validate({'username': 'wilhelm', 'email': 'foo'})
+
+        self.assertFalse(r)
+        self.assertEquals(r.errors(), {'email': ['This is not a valid email address.']})
+
+    def test_validate_missing(self):
+        r = self.s.validate({})
+
+        self.assertFalse(r)
+        self.assertEquals(r.errors(), {
+            'username': ['This field requires a value.'],
+            'email': ['This field requires a value.']
+        })
+
+    def test_validate_returns_fresh_results(self):
+        r1 = self.s.validate({'username': 'wilhelm', 'email': 'foo'})
+        r2 = self.s.validate({'username': 'wilhelm', 'email': 'wilhelm@gmail.com'})
+
+        self.assertIsNot(r1, r2)
+        self.assertFalse(r1)
+        self.assertTrue(r2)
+
+    def test_schema_is_not_mutated(self):
+        self.s.validate({'username': 'wilhelm', 'email': 'foo'})
+        self.c.append(field.Field('password').append(rules.IsRequired()))
+        self.c[0].append(rules.IsNumeric())
+
+        self.assertEquals(len(self.s), 2)
+        self.assertEquals(len(self.s[0]), 3)
+        self.assertIsNone(self.s[0].value)
+        self.assertTrue(self.s.validate({'username': 'wilhelm', 'email': 'wilhelm@gmail.com'}))
+
+    def test_list_of_fields(self):
+        s = schema.Schema([field.Field('foo').append(rules.IsNumeric())])
+
+        self.assertTrue(s.validate({'foo': '123'}))
+        self.assertFalse(s.validate({'foo': 'bar'}))
+
+    def test_raises_type_error(self):
+        self.assertRaises(TypeError, schema.Schema, ['foo'])
+
+    def test_shared_between_threads(self):
+        s = collection.Collection().append(
+            field.Field('foo').append(rules.IsLengthBetween(1, 3))
+        ).schema()
+        failures = []
+
+        def worker(n):
+            for i in range(200):
+                value = 'thread-{}-{}'.format(n, i)
+                errors = s.validate({'foo': value}).errors()
+                if errors != {'foo': ['String `{}` length is not within `1` and `3`'.format(value)]}:
+                    failures.append(errors)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEquals(failures, [])
+
+    def records(self, n, fail_every=None):
+        for i in xrange(n):
+            if fail_every and i % fail_every == 0:
+                yield {'username': 'w', 'email': 'foo'}
+            else:
+                yield {'username': 'wilhelm', 'email': 'wilhelm@gmail.com'}
+
+    def test_stream(self):
+        r = list(self.s.stream(self.records(10, 3)))
+
+        self.assertEquals(len(r), 10)
+        self.assertEquals([i for i, _ in r], range(10))
+        self.assertEquals([i for i, res in r if not res.passed], [0, 3, 6, 9])
+        self.assertEquals(r[0][1].results(), self.s.validate({'username': 'w', 'email': 'foo'}).results())
+
+    def test_stream_failures_only(self):
+        r = list(self.s.stream(self.records(10, 3), failures_only=True))
+
+        self.assertEquals([i for i, _ in r], [0, 3, 6, 9])
+        self.assertEquals(r[0][1].errors(), {
+            'username': ['String `w` length is not within `3` and `10`'],
+            'email': ['This is not a valid email address.']
+        })
+
+    def test_stream_max_failures(self):
+        r = list(self.s.stream(self.records(10, 3), max_failures=2))
+        self.assertEquals([i for i, _ in r], [0, 1, 2, 3])
+
+        r = list(self.s.stream(self.records(10, 3), True, 3))
+        self.assertEquals([i for i, _ in r], [0, 3, 6])
+
+    def test_stream_is_lazy(self):
+        r = self.s.stream(self.records(10 ** 12, 3), True)
+
+        self.assertEquals(next(r)[0], 0)
+        self.assertEquals(next(r)[0], 3)
+
+    def test_stream_flat_memory(self):
+        for _ in self.s.stream(self.records(10000, 100)):
+            pass
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        for _ in self.s.stream(self.records(100000, 100)):
+            pass
+        after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # ru_maxrss is reported in kilobytes on Linux.
+        self.assertTrue(after - before < 4096)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from validator import collection, field, loader, rules, stages
+import pickle
+import unittest
+
+class StagesTest(unittest.TestCase):
+    def setUp(self):
+        self.field = field.Field('country', stop_on_first_error=False, normalise=['strip', 'casefold']).append([
+              rules.IsRequired()
+            , rules.IsLength(2).using('strip')
+            , rules.IsInList(['gb', 'us']).using('casefold')
+        ])
+
+    def test_pipeline(self):
+        p = stages.Pipeline(['strip', 'casefold', ('upper', lambda v: v.upper())])
+        self.assertEquals(p.names, ('strip', 'casefold', 'upper'))
+        self.assertEquals(p.views(' Gb ', 2), [' Gb ', 'Gb', 'gb'])
+        self.assertEquals(p.views(memoryview(' Gb '), 1)[1], 'Gb')
+        self.assertEquals(p.columns([' Gb ', 'US'], 3), [[' Gb ', 'US'], ['Gb', 'US'], ['gb', 'us'], ['GB', 'US']])
+        self.assertEquals(p.position(None), 0)
+        self.assertEquals(p.position('casefold'), 2)
+        self.assertRaises(ValueError, p.position, 'nfc')
+        self.assertRaises(ValueError, stages.Pipeline, ['trim'])
+        self.assertRaises(ValueError, stages.Pipeline, ['strip', 'strip'])
+
+    def test_unicode_and_coercion(self):
+        p = stages.Pipeline(['nfc', 'int'])
+        self.assertEquals(p.views(u'é', 1)[1], u'\xe9')
+        self.assertEquals(p.views('e\xcc\x81', 1)[1], '\xc3\xa9')
+        self.assertEquals(stages.Pipeline(['strip', 'int']).views(' 42 ', 2), [' 42 ', '42', 42])
+        self.assertEquals(stages.Pipeline(['int']).views('abc', 1), ['abc', 'abc'])
+
+        f = field.Field('age', normalise=['strip', 'int']).append([rules.IsType(0).using('int')])
+        self.assertEquals(f.check(' 42 '), (True, []))
+        self.assertEquals(f.check(' abc ')[1][0].code, 'type')
+
+    def test_check(self):
+        self.assertEquals(self.field.check(' GB '), (True, []))
+        self.assertTrue(self.field.passes(' us'))
+        self.assertEquals(self.field.check(' FRA ')[1], [
+            'String `FRA` length does not equal `2`',
+            'Value of `fra` is not within the list'
+        ])
+        self.assertEquals(len(self.field.copy().check(' FRA ')[1]), 2)
+
+    def test_casefold_non_ascii(self):
+        upper = u'\xdcBER'.encode('utf-8')
+        f = field.Field('word', normalise=['casefold']).append(rules.IsInList([u'\xfcber'.encode('utf-8')]).using('casefold'))
+        plan = f.compile()
+        self.assertEquals(f.check(upper), (True, []))
+        self.assertEquals(plan(upper), (True, []))
+        self.assertTrue(plan.passes(u'\xdcBER'.encode('utf-8')))
+        self.assertEquals(f.check_column([upper, 'uber']), [(True, []), f.check('uber')])
+        self.assertTrue(rules.IsInList([u'\xfcber'.encode('utf-8')], casefold=True).run(upper))
+
+    def test_views_computed_once(self):
+        calls = []
+        def count(value):
+            calls.append(value)
+            return value.strip()
+
+        f = field.Field('foo', normalise=[('strip', count)]).append([
+            rules.IsRequired().using('strip'), rules.IsLength(3).using('strip'), rules.IsAlpha().using('strip')
+        ])
+        self.assertEquals(f.check(' abc '), (True, []))
+        self.assertEquals(calls, [' abc '])
+        self.assertEquals(f.views(' abc '), ['abc', 'abc', 'abc'])
+        self.assertEquals(field.Field('foo', normalise=['strip']).append(rules.IsRequired()).views('a'), None)
+
+    def test_unknown_view(self):
+        self.assertRaises(ValueError, field.Field('foo').append, rules.IsRequired().using('strip'))
+        self.assertRaises(ValueError, field.Field('foo', normalise=['strip']).append, [rules.IsRequired().using('nfc')])
+
+    def test_equivalent_paths(self):
+        values = [' GB ', ' FRA ', '', 'us', '   ', u' Us ']
+        plan = self.field.compile()
+        self.assertEquals(self.field.check_column(values), [self.field.check(v) for v in values])
+        self.assertEquals([plan(v) for v in values], [self.field.check(v) for v in values])
+        self.assertEquals([plan.passes(v) for v in values], [self.field.passes(v) for v in values])
+
+        ordered = field.Field('country', reorder='cost', normalise=['strip', 'casefold']).append([
+            rules.IsInList(['gb', 'us']).using('casefold'), rules.IsRequired()
+        ])
+        self.assertEquals(ordered.check(' GB '), (True, []))
+        self.assertEquals(ordered.check(' FR ')[1], ['Value of `fr` is not within the list'])
+
+    def test_columns_and_schema(self):
+        c = collection.Collection().append(self.field)
+        self.assertEquals(c.run_columns({'country': [' GB ', ' FRA ', 'us']}).errors(), {'country': [1]})
+        s = pickle.loads(pickle.dumps(c.schema()))
+        self.assertEquals(s.validate({'country': ' FRA '}).codes(), {'country': ['length', 'in_list']})
+
+    def test_loader(self):
+        s = loader.load({'country': {
+            'normalise': ['strip', 'casefold'],
+            'rules': ['IsRequired', {'rule': 'IsInList', 'args': [['gb']], 'view': 'casefold'}]
+        }}, cache=loader.SchemaCache())
+        self.assertTrue(s.passes({'country': ' GB '}))
+        self.assertFalse(s.passes({'country': ' US '}))
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+""" Compact, columnar reports of validating very large numbers of records. Field titles and
+each rule's code and unformatted error message are interned into tables, and each failure is
+stored as integers in `array.array` columns: its row, the positions of its field title and error
+template in their tables, and the end of its arguments in a byte buffer. The values formatted
+into error messages, such as the failing value, are marshalled into that buffer, so the tables
+do not grow with the number of distinct failing values. Messages are only formatted when read,
+and passing rows take no space. Row-level views in the format of `Result.errors()` are built on
+demand, and reports can be written as JSON Lines or to a compact binary file:
+
+    report = schema.report(records)
+    print report.errors(12)
+    with open('failures.report', 'wb') as fh:
+        report.dump(fh)
+"""
+import array
+import bisect
+import collections
+import json
+import marshal
+import rule
+import slots
+import struct
+import sys
+
+# Identifies files written by method `BatchReport.dump`.
+MAGIC = 'VBR'
+
+# Changing this invalidates every file written by an earlier version of this module.
+VERSION = 2
+
+# Version of the marshal format used for arguments and file headers.
+MARSHAL = 2
+
+# Columns of each report, and the type code of the array storing them.
+COLUMNS = (('rows', 'I'), ('fields', 'H'), ('templates', 'I'), ('offsets', 'L'))
+
+# Format characters of struct for unsigned integers of each size, used to read columns written
+# on a platform whose arrays have a different item size.
+UNSIGNED = {2: 'H', 4: 'I', 8: 'Q'}
+
+# Formats error messages from their arguments; rules overriding it are stored fully formatted.
+MESSAGE = rule.Rule.message.__func__
+
+class Table(slots.Slotted):
+    """ Maps values, such as error messages, to their position in a list of distinct values. """
+    __slots__ = ('values', 'ids')
+
+    def __init__(self, values=()):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        values list -- Values interned in order. (optional)
+        """
+        self.values = []
+        self.ids = {}
+        for value in values:
+            self.intern(value)
+
+    def __len__(self):
+        """ Implements built-in len() to return number of distinct values. """
+        return len(self.values)
+
+    def __getitem__(self, i):
+        """ Returns the value at position i. Will raise IndexError if out of range. """
+        return self.values[i]
+
+    def intern(self, value):
+        """ Returns the position of the given value, adding it if it has not been seen before. """
+        i = self.ids.get(value)
+        if i is None:
+            i = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+
+class BatchReport(object):
+    """ The failures of a batch of validated records, stored in columns of interned integers.
+    Rows are numbered in the order they were added, starting at 0. A report holds at most 65536
+    distinct field titles. Arguments that cannot be marshalled, and messages of rules overriding
+    `Rule.message`, are formatted when added and stored in place of the arguments. """
+    def __init__(self, titles=()):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        titles list -- Field titles interned in order, eg: the titles of a Schema. (optional)
+        """
+        self.tables = {'titles': Table(titles), 'templates': Table()}
+        self.columns = dict((name, array.array(typecode)) for name, typecode in COLUMNS)
+        self.arguments = bytearray()
+        self.size = 0
+
+    def __len__(self):
+        """ Implements built-in len() to return number of rows added. """
+        return self.size
+
+    def add(self, result):
+        """ Adds the outcome of validating the next record and returns its row. Only the
+        arguments of each failure are stored; its message is formatted when read.
+
+        Keyword arguments:
+        result Result -- The outcome of validating a record.
+        """
+        row = self.size
+        self.size += 1
+        if result.passed:
+            return row
+
+        rows, fields, templates, offsets = [self.columns[name] for name, _ in COLUMNS]
+        titles = self.tables['titles'].intern
+        template = self.tables['templates'].intern
+        arguments = self.arguments
+        for title, errors in zip(result.titles, result.failures):
+            if not errors:
+                continue
+            t = titles(title)
+            for f in errors:
+                rows.append(row)
+                fields.append(t)
+                if not isinstance(f, rule.Failure):
+                    templates.append(template((None, f)))
+                elif type(f) is rule.Failure and getattr(type(f.rule).message, '__func__', None) is MESSAGE:
+                    error = f.template
+                    # Messages without replacement fields are the template itself, whatever the arguments.
+                    args = f.arguments if '{' in error or '}' in error else ()
+                    try:
+                        payload = marshal.dumps(tuple(args), MARSHAL) if args else ''
+                        templates.append(template((f.code, error)))
+                    except ValueError:
+                        payload = marshal.dumps(f.render(), MARSHAL)
+                        templates.append(template((f.code, None)))
+                    arguments.extend(payload)
+                else:
+                    arguments.extend(marshal.dumps(f.render(), MARSHAL))
+                    templates.append(template((f.code, None)))
+                offsets.append(len(arguments))
+        return row
+
+    def extend(self, results):
+        """ Adds the outcome of validating each of the given records, in order, and returns this
+        report. Results are not retained.
+
+        Keyword arguments:
+        results iterable -- Instances of class Result.
+        """
+        for r in results:
+            self.add(r)
+        return self
+
+    def entries(self, row):
+        """ Returns the positions, within each column, of the failures of the given row. """
+        rows = self.columns['rows']
+        return xrange(bisect.bisect_left(rows, row), bisect.bisect_right(rows, row))
+
+    def failed(self):
+        """ Returns a list of the rows that failed, in ascending order. """
+        failed = []
+        previous = None
+        for row in self.columns['rows']:
+            if row != previous:
+                failed.append(int(row))
+                previous = row
+        return failed
+
+    def code(self, i):
+        """ Returns the rule code of the failure at position i of the columns. """
+        return self.tables['templates'][self.columns['templates'][i]][0]
+
+    def message(self, i):
+        """ Returns the formatted error message of the failure at position i of the columns,
+        exactly as `Failure.render` returned it. """
+        template = self.tables['templates'][self.columns['templates'][i]][1]
+        offsets = self.columns['offsets']
+        start = offsets[i - 1] if i else 0
+        end = offsets[i]
+        if start == end:
+            return template
+        payload = marshal.loads(str(self.arguments[start:end]))
+        return payload if template is None else template.format(*payload)
+
+    def view(self, row, read):
+        """ Returns a dict mapping each failing field of the given row to a list of the values
+        returned by read for its failures, or None if the row passed.
+
+        Keyword arguments:
+        row int       -- The row to view.
+        read callable -- Either method `code` or method `message`.
+        """
+        view = {}
+        titles = self.tables['titles'].values
+        fields = self.columns['fields']
+        for i in self.entries(row):
+            view.setdefault(titles[fields[i]], []).append(read(i))
+        return view or None
+
+    def errors(self, row):
+        """ Returns the errors of the given row in the same format as `Result.errors()`. """
+        return self.view(row, self.message)
+
+    def codes(self, row):
+        """ Returns the rule codes of the given row in the same format as `Result.codes()`. """
+        return self.view(row, self.code)
+
+    def failures(self):
+        """ Yields a (row, errors) tuple for each row that failed, in ascending order, where
+        errors is in the same format as `Result.errors()`. """
+        titles = self.tables['titles'].values
+        rows = self.columns['rows']
+        fields = self.columns['fields']
+        message = self.message
+        row = None
+        errors = None
+        for i in xrange(len(rows)):
+            if rows[i] != row:
+                if errors is not None:
+                    yield row, errors
+                row = int(rows[i])
+                errors = {}
+            errors.setdefault(titles[fields[i]], []).append(message(i))
+        if errors is not None:
+            yield row, errors
+
+    def counts(self):
+        """ Returns a dict mapping each failing field to a dict of the number of failures of
+        each rule code. """
+        counts = {}
+        titles = self.tables['titles'].values
+        templates = self.tables['templates'].values
+        pairs = collections.Counter(zip(self.columns['fields'], self.columns['templates']))
+        for (t, k), n in pairs.iteritems():
+            codes = counts.setdefault(titles[t], {})
+            code = templates[k][0]
+            codes[code] = codes.get(code, 0) + n
+        return counts
+
+    def write_jsonl(self, fh):
+        """ Writes a JSON object per failing row to the given file, eg:
+        `{"row": 12, "errors": {"email": ["This is not a valid email address."]}}`, and returns the
+        number of rows written. See function `write_jsonl` to write results as they are validated. """
+        return write_jsonl(self.failures(), fh)
+
+    def dump(self, fh):
+        """ Writes this report to the given binary file: a marshalled header holding the tables,
+        followed by the raw bytes of each column and the arguments. """
+        header = marshal.dumps({
+            'version': VERSION,
+            'size': self.size,
+            'entries': len(self.columns['rows']),
+            'byteorder': sys.byteorder,
+            'itemsizes': [self.columns[name].itemsize for name, _ in COLUMNS],
+            'arguments': len(self.arguments),
+            'titles': list(self.tables['titles'].values),
+            'templates': list(self.tables['templates'].values)
+        }, MARSHAL)
+        fh.write(MAGIC)
+        fh.write(struct.pack('<I', len(header)))
+        fh.write(header)
+        for name, _ in COLUMNS:
+            fh.write(self.columns[name].tostring())
+        fh.write(str(self.arguments))
+
+    @classmethod
+    def load(cls, fh):
+        """ Returns the report written to the given binary file by method `dump`, on this or any
+        other platform. Raises ValueError if the file is not a report written by this version of
+        this module. Reports should only be loaded from trusted sources. """
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise ValueError('File is not a batch report')
+        length, = struct.unpack('<I', fh.read(4))
+        header = marshal.loads(fh.read(length))
+        if header['version'] != VERSION:
+            raise ValueError('Batch report version {} is not supported'.format(header['version']))
+
+        report = cls(header['titles'])
+        report.tables['templates'] = Table(header['templates'])
+        report.size = header['size']
+        n = header['entries']
+        swap = header['byteorder'] != sys.byteorder
+        for (name, typecode), itemsize in zip(COLUMNS, header['itemsizes']):
+            data = fh.read(n * itemsize)
+            column = report.columns[name]
+            if itemsize == column.itemsize:
+                column.fromstring(data)
+                if swap:
+                    column.byteswap()
+            else:
+                order = '>' if header['byteorder'] == 'big' else '<'
+                column.extend(struct.unpack('{}{}{}'.format(order, n, UNSIGNED[itemsize]), data))
+        report.arguments = bytearray(fh.read(header['arguments']))
+        return report
+
+
+def text(value):
+    """ Returns the given string as unicode for encoding as JSON, replacing invalid UTF-8. """
+    if isinstance(value, str):
+        return value.decode('utf-8', 'replace')
+    return value
+
+
+def write_jsonl(failures, fh):
+    """ Writes a JSON object per failing row to the given file as they are produced, so nothing
+    is retained, and returns the number of rows written.
+
+    Keyword arguments:
+    failures iterable -- (row, errors) tuples, or (index, Result) tuples such as those yielded
+                         by `Schema.stream`. Passing results are skipped.
+    fh file           -- The file to write to.
+    """
+    written = 0
+    for row, errors in failures:
+        if not isinstance(errors, dict):
+            errors = errors.errors()
+            if errors is None:
+                continue
+        fh.write(json.dumps({'row': row, 'errors': dict(
+            (text(title), [text(m) for m in messages]) for title, messages in errors.iteritems()
+        )}, separators=(',', ':')))
+        fh.write('\n')
+        written += 1
+    return written
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+import threading
+import time
+
+class RuleCache(object):
+    """ Memoises the outcome of pure rules, keyed by rule and field value, with least recently
+    used eviction. Instances are thread-safe and may be shared by any number of fields. """
+    def __init__(self, size=1024, ttl=None, clock=time.time):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        size int       -- Maximum number of outcomes kept before the least recently used is evicted. (optional)
+        ttl float      -- Number of seconds an outcome is kept for. Kept indefinitely if None. (optional)
+        clock callable -- Returns the current time in seconds. (optional)
+        """
+        if size < 1:
+            raise ValueError('parameter :size must be greater than 0')
+        self.size = size
+        self.ttl = ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """ Removes all cached outcomes and resets all counters. """
+        with self.lock:
+            self.entries = OrderedDict()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def run(self, rule, field_value):
+        """ Returns the outcome of `rule.run(field_value)`, from the cache where possible. Rules
+        not declared pure, and values that cannot be hashed, are never cached.
+
+        Keyword arguments:
+        rule Rule         -- The rule to apply.
+        field_value mixed -- The value to apply the rule against.
+        """
+        if not rule.pure:
+            return rule.run(field_value)
+
+        key = (rule, type(field_value), field_value)
+        try:
+            hash(key)
+        except TypeError:
+            return rule.run(field_value)
+
+        now = self.clock() if self.ttl is not None else None
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                if now is None or entry[1] > now:
+                    self.entries[key] = entry
+                    self.hits += 1
+                    return entry[0]
+                self.evictions += 1
+
+        passed = rule.run(field_value)
+
+        with self.lock:
+            self.misses += 1
+            self.entries[key] = (passed, now + self.ttl if now is not None else None)
+            while len(self.entries) > self.size:
+                self.entries.popitem(False)
+                self.evictions += 1
+        return passed
+
+    def stats(self):
+        """ Returns a dict containing the number of cache hits, misses and evictions as well as
+        the number of outcomes currently cached. """
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self.entries)
+            }
+
+    def __getstate__(self):
+        """ Only settings are pickled; an unpickled cache starts out empty. """
+        return {'size': self.size, 'ttl': self.ttl, 'clock': self.clock}
+
+    def __setstate__(self, state):
+        """ Restores settings and creates an empty cache once unpickled. """
+        self.__init__(state['size'], state['ttl'], state['clock'])
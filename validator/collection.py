@@ -1,12 +1,22 @@
 # -*- coding: utf-8 -*-
+import columns
+import cost
 import field
+import graph
+import parallel
+import result
+import schema
+import slots
 
-class Collection(object):
+class Collection(slots.Slotted):
     """ Contains a list of fields and applies assocated rules against them. """
+    __slots__ = ('fields', 'result', 'fail_fast')
+
     def __init__(self):
         """ Constructor that instantiates a class instance and properties. """
         self.fields = []
-        self.collated_results = []
+        self.result = None
+        self.fail_fast = None
 
     def append(self, _field):
         """ Attaches an instance of class Field to the current instance of this collection
@@ -40,7 +50,9 @@ class Collection(object):
 
     def results(self):
         """ Returns the collated results for the current collection instance. """
-        return self.collated_results
+        if self.result is None:
+            return []
+        return self.result.results()
 
     def form(self):
         """ Returns a dict representing the current form in field:value pairs. """
@@ -49,44 +61,169 @@ class Collection(object):
             for field in self.fields
         }
 
+    def schema(self, missing=''):
+        """ Returns a reusable instance of class Schema built from the fields and rules assigned
+        to this collection. Field values are ignored; they are supplied to `Schema.validate` instead.
+
+        Keyword arguments:
+        missing mixed -- The value used for fields not present in a validated record. (optional)
+        """
+        return schema.Schema(self.fields, missing)
+
     def errors(self):
         """ Returns a dict containing only a map of fields with any 
         corresponding errors or None if all rules passed.
         """
-        return {
-            f['field']:f['errors']
-            for f in self.collated_results
-            if f['errors']
-        } or None
+        if self.result is None:
+            return None
+        return self.result.errors()
+
+    def codes(self):
+        """ Returns a dict containing only a map of fields with any failing rules to the codes of
+        those rules, or None if all rules passed. No error messages are formatted.
+        """
+        if self.result is None:
+            return None
+        return self.result.codes()
+
+    def order(self, priority=None):
+        """ Returns the instance of class FailFast used to order fields when `run` is called with
+        'fail_fast', and to count the fields and rules it skipped. It is rebuilt if fields are
+        appended or a different priority is given.
+
+        Keyword arguments:
+        priority mixed -- A list of field titles checked first, or a function returning a sort key for each field. (optional)
+        """
+        fail_fast = self.fail_fast
+        if fail_fast is None or len(fail_fast) != len(self.fields) \
+                or (priority is not None and priority != fail_fast.priority):
+            fail_fast = self.fail_fast = cost.FailFast(
+                self.fields, fail_fast.priority if priority is None and fail_fast is not None else priority
+            )
+        return fail_fast
+
+    def relate(self, values, failures=None):
+        """ Applies the cross-field rules of all associated Fields against their values, in
+        dependency order, and returns the given failures with those of cross-field rules
+        appended. If no failures are given, returns True if every cross-field rule passes.
 
-    def run(self, return_collated_results = False):
+        Keyword arguments:
+        values list   -- The value of each Field, in order.
+        failures list -- The errors of each Field, or None if it passed, in order. (optional)
+        """
+        if not any(f.relations for f in self.fields):
+            return True if failures is None else failures
+        _graph = graph.Graph(self.fields)
+        if failures is None:
+            return _graph.passes(values)
+        return _graph.relate(values, failures)
+
+    def run(self, return_collated_results = False, fail_fast = False, priority = None):
         """ Iterates through all associated Fields and applies all attached Rules. Depending on 'return_collated_results',
         this method will either return True (all rules successful), False (all, or some, rules failed) or a dictionary list
         containing the collated results of all Field Rules.
 
+        With 'fail_fast', only True or False is returned: Fields are checked cheapest first, or in the order given by
+        'priority', and checking stops at the first failing Field. No results are kept, so `errors()` returns None.
+
         Keyword arguments:
         return_collated_results bool -- Returns dictionary list of Field Rule collated results instead of True or False.
+        fail_fast bool               -- Return False as soon as any Field fails, without building results. (optional)
+        priority mixed               -- A list of field titles checked first, or a function returning a sort key for each field. (optional)
         """
-        self.collated_results = []
+        if fail_fast:
+            if return_collated_results:
+                raise ValueError('parameters :fail_fast and :return_collated_results cannot both be set')
+            self.result = None
+            values = [f.value for f in self.fields]
+            return self.order(priority).passes(values) and self.relate(values)
+
+        values = [f.value for f in self.fields]
+        self.result = result.Result(
+            tuple(f.title for f in self.fields),
+            values,
+            self.relate(values, [f.check(f.value)[1] or None for f in self.fields])
+        )
 
-        passed = True
+        if return_collated_results:
+            return self.result.results()
+        return self.result.passed
 
-        for field in self.fields:
-            result, errors = field.run()
+    def run_async(self, return_collated_results=False, max_concurrency=parallel.MAX_CONCURRENCY):
+        """ Same as method `run`, except Fields with any AsyncRule, such as uniqueness or blocklist
+        lookups, are run concurrently on a pool of threads. Rules within a single Field are still
+        run in order and respect 'stop_on_first_error'; Fields without an AsyncRule are run inline.
 
-            results = {
-                'field': field.title,
-                'value': field.value,
-                'passed': result,
-                'errors': None
-            }
+        Keyword arguments:
+        return_collated_results bool -- Returns dictionary list of Field Rule collated results instead of True or False.
+        max_concurrency int          -- Maximum number of Fields run at the same time. (optional)
+        """
+        values = [f.value for f in self.fields]
+        self.result = result.Result(
+            tuple(f.title for f in self.fields),
+            values,
+            self.relate(values, parallel.run_fields([(f, f.value) for f in self.fields], max_concurrency))
+        )
 
-            if errors:
-                passed = False
-                results['errors'] = errors
+        if return_collated_results:
+            return self.result.results()
+        return self.result.passed
 
-            self.collated_results.append(results)
+    def run_many(self, records, missing=''):
+        """ Applies all associated Fields and their Rules against every given record, rather than
+        the values assigned to the Fields, and returns a list of Result instances in the same
+        order. Each Result implements `results()` and `errors()` in the same format as this class.
 
-        if return_collated_results:
-            return self.collated_results
-        return passed
\ No newline at end of file
+        Keyword arguments:
+        records iterable -- Mappings of field titles to the values to validate.
+        missing mixed    -- The value used for fields not present in a record. (optional)
+        """
+        return self.schema(missing).validate_many(records)
+
+    def stream(self, records, failures_only=False, max_failures=None, missing=''):
+        """ Lazily applies all associated Fields and their Rules against records from any
+        iterable, yielding an (index, Result) tuple per record. See `Schema.stream`.
+
+        Keyword arguments:
+        records iterable   -- Mappings of field titles to the values to validate.
+        failures_only bool -- Only yield records that failed validation. (optional)
+        max_failures int   -- Stop once this many records have failed validation. (optional)
+        missing mixed      -- The value used for fields not present in a record. (optional)
+        """
+        return self.schema(missing).stream(records, failures_only, max_failures)
+
+    def run_report(self, records, chunk_size=parallel.CHUNK_SIZE, missing=''):
+        """ Applies all associated Fields and their Rules against records from any iterable and
+        returns an instance of class `batch.BatchReport`. See `Schema.report`.
+
+        Keyword arguments:
+        records iterable -- Mappings of field titles to the values to validate.
+        chunk_size int   -- Number of records validated at a time. (optional)
+        missing mixed    -- The value used for fields not present in a record. (optional)
+        """
+        return self.schema(missing).report(records, chunk_size)
+
+    def run_parallel(self, records, workers=None, chunk_size=parallel.CHUNK_SIZE, missing=''):
+        """ Applies all associated Fields and their Rules against every given record using a pool
+        of worker processes. Records are split into chunks and results are returned as a list of
+        Result instances in the same order as the given records. All Rules must be picklable.
+
+        Keyword arguments:
+        records iterable -- Mappings of field titles to the values to validate.
+        workers int      -- Number of worker processes. Defaults to the number of CPUs. (optional)
+        chunk_size int   -- Number of records sent to a worker at a time. (optional)
+        missing mixed    -- The value used for fields not present in a record. (optional)
+        """
+        return parallel.run(self.schema(missing), records, workers, chunk_size)
+
+    def run_columns(self, _columns, missing=''):
+        """ Applies all associated Fields and their Rules against columns of values, rather than
+        records, and returns an instance of class `columns.Report` containing a pass/fail mask of
+        rows and the indices of the rows failing each Field. NumPy arrays are validated with
+        vectorised operations where possible.
+
+        Keyword arguments:
+        _columns dict -- A map of field titles to NumPy arrays, `array.array`s or lists of values.
+        missing mixed -- The value used for fields without a column. (optional)
+        """
+        return columns.validate(self.fields, _columns, missing)
\ No newline at end of file
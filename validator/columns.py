@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+import array
+import graph
+import rules
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def is_array(column):
+    """ Returns True if the given column is a NumPy array. """
+    return numpy is not None and isinstance(column, numpy.ndarray)
+
+
+def to_list(column):
+    """ Returns the given column as a list of Python values. """
+    if is_array(column) or isinstance(column, array.array):
+        return column.tolist()
+    return list(column)
+
+
+def blank(column):
+    """ Returns a mask of the blank strings in a NumPy string array. """
+    return numpy.char.str_len(numpy.char.strip(column)) == 0
+
+
+def lengths(rule, column):
+    """ Returns the length of each string in a NumPy string array, stripped if required by rule. """
+    return numpy.char.str_len(numpy.char.strip(column) if rule.strip else column)
+
+
+def ascii(column):
+    """ Returns a mask of the strings in a NumPy string array containing only ASCII characters. """
+    if column.dtype.kind == 'S':
+        return numpy.ones(column.shape, dtype=bool)
+    encoded = numpy.char.encode(column, 'ascii', 'ignore')
+    return numpy.char.str_len(encoded) == numpy.char.str_len(column)
+
+
+def pattern(test):
+    """ Returns a handler for the built-in character class rules. Empty strings match, as they do
+    for the regular expressions, and strings with a trailing newline are passed to the rule
+    itself since `$` also matches before a trailing newline. """
+    def handler(rule, column):
+        mask = (test(column) & ascii(column)) | (numpy.char.str_len(column) == 0)
+        for i in numpy.flatnonzero(numpy.char.endswith(column, '\n')):
+            mask[i] = rule.run(column[i])
+        return mask
+    return handler
+
+
+def is_length(rule, column):
+    """ Vectorised form of `IsLength.run`. Rules measuring in a given unit are passed to the rule itself. """
+    if rule.unit is not None:
+        return None
+    return lengths(rule, column) == rule.length
+
+
+def is_length_between(rule, column):
+    """ Vectorised form of `IsLengthBetween.run`. Rules measuring in a given unit are passed to the rule itself. """
+    if rule.unit is not None:
+        return None
+    l = lengths(rule, column)
+    return (rule.minimum <= l) & (l <= rule.maximum)
+
+
+def is_in_list(rule, column):
+    """ Vectorised form of `IsInList.run`. Lists that are not indexed, or are normalised by a
+    user-defined callable, are passed to the rule itself. """
+    if rule.index is None or rule.normalise is not None:
+        return None
+    if rule.strip:
+        column = numpy.char.strip(column)
+    if rule.casefold:
+        if column.dtype.kind == 'S':
+            # Lowered as Unicode, as `index.casefold` does, so non-ASCII letters match too.
+            try:
+                column = numpy.char.encode(numpy.char.lower(numpy.char.decode(column, 'utf-8')), 'utf-8')
+            except UnicodeDecodeError:
+                return None
+        else:
+            column = numpy.char.lower(column)
+    text = str if column.dtype.kind == 'S' else unicode
+    entries = []
+    for e in rule.index:
+        if isinstance(e, basestring):
+            # Byte and unicode strings are only equal when ASCII, so other entries never match.
+            try:
+                entries.append(text(e))
+            except UnicodeError:
+                pass
+    return numpy.isin(column, numpy.array(entries, dtype=column.dtype.kind) if entries else [])
+
+
+# Vectorised handlers for built-in rules applied against NumPy string arrays, keyed by rule class.
+STRING_HANDLERS = {
+    rules.IsLength: is_length,
+    rules.IsLengthBetween: is_length_between,
+    rules.IsNumeric: pattern(lambda column: numpy.char.isdigit(column)),
+    rules.IsAlpha: pattern(lambda column: numpy.char.isalpha(column)),
+    rules.IsAlphaNumeric: pattern(lambda column: numpy.char.isalnum(column)),
+    rules.IsInList: is_in_list
+}
+
+def mask(rule, column):
+    """ Applies a rule against a whole column and returns a boolean mask of the values that pass.
+    NumPy arrays return a NumPy boolean array; every other column, such as a list or an
+    `array.array`, returns a list of booleans.
+
+    Keyword arguments:
+    rule Rule    -- The rule to apply.
+    column mixed -- A NumPy array, `array.array` or any other sequence of values.
+    """
+    if not is_array(column):
+        return rule.run_column(to_list(column))
+
+    if type(rule) is rules.IsType and column.dtype.kind != 'O':
+        # Every value of a typed array converts to the same Python type.
+        values = column[:1].tolist()
+        passed = numpy.full(
+            column.shape,
+            isinstance(values[0], type(rule.asserted_type)) if values else True,
+            dtype=bool
+        )
+        if rule.pass_on_blank and column.dtype.kind in 'SU':
+            passed |= blank(column)
+        return passed
+
+    handler = STRING_HANDLERS.get(type(rule))
+    if handler is not None and column.dtype.kind in 'SU':
+        passed = handler(rule, column)
+        if passed is not None:
+            if rule.pass_on_blank:
+                passed = passed | blank(column)
+            return passed
+
+    return numpy.array(rule.run_column(column.tolist()), dtype=bool)
+
+
+class Report(object):
+    """ Represents the outcome of validating a set of columns. """
+    def __init__(self, passed, failures):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        passed mixed  -- Boolean mask of the rows that passed every field.
+        failures dict -- A map of field titles to the indices of the rows that failed the field.
+        """
+        self.passed = passed
+        self.failures = failures
+
+    def __len__(self):
+        """ Implements built-in len() to return number of rows. """
+        return len(self.passed)
+
+    def failed(self):
+        """ Returns a list of the indices of rows that failed any field. """
+        return [i for i, passed in enumerate(self.passed) if not passed]
+
+    def errors(self):
+        """ Returns a dict containing only a map of fields with any failing rows to the indices of
+        those rows, or None if all rows passed. """
+        return {
+            title:indices
+            for title, indices in self.failures.iteritems()
+            if len(indices)
+        } or None
+
+
+def validate(fields, columns, missing=''):
+    """ Applies each field's rules against the column of the same title and returns an instance of
+    class Report. A row fails a field if any of its rules fail, or any of its cross-field rules
+    fail once the fields they depend on have passed.
+
+    Keyword arguments:
+    fields list   -- Instances of class Field.
+    columns dict  -- A map of field titles to columns of values, all of the same length.
+    missing mixed -- The value used for fields without a column. (optional)
+    """
+    size = None
+    for column in columns.itervalues():
+        if size is not None and len(column) != size:
+            raise ValueError('parameter :columns must all be of the same length')
+        size = len(column)
+    size = size or 0
+
+    vectorised = any(is_array(c) for c in columns.itervalues())
+    values = []
+    masks = []
+    for f in fields:
+        column = columns.get(f.title)
+        if column is None:
+            column = [missing] * size
+
+        resolved = None if f.pipeline is None else f.resolve()
+        if resolved is not None:
+            positions, depth = resolved
+            views = f.pipeline.columns(to_list(column), depth)
+
+        field_passed = numpy.ones(size, dtype=bool) if vectorised else [True] * size
+        for n, rule in enumerate(f.rules):
+            if resolved is None or not positions[n]:
+                outcome = mask(rule, column)
+            else:
+                outcome = mask(rule, views[positions[n]])
+            if vectorised:
+                field_passed &= numpy.asarray(outcome, dtype=bool)
+            else:
+                field_passed = [a and b for a, b in zip(field_passed, outcome)]
+        values.append(column)
+        masks.append(field_passed)
+
+    if any(f.relations for f in fields):
+        graph.Graph(fields).mask(values, masks)
+
+    passed = numpy.ones(size, dtype=bool) if vectorised else [True] * size
+    failures = {}
+    for f, field_passed in zip(fields, masks):
+        if vectorised:
+            passed &= field_passed
+            failures[f.title] = numpy.flatnonzero(~field_passed)
+        else:
+            passed = [a and b for a, b in zip(passed, field_passed)]
+            failures[f.title] = [i for i, p in enumerate(field_passed) if not p]
+
+    return Report(passed, failures)
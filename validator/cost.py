@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+import threading
+
+class CostOrder(object):
+    """ Orders a field's rules so the expected cost of finding its first failing rule is as low
+    as possible. Rules are ranked by their cost divided by their probability of failing, which
+    is taken to be the same for every rule unless failure rates are measured. """
+    def __init__(self, rules, adaptive=False, interval=1000):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        rules list    -- The rules to order, in declared order.
+        adaptive bool -- Measure each rule's failure rate and periodically order rules by it. (optional)
+        interval int  -- Number of validations between each reordering, if adaptive. (optional)
+        """
+        self.costs = [float(r.cost) for r in rules]
+        self.adaptive = adaptive
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.runs = [0] * len(rules)
+        self.failures = [0] * len(rules)
+        self.validations = 0
+        self.executions = 0
+        self.saved = 0
+        self.order = self.rank()
+
+    def __len__(self):
+        """ Implements built-in len() to return number of ordered rules. """
+        return len(self.costs)
+
+    def __getstate__(self):
+        """ Locks cannot be pickled; measured failure rates, counters and order are. """
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        """ Restores all attributes and creates a new lock once unpickled. """
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def probability(self, i):
+        """ Returns the estimated probability of the rule at declared position i failing. """
+        return (self.failures[i] + 1.0) / (self.runs[i] + 2.0)
+
+    def rank(self):
+        """ Returns declared rule positions in the order they should be run. Rules with equal
+        rank are run in declared order. """
+        return sorted(
+            range(len(self.costs)),
+            key=lambda i: (self.costs[i] / self.probability(i), i)
+        )
+
+    def check(self, rules, value, cache=None, views=None, first=True):
+        """ Applies the given rules against the given value in ranked order, stopping at the first
+        failing rule, and returns a (passed, errors) tuple in the format of `Field.check`. The
+        error reported is the one declared order would report: once a rule fails, the rules ranked
+        after it but declared before it are run too, in declared order.
+
+        Keyword arguments:
+        rules list      -- The rules to apply, in declared order.
+        value str       -- The value to apply the rules against.
+        cache RuleCache -- Used to memoise the outcome of pure rules. (optional)
+        views list      -- The value each rule is applied against instead, in declared order. (optional)
+        first bool      -- Find the first failing rule in declared order, rather than only whether
+                           any rule fails. (optional)
+        """
+        order = self.order
+        failed = None
+        executed = 0
+        for i in order:
+            rule = rules[i]
+            executed += 1
+            subject = value if views is None else views[i]
+            if not (rule.run(subject) if cache is None else cache.run(rule, subject)):
+                failed = i
+                break
+
+        ran = order[:executed]
+        failures = []
+        if failed is not None:
+            failures.append(failed)
+            if first:
+                for i in skipped(order, executed, failed):
+                    rule = rules[i]
+                    ran.append(i)
+                    subject = value if views is None else views[i]
+                    if not (rule.run(subject) if cache is None else cache.run(rule, subject)):
+                        failures.append(i)
+                        failed = i
+                        break
+
+        self.record(ran, failures)
+
+        if failed is None:
+            return True, []
+        return False, [rules[failed].failure(value if views is None else views[failed])]
+
+    def record(self, executed, failures):
+        """ Updates counters after a validation. The number of executions saved is the number of
+        rules declared order would have run, up to and including the first failing rule, less the
+        number actually run, so it is negative when rules declared after the failing rule ran first.
+
+        Keyword arguments:
+        executed list -- Declared positions of the rules that were run, in the order they were run.
+        failures list -- Declared positions of the rules that failed.
+        """
+        with self.lock:
+            self.validations += 1
+            self.executions += len(executed)
+            self.saved += (min(failures) + 1 if failures else len(self.costs)) - len(executed)
+
+            if self.adaptive:
+                for i in executed:
+                    self.runs[i] += 1
+                for i in failures:
+                    self.failures[i] += 1
+                if self.validations % self.interval == 0:
+                    self.order = self.rank()
+
+    def record_column(self, runs, failures, validations, saved):
+        """ Same as method `record` for a whole column of values.
+
+        Keyword arguments:
+        runs list        -- The number of values each rule was run against, in declared order.
+        failures list    -- The number of values each rule failed for, in declared order.
+        validations int  -- The number of values checked.
+        saved int        -- The number of rule executions saved compared to declared order.
+        """
+        with self.lock:
+            before = self.validations
+            self.validations += validations
+            self.executions += sum(runs)
+            self.saved += saved
+            if self.adaptive:
+                for i, n in enumerate(runs):
+                    self.runs[i] += n
+                    self.failures[i] += failures[i]
+                if self.validations // self.interval != before // self.interval:
+                    self.order = self.rank()
+
+    def stats(self):
+        """ Returns a dict containing the number of validations, rule executions and rule
+        executions saved compared to running rules in declared order, as well as the current
+        order of declared rule positions. """
+        with self.lock:
+            return {
+                'validations': self.validations,
+                'executions': self.executions,
+                'saved': self.saved,
+                'order': list(self.order)
+            }
+
+
+def skipped(order, executed, failed):
+    """ Returns the declared positions of the rules not yet run that are declared before the
+    failing rule, in declared order. These are run to find the error declared order would report.
+
+    Keyword arguments:
+    order list    -- Declared rule positions, in ranked order.
+    executed int  -- The number of rules run, in ranked order, up to and including the failing rule.
+    failed int    -- Declared position of the failing rule.
+    """
+    return sorted(i for i in order[executed:] if i < failed)
+
+
+class FailFast(object):
+    """ Orders fields so the cheapest fields, or those given priority by the caller, are checked
+    first when only a boolean outcome is needed, and counts the fields and rules skipped by
+    stopping at the first failing field. Fields are ranked by the sum of their rules' costs. """
+    def __init__(self, fields, priority=None):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        fields list    -- The fields to order, in declared order.
+        priority mixed -- A list of field titles checked first, in the given order, or a function
+                          returning a sort key for each field. Other fields are ranked by cost. (optional)
+        """
+        self.fields = tuple(fields)
+        self.priority = priority
+        self.rules = [len(f.rules) for f in self.fields]
+        self.order = self.rank()
+        self.lock = threading.Lock()
+        self.validations = 0
+        self.failures = 0
+        self.checked = 0
+        self.skipped = 0
+        self.skipped_rules = 0
+
+    def __len__(self):
+        """ Implements built-in len() to return number of ordered fields. """
+        return len(self.fields)
+
+    def __getstate__(self):
+        """ Only fields and priority are pickled; counters of an unpickled instance start at zero. """
+        return {'fields': self.fields, 'priority': self.priority}
+
+    def __setstate__(self, state):
+        """ Restores fields and priority and resets counters once unpickled. """
+        self.__init__(state['fields'], state['priority'])
+
+    def rank(self):
+        """ Returns declared field positions in the order they should be checked. Fields with
+        equal rank are checked in declared order. """
+        positions = range(len(self.fields))
+        if callable(self.priority):
+            return sorted(positions, key=lambda i: (self.priority(self.fields[i]), i))
+
+        costs = [f.cost() for f in self.fields]
+        first = {}
+        for n, title in enumerate(self.priority or ()):
+            first.setdefault(title, n)
+        return sorted(positions, key=lambda i: (
+            first.get(self.fields[i].title, len(first)),
+            costs[i],
+            i
+        ))
+
+    def passes(self, values):
+        """ Returns True if every field passes for its value, stopping at the first failing field.
+
+        Keyword arguments:
+        values list -- The value of each field, in declared order.
+        """
+        fields = self.fields
+        checked = 0
+        passed = True
+        for i in self.order:
+            checked += 1
+            if not fields[i].passes(values[i]):
+                passed = False
+                break
+        self.record(checked, passed)
+        return passed
+
+    def record(self, checked, passed):
+        """ Updates counters after a validation.
+
+        Keyword arguments:
+        checked int -- The number of fields checked, in ranked order.
+        passed bool -- Whether every field passed.
+        """
+        with self.lock:
+            self.validations += 1
+            self.checked += checked
+            if not passed:
+                self.failures += 1
+                self.skipped += len(self.order) - checked
+                self.skipped_rules += sum(self.rules[i] for i in self.order[checked:])
+
+    def stats(self):
+        """ Returns a dict containing the number of validations and failures, fields checked and
+        skipped, rules of skipped fields and the order of declared field positions. """
+        with self.lock:
+            return {
+                'validations': self.validations,
+                'failures': self.failures,
+                'checked': self.checked,
+                'skipped': self.skipped,
+                'skipped_rules': self.skipped_rules,
+                'order': list(self.order)
+            }
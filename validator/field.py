@@ -1,20 +1,43 @@
 # -*- coding: utf-8 -*-
+import copy
+import cost
+import plan
+import profiler
 import rule
+import slots
+import stages
 
-class Field(object):
+class Field(slots.Slotted):
     """ Represents the concept of a field."""
-    def __init__(self, title, value, stop_on_first_error=True):
+    __slots__ = ('rules', 'relations', 'title', 'value', 'stop_on_first_error', 'cache', 'reorder', 'cost_order',
+                 'pipeline', 'positions')
+
+    def __init__(self, title, value=None, stop_on_first_error=True, cache=None, reorder=None, normalise=None):
         """ Constructor that instantiates a class instance and properties.
 
         Keyword arguments:
         title str                -- The title of this field.
-        value str                -- The value associated with this field.
+        value str                -- The value associated with this field. (optional)
         stop_on_first_error bool -- Will break out of applying rules when it first encounters an error.
+        cache RuleCache          -- Used to memoise the outcome of pure rules. (optional)
+        reorder str              -- Run rules cheapest first if 'cost', also accounting for measured failure
+                                    rates if 'adaptive'. Only applies if stop_on_first_error. (optional)
+        normalise list           -- Normalisation stages computed once per validation, whose views are read by
+                                    rules naming them with `Rule.using`. See module `validator.stages`. (optional)
         """
+        if reorder not in (None, 'cost', 'adaptive'):
+            raise ValueError("parameter :reorder must be one of None, 'cost' or 'adaptive'")
+
         self.rules = []
+        self.relations = []
         self.title = title
         self.value = value
         self.stop_on_first_error = stop_on_first_error
+        self.cache = cache
+        self.reorder = reorder
+        self.cost_order = None
+        self.pipeline = None if normalise is None else stages.Pipeline(normalise)
+        self.positions = None
 
     def __iter__(self):
         """ Returns generator to iterate through assigned rules. """
@@ -30,7 +53,9 @@ class Field(object):
         return self.rules[i]
 
     def append(self, _rule):
-        """ Attaches an instance of class Rule to the current instance of this Field
+        """ Attaches an instance of class Rule to the current instance of this Field. Instances
+        of class CrossFieldRule are kept apart in self.relations, as they are only applied by
+        collections and schemas.
 
         Keyword arguments:
         rule object -- Instance of class Rule to apply to this field.
@@ -39,19 +64,237 @@ class Field(object):
             for r in _rule:
                 if not isinstance(r, rule.Rule):
                     raise TypeError('parameter :rule must be list of class Rule instances')
-                self.rules.append(r)
+                self.position(r)
+                (self.relations if isinstance(r, rule.CrossFieldRule) else self.rules).append(r)
             return self
         elif not isinstance(_rule, rule.Rule):
             raise TypeError('parameter :rule must be instance of class Rule')
-        self.rules.append(_rule)
+        self.position(_rule)
+        (self.relations if isinstance(_rule, rule.CrossFieldRule) else self.rules).append(_rule)
         return self
 
-    def run(self):
-        """ Iterates through all associated rules, executes them and collects the results. """
+    def copy(self):
+        """ Returns a copy of this field, without a value, that is unaffected by rules
+        subsequently appended to this field. """
+        f = copy.copy(self)
+        f.rules = list(self.rules)
+        f.relations = list(self.relations)
+        f.value = None
+        f.cost_order = None
+        f.positions = None
+        return f
+
+    def position(self, _rule):
+        """ Returns the position of the view read by the given rule within this field's
+        normalisation pipeline. Raises ValueError if this field has no stage of that name.
+
+        Keyword arguments:
+        _rule Rule -- A rule of this field.
+        """
+        view = getattr(_rule, 'view', None)
+        if view is None:
+            return 0
+        if self.pipeline is None:
+            raise ValueError('Rule `{}` reads view `{}`, but field `{}` has no normalisation stages'.format(
+                type(_rule).__name__, view, self.title
+            ))
+        return self.pipeline.position(view)
+
+    def resolve(self):
+        """ Returns a (positions, depth) tuple, where positions lists the position of the view
+        read by each rule in declared order and depth is the last position required, or None if
+        every rule reads the value as given. """
+        if self.pipeline is None:
+            return None
+        positions = self.positions
+        if positions is None or positions[0] != len(self.rules):
+            resolved = [self.position(r) for r in self.rules]
+            positions = self.positions = (len(self.rules), (resolved, max(resolved)) if any(resolved) else None)
+        return positions[1]
+
+    def views(self, value):
+        """ Returns the value each rule is applied against, in declared order, computing each
+        normalised view once, or None if every rule reads the value as given.
+
+        Keyword arguments:
+        value str -- The value as given.
+        """
+        resolved = self.resolve()
+        if resolved is None:
+            return None
+        positions, depth = resolved
+        views = self.pipeline.views(value, depth)
+        return [views[p] for p in positions]
+
+    def order(self):
+        """ Returns the instance of class CostOrder used to order this field's rules, or None if
+        rules are run in declared order. """
+        if not self.reorder or not self.stop_on_first_error:
+            return None
+        cost_order = self.cost_order
+        if cost_order is None or len(cost_order) != len(self.rules):
+            cost_order = self.cost_order = cost.CostOrder(self.rules, self.reorder == 'adaptive')
+        return cost_order
+
+    def compile(self):
+        """ Returns an instance of class Plan with this field's rules compiled into specialised
+        functions. Calling the plan with a value returns the same result as method `check`, while
+        method `Plan.passes` returns a boolean without allocating any errors. """
+        return plan.Plan(self)
+
+    def cost(self):
+        """ Returns the sum of the costs of all associated rules. """
+        return sum(r.cost for r in self.rules)
+
+    def is_async(self):
+        """ Returns True if any associated rule is an instance of class AsyncRule. """
+        for r in self.rules:
+            if isinstance(r, rule.AsyncRule):
+                return True
+        return False
+
+    def check(self, value):
+        """ Applies all associated rules against the given value and collects the results. Unlike
+        method `run`, the value is supplied by the caller so a single field may be reused against
+        any number of values.
+
+        Keyword arguments:
+        value str -- The value to apply this field's rules against.
+        """
+        if profiler.sink is not None:
+            return profiler.check(self, value)
+
+        views = None if self.pipeline is None else self.views(value)
+        cost_order = self.order()
+        if cost_order is not None:
+            return cost_order.check(self.rules, value, self.cache, views)
+
         errors = []
-        for rule in self.rules:
-            if not rule.run(self.value):
-                errors.append(rule.error)
+        cache = self.cache
+        for i, rule in enumerate(self.rules):
+            if views is not None:
+                value = views[i]
+            if not (rule.run(value) if cache is None else cache.run(rule, value)):
+                errors.append(rule.failure(value))
                 if self.stop_on_first_error:
                     break
-        return False if errors else True, errors
\ No newline at end of file
+        return False if errors else True, errors
+
+    def passes(self, value):
+        """ Returns True if all associated rules pass for the given value. No error messages or
+        results are built, so nothing is allocated while rules pass.
+
+        Keyword arguments:
+        value str -- The value to apply this field's rules against.
+        """
+        if profiler.sink is not None:
+            return profiler.check(self, value)[0]
+
+        views = None if self.pipeline is None else self.views(value)
+        cost_order = self.order()
+        if cost_order is not None:
+            return cost_order.check(self.rules, value, self.cache, views, False)[0]
+
+        cache = self.cache
+        for i, rule in enumerate(self.rules):
+            if views is not None:
+                value = views[i]
+            if not (rule.run(value) if cache is None else cache.run(rule, value)):
+                return False
+        return True
+
+    def check_column(self, values):
+        """ Applies all associated rules against a whole column of values, one rule at a time,
+        and returns a list of (passed, errors) tuples in the same order as the given values.
+        Values that have already failed are not passed to subsequent rules if this field stops
+        on its first error.
+
+        Keyword arguments:
+        values list -- The values to apply this field's rules against.
+        """
+        if profiler.sink is not None:
+            return [profiler.check(self, v) for v in values]
+
+        cost_order = self.order()
+        order = range(len(self.rules)) if cost_order is None else cost_order.order
+
+        resolved = None if self.pipeline is None else self.resolve()
+        if resolved is not None:
+            positions, depth = resolved
+            views = self.pipeline.columns(values, depth)
+
+        def column(n, indices):
+            """ Returns the outcomes of the rule at declared position n for the values at indices. """
+            subjects = values if resolved is None else views[positions[n]]
+            subjects = subjects if len(indices) == len(subjects) else [subjects[i] for i in indices]
+            if cache is None:
+                return self.rules[n].run_column(subjects)
+            return [cache.run(self.rules[n], v) for v in subjects]
+
+        def failure(n, i):
+            """ Returns the failure of the rule at declared position n for the value at i. """
+            return self.rules[n].failure(values[i] if resolved is None else views[positions[n]][i])
+
+        errors = [[] for _ in values]
+        runs = [0] * len(self.rules)
+        failures = [0] * len(self.rules)
+        failed = [None] * len(values)
+        stopped = [None] * len(values)
+        active = range(len(values))
+        cache = self.cache
+        for k, n in enumerate(order):
+            if not active:
+                break
+            runs[n] += len(active)
+            remaining = []
+            for i, passed in zip(active, column(n, active)):
+                if not passed:
+                    errors[i].append(failure(n, i))
+                    if self.stop_on_first_error:
+                        failures[n] += 1
+                        failed[i] = n
+                        stopped[i] = k
+                        continue
+                remaining.append(i)
+            active = remaining
+
+        if cost_order is not None:
+            # Rules ranked after a value's failing rule but declared before it are run too, in
+            # declared order, so the error reported is the one declared order would report.
+            ranks = [0] * len(order)
+            for k, n in enumerate(order):
+                ranks[n] = k
+            for n in xrange(len(self.rules)):
+                pending = [i for i, m in enumerate(failed) if m is not None and n < m and ranks[n] > stopped[i]]
+                if not pending:
+                    continue
+                runs[n] += len(pending)
+                for i, passed in zip(pending, column(n, pending)):
+                    if not passed:
+                        failures[n] += 1
+                        failed[i] = n
+                        errors[i] = [failure(n, i)]
+
+            declared = sum(len(self.rules) if m is None else m + 1 for m in failed)
+            cost_order.record_column(runs, failures, len(values), declared - sum(runs))
+        return [(False if e else True, e) for e in errors]
+
+    def result(self, value):
+        """ Applies all associated rules against the given value and returns a dict in the format
+        used by `Collection.results()`.
+
+        Keyword arguments:
+        value str -- The value to apply this field's rules against.
+        """
+        passed, errors = self.check(value)
+        return {
+            'field': self.title,
+            'value': value,
+            'passed': passed,
+            'errors': rule.render(errors) or None
+        }
+
+    def run(self):
+        """ Iterates through all associated rules, executes them and collects the results. """
+        passed, errors = self.check(self.value)
+        return passed, rule.render(errors)
\ No newline at end of file
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+import heapq
+
+class Graph(object):
+    """ Orders fields by the dependencies of their cross-field rules, eg: a password confirmation
+    field depends on the password field. Cross-field rules are applied after the rules of every
+    field have run, in dependency order, and are skipped for a record if any field they depend on
+    has already failed. Cross-field rules naming a normalised view with `Rule.using` read that view
+    of their own field's value; the record holds the values of other fields as given. """
+    def __init__(self, fields):
+        """ Constructor that instantiates a class instance and properties. Raises ValueError if a
+        cross-field rule depends on an unknown field, or if dependencies are circular.
+
+        Keyword arguments:
+        fields list -- Instances of class Field, in declared order.
+        """
+        self.fields = tuple(fields)
+        self.titles = tuple(f.title for f in self.fields)
+        positions = {}
+        for i, title in enumerate(self.titles):
+            positions.setdefault(title, i)
+
+        self.dependencies = []
+        for f in self.fields:
+            depends = set()
+            for r in f.relations:
+                for title in r.depends:
+                    if title not in positions:
+                        raise ValueError('Field `{}` depends on unknown field `{}`'.format(f.title, title))
+                    depends.add(positions[title])
+            self.dependencies.append(tuple(sorted(depends)))
+
+        self.related = tuple(i for i, f in enumerate(self.fields) if f.relations)
+        self.positions = [tuple(f.position(r) for r in f.relations) for f in self.fields]
+        self.depths = [max(p or (0,)) for p in self.positions]
+        self.order = self.rank() if self.related else ()
+
+    def rank(self):
+        """ Returns the declared positions of fields with cross-field rules, ordered so that every
+        field comes after the fields it depends on, and otherwise in declared order. """
+        dependents = [[] for _ in self.fields]
+        waiting = [len(d) for d in self.dependencies]
+        for i, depends in enumerate(self.dependencies):
+            for d in depends:
+                dependents[d].append(i)
+
+        ready = [i for i, n in enumerate(waiting) if not n]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            i = heapq.heappop(ready)
+            order.append(i)
+            for j in dependents[i]:
+                waiting[j] -= 1
+                if not waiting[j]:
+                    heapq.heappush(ready, j)
+
+        if len(order) != len(self.fields):
+            cycle = [self.titles[i] for i, n in enumerate(waiting) if n]
+            raise ValueError('Fields `{}` depend on each other'.format('`, `'.join(cycle)))
+        related = set(self.related)
+        return tuple(i for i in order if i in related)
+
+    def views(self, i, value):
+        """ Returns the value read by each cross-field rule of the field at declared position i,
+        computing the normalised views of the given value once.
+
+        Keyword arguments:
+        i int       -- The declared position of the field.
+        value mixed -- The value of the field as given.
+        """
+        views = self.fields[i].pipeline.views(value, self.depths[i])
+        return [views[p] for p in self.positions[i]]
+
+    def relate(self, values, failures):
+        """ Applies cross-field rules against a record, appending their failures to the failures
+        of the field they belong to. Values are looked up by title once and shared by every rule.
+
+        Keyword arguments:
+        values list   -- The value of each field, in declared order.
+        failures list -- The list of failures of each field, or None if it passed, in declared order.
+        """
+        if not self.order:
+            return failures
+        record = dict(zip(self.titles, values))
+        for i in self.order:
+            errors = failures[i]
+            f = self.fields[i]
+            if errors and f.stop_on_first_error:
+                continue
+            depends = self.dependencies[i]
+            if any(failures[d] for d in depends):
+                continue
+
+            value = values[i]
+            views = self.views(i, value) if self.depths[i] else None
+            for n, r in enumerate(f.relations):
+                if views is not None:
+                    value = views[n]
+                if not r.run(value, record):
+                    if errors is None:
+                        errors = failures[i] = []
+                    errors.append(r.failure(value))
+                    if f.stop_on_first_error:
+                        break
+        return failures
+
+    def mask(self, columns, masks):
+        """ Applies cross-field rules against columns of values row by row, clearing the mask of
+        each field wherever its cross-field rules fail. Rows failing a dependency are skipped.
+
+        Keyword arguments:
+        columns list -- The column of values of each field, in declared order.
+        masks list   -- A mutable pass/fail mask of rows for each field, in declared order.
+        """
+        if not self.order:
+            return masks
+        titles = self.titles
+        for row in xrange(len(masks[0]) if masks else 0):
+            record = None
+            for i in self.order:
+                if not masks[i][row] or not all(masks[d][row] for d in self.dependencies[i]):
+                    continue
+                if record is None:
+                    record = dict((title, column[row]) for title, column in zip(titles, columns))
+                value = columns[i][row]
+                views = self.views(i, value) if self.depths[i] else None
+                for n, r in enumerate(self.fields[i].relations):
+                    if not r.run(value if views is None else views[n], record):
+                        masks[i][row] = False
+                        break
+        return masks
+
+    def passes(self, values):
+        """ Returns True if all cross-field rules pass for a record whose fields have all passed.
+
+        Keyword arguments:
+        values list -- The value of each field, in declared order.
+        """
+        if not self.order:
+            return True
+        record = dict(zip(self.titles, values))
+        for i in self.order:
+            value = values[i]
+            views = self.views(i, value) if self.depths[i] else None
+            for n, r in enumerate(self.fields[i].relations):
+                if not r.run(value if views is None else views[n], record):
+                    return False
+        return True
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+""" Builds and reads sorted, memory-mapped index files used by rules.IsInIndex.
+
+An index file consists of an 8 byte header, the number of entries, a table of entry offsets and
+the sorted entries themselves. Files are opened read-only through mmap, so every process reading
+the same file shares the operating system's page cache rather than holding a private copy.
+
+Usage: python -m validator.index [--strip] [--casefold] input.txt output.idx
+"""
+import mmap
+import re
+import struct
+import sys
+
+MAGIC = 'VALIDX1\n'
+
+COUNT = struct.Struct('<Q')
+
+OFFSETS = struct.Struct('<QQ')
+
+# Finds the first byte of a byte string that is not ASCII.
+NON_ASCII = re.compile('[\x80-\xff]').search
+
+def encode(value):
+    """ Returns the byte string stored in an index for the given value, or None if the value
+    cannot be stored.
+
+    Keyword arguments:
+    value mixed -- The value to encode.
+    """
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    if isinstance(value, str):
+        return value
+    return None
+
+
+def casefold(value):
+    """ Returns the given string in lower case, including non-ASCII letters. Byte strings
+    containing non-ASCII bytes are decoded as UTF-8 and encoded again afterwards, and are lowered
+    as bytes if they are not valid UTF-8. Used both when building an index and by rules looking
+    values up in it.
+
+    Keyword arguments:
+    value basestring -- The string to lower.
+    """
+    if NON_ASCII(value) is None or isinstance(value, unicode):
+        return value.lower()
+    try:
+        return value.decode('utf-8').lower().encode('utf-8')
+    except UnicodeDecodeError:
+        return value.lower()
+
+
+def build(entries, path):
+    """ Writes a sorted index file containing the given entries. Duplicate entries are removed.
+
+    Keyword arguments:
+    entries iterable -- Byte or unicode strings to write to the index.
+    path str         -- The path of the index file to write.
+    """
+    encoded = set()
+    for entry in entries:
+        value = encode(entry)
+        if value is None:
+            raise TypeError('parameter :entries must only contain strings')
+        encoded.add(value)
+    encoded = sorted(encoded)
+
+    with open(path, 'wb') as fh:
+        fh.write(MAGIC)
+        fh.write(COUNT.pack(len(encoded)))
+
+        offset = 0
+        fh.write(COUNT.pack(offset))
+        for value in encoded:
+            offset += len(value)
+            fh.write(COUNT.pack(offset))
+
+        for value in encoded:
+            fh.write(value)
+    return path
+
+
+class SortedIndex(object):
+    """ Read-only view of an index file written by function `build`. Implements the `in`
+    operator using a binary search over the memory-mapped file. """
+    def __init__(self, path):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        path str -- The path of the index file to read.
+        """
+        self.path = path
+        self.open()
+
+    def open(self):
+        """ Maps the index file into memory and validates its header. """
+        with open(self.path, 'rb') as fh:
+            self.map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.map[:len(MAGIC)] != MAGIC:
+            self.map.close()
+            raise ValueError('File `{}` is not a valid index'.format(self.path))
+
+        self.count = COUNT.unpack_from(self.map, len(MAGIC))[0]
+        self.offsets = len(MAGIC) + COUNT.size
+        self.data = self.offsets + COUNT.size * (self.count + 1)
+
+    def close(self):
+        """ Unmaps the index file. """
+        self.map.close()
+
+    def __len__(self):
+        """ Implements built-in len() to return number of entries. """
+        return self.count
+
+    def __contains__(self, value):
+        """ Returns True if the given value is an entry of this index. Values other than strings
+        are never entries.
+
+        Keyword arguments:
+        value mixed -- The value to look up.
+        """
+        value = encode(value)
+        if value is None:
+            return False
+
+        m = self.map
+        unpack = OFFSETS.unpack_from
+        offsets, data = self.offsets, self.data
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start, end = unpack(m, offsets + mid * COUNT.size)
+            entry = m[data + start:data + end]
+            if entry < value:
+                lo = mid + 1
+            elif entry > value:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def __getstate__(self):
+        """ Only the path is pickled; the file is mapped again once unpickled. """
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        """ Maps the index file once unpickled. """
+        self.path = state['path']
+        self.open()
+
+
+def main(argv):
+    """ Builds an index file from a text file containing one entry per line.
+
+    Keyword arguments:
+    argv list -- Command line arguments, excluding the program name.
+    """
+    strip = '--strip' in argv
+    lower = '--casefold' in argv
+    paths = [a for a in argv if not a.startswith('--')]
+    if len(paths) != 2:
+        sys.stderr.write(__doc__.strip().splitlines()[-1] + '\n')
+        return 2
+
+    source, target = paths
+    with open(source, 'rb') as fh:
+        entries = (line.rstrip('\r\n') for line in fh)
+        if strip:
+            entries = (e.strip() for e in entries)
+        if lower:
+            entries = (casefold(e) for e in entries)
+        build((e for e in entries if e), target)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+""" Builds schemas from plain data, such as parsed JSON, instead of appending fields and rules
+one by one. A declaration maps each field title to a list of rules, or to a dict of Field
+options with a 'rules' key. Each rule is either the name of a rule class, or a dict naming the
+class under 'rule', with an optional list of positional 'args' and the 'view' it reads; any other
+keys are passed to the rule as keyword arguments:
+
+    {
+        "username": ["IsRequired", "IsAlphaNumeric", {"rule": "IsLengthBetween", "args": [3, 10]}],
+        "email": {"stop_on_first_error": false, "rules": ["IsRequired", "IsEmail"]},
+        "country": {"normalise": ["strip", "casefold"], "rules": [{"rule": "IsInList", "args": [["gb"]], "view": "casefold"}]}
+    }
+
+Compiled schemas are cached by a hash of their declaration, in memory and optionally
+as pickled files in a directory shared by every worker.
+"""
+import collections
+import cPickle as pickle
+import field
+import hashlib
+import json
+import os
+import rule
+import rules
+import schema
+import tempfile
+import threading
+
+# Changing this invalidates every schema pickled by an earlier version of this module.
+VERSION = 2
+
+# Rule classes that may be named by declarations.
+REGISTRY = dict(
+    (name, getattr(rules, name)) for name in (
+        'Matches', 'Regex', 'IsEmail', 'IsNumeric', 'IsAlpha', 'IsAlphaNumeric', 'IsRequired',
+        'IsLength', 'IsLengthBetween', 'IsInList', 'IsNotInList', 'IsInIndex', 'IsType',
+        'EqualsField', 'RequiredIf', 'AtLeastOneOf'
+    )
+)
+
+# Field options that may be given by declarations.
+FIELD_OPTIONS = ('stop_on_first_error', 'reorder', 'normalise')
+
+def register(cls, name=None):
+    """ Allows declarations to name the given rule class.
+
+    Keyword arguments:
+    cls class -- A class derived from class Rule.
+    name str  -- The name used by declarations. Defaults to the name of the class. (optional)
+    """
+    if not isinstance(cls, type) or not issubclass(cls, rule.Rule):
+        raise TypeError('parameter :cls must be a class derived from class Rule')
+    REGISTRY[name or cls.__name__] = cls
+    return cls
+
+
+def parse(declaration):
+    """ Returns the given declaration with JSON text decoded, preserving the order of fields. """
+    if isinstance(declaration, basestring):
+        return json.loads(declaration, object_pairs_hook=collections.OrderedDict)
+    return declaration
+
+
+def normalise(declaration):
+    """ Returns the given declaration as a list of [title, options, rules] lists, where each rule
+    is a [name, args, kwargs] list. Raises ValueError if the declaration is malformed.
+
+    Keyword arguments:
+    declaration mixed -- A dict, or list of (title, spec) pairs, or JSON text of a dict.
+    """
+    normalised = []
+    for title, spec in fields(parse(declaration)):
+        if isinstance(spec, dict):
+            options = dict((k, v) for k, v in spec.iteritems() if k != 'rules')
+            for option in options:
+                if option not in FIELD_OPTIONS:
+                    raise ValueError('Field `{}` has unknown option `{}`'.format(title, option))
+            spec = spec.get('rules', [])
+        else:
+            options = {}
+
+        _rules = []
+        for r in spec:
+            if isinstance(r, basestring):
+                r = {'rule': r}
+            if not isinstance(r, dict) or 'rule' not in r:
+                raise ValueError('Field `{}` has a rule without a name: {!r}'.format(title, r))
+            if r['rule'] not in REGISTRY:
+                raise ValueError('Field `{}` has unknown rule `{}`'.format(title, r['rule']))
+            kwargs = dict((k, v) for k, v in r.iteritems() if k not in ('rule', 'args'))
+            _rules.append([r['rule'], list(r.get('args', [])), kwargs])
+        normalised.append([title, options, _rules])
+    return normalised
+
+
+def fields(declaration):
+    """ Returns the (title, spec) pairs of the given parsed declaration, in order. Plain dicts are
+    unordered, so their fields are ordered by title. """
+    if isinstance(declaration, collections.OrderedDict):
+        return declaration.items()
+    if isinstance(declaration, dict):
+        return sorted(declaration.items())
+    return declaration
+
+
+def digest(declaration, missing=''):
+    """ Returns the content hash of a parsed declaration. Equivalent declarations written in
+    different forms, or dicts with keys in a different order, may have different hashes; this
+    only costs a cache miss, and keys are left unsorted so the faster C encoder is used.
+
+    Keyword arguments:
+    declaration mixed -- A dict, or list of (title, spec) pairs.
+    missing mixed     -- The value used for fields not present in a validated record. (optional)
+    """
+    content = json.dumps([VERSION, missing, fields(declaration)], separators=(',', ':'))
+    return hashlib.sha1(content).hexdigest()
+
+
+def build(normalised, missing=''):
+    """ Returns an instance of class Schema built from a normalised declaration.
+
+    Keyword arguments:
+    normalised list -- A declaration returned by function `normalise`.
+    missing mixed   -- The value used for fields not present in a validated record. (optional)
+    """
+    fields = []
+    for title, options, _rules in normalised:
+        f = field.Field(title, **dict((str(k), v) for k, v in options.iteritems()))
+        for name, args, kwargs in _rules:
+            kwargs = dict((str(k), v) for k, v in kwargs.iteritems())
+            view = kwargs.pop('view', None)
+            f.append(REGISTRY[name](*args, **kwargs).using(view))
+        fields.append(f)
+    return schema.Schema(fields, missing)
+
+
+class SchemaCache(object):
+    """ Caches schemas built from declarations by the hash of their content. If a directory is
+    given, schemas are also pickled into it, so other processes load them rather than building
+    them. Safe to share between threads. """
+    def __init__(self, directory=None):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        directory str -- A directory in which compiled schemas are pickled. (optional)
+        """
+        self.directory = directory
+        self.schemas = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.builds = 0
+
+    def path(self, key):
+        """ Returns the path of the pickled schema with the given hash. """
+        return os.path.join(self.directory, key + '.schema')
+
+    def load(self, declaration, missing=''):
+        """ Returns the schema for the given declaration, from memory or disk where possible.
+
+        Keyword arguments:
+        declaration mixed -- A dict, or list of (title, spec) pairs, or JSON text of a dict.
+        missing mixed     -- The value used for fields not present in a validated record. (optional)
+        """
+        declaration = parse(declaration)
+        key = digest(declaration, missing)
+        with self.lock:
+            compiled = self.schemas.get(key)
+            if compiled is not None:
+                self.hits += 1
+                return compiled
+
+        compiled = self.read(key)
+        if compiled is None:
+            compiled = build(normalise(declaration), missing)
+            self.write(key, compiled)
+            counter = 'builds'
+        else:
+            counter = 'loads'
+
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            return self.schemas.setdefault(key, compiled)
+
+    def read(self, key):
+        """ Returns the pickled schema with the given hash, or None if there is none or it cannot
+        be unpickled, eg: because it was written by an incompatible version of a rule class. """
+        if self.directory is None:
+            return None
+        try:
+            with open(self.path(key), 'rb') as fh:
+                return pickle.load(fh)
+        except (IOError, EOFError, ImportError, AttributeError, ValueError, pickle.UnpicklingError):
+            return None
+
+    def write(self, key, compiled):
+        """ Pickles the given schema, replacing any existing file atomically. Each writer uses a
+        uniquely named temporary file, so threads and processes may write the same schema at once.
+        Errors are ignored, so a directory that cannot be written only means nothing is cached. """
+        if self.directory is None:
+            return
+        try:
+            fd, temporary = tempfile.mkstemp('.tmp', key + '.', self.directory)
+        except (IOError, OSError):
+            return
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                pickle.dump(compiled, fh, pickle.HIGHEST_PROTOCOL)
+            os.chmod(temporary, 0644)
+            os.rename(temporary, self.path(key))
+        except BaseException as e:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+            if not isinstance(e, (IOError, OSError)):
+                raise
+
+    def stats(self):
+        """ Returns a dict of the number of schemas found in memory, loaded from disk and built. """
+        return {'hits': self.hits, 'loads': self.loads, 'builds': self.builds, 'size': len(self.schemas)}
+
+    def clear(self):
+        """ Discards schemas held in memory. Pickled schemas are kept. """
+        with self.lock:
+            self.schemas.clear()
+
+
+# Used by function `load` unless another cache is given.
+CACHE = SchemaCache()
+
+def load(declaration, missing='', cache=None):
+    """ Returns an instance of class Schema for the given declaration. Schemas are shared by every
+    caller loading the same declaration, which is safe as schemas are never modified.
+
+    Keyword arguments:
+    declaration mixed -- A dict, or list of (title, spec) pairs, or JSON text of a dict.
+    missing mixed     -- The value used for fields not present in a validated record. (optional)
+    cache SchemaCache -- The cache to use instead of the module's default. (optional)
+    """
+    return (CACHE if cache is None else cache).load(declaration, missing)
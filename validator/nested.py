@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+import field
+import rule
+import rules
+import schema
+import slots
+
+class Path(slots.Slotted):
+    """ The location of a value within a nested value. Each location links to the location of its
+    parent, so failures within the same subtree share a single location and its prefix. """
+    __slots__ = ('parent', 'key')
+
+    def __init__(self, parent, key):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        parent Path -- The location of the containing value, or None at the top level.
+        key mixed   -- The field title, or list index, of this value within its parent.
+        """
+        self.parent = parent
+        self.key = key
+
+    def keys(self):
+        """ Returns a tuple of the field titles and list indices leading to this location. """
+        keys = []
+        node = self
+        while node is not None:
+            keys.append(node.key)
+            node = node.parent
+        keys.reverse()
+        return tuple(keys)
+
+    def format(self):
+        """ Returns this location in the form `items[3].sku`. """
+        parts = []
+        for key in self.keys():
+            if isinstance(key, (int, long)):
+                parts.append('[' + str(key) + ']')
+            else:
+                parts.append('.' + key if parts else key)
+        return ''.join(parts)
+
+    def __str__(self):
+        location = self.format()
+        return location.encode('utf-8') if isinstance(location, unicode) else location
+
+
+class PathFailure(rule.Failure):
+    """ A failure of a rule within a nested value. Its error message is prefixed by the location
+    of the value that failed. """
+    __slots__ = ('location',)
+
+    def __init__(self, failure, location):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        failure Failure -- The failure of the rule.
+        location Path   -- The location of the value that failed the rule.
+        """
+        super(PathFailure, self).__init__(failure.rule, failure.value)
+        self.location = location
+
+    @property
+    def path(self):
+        """ A tuple of the field titles and list indices leading to the value that failed. """
+        return self.location.keys()
+
+    def render(self):
+        """ Returns the formatted error message, prefixed by the location of the failing value. """
+        return self.location.format() + ': ' + self.rule.message(self.value)
+
+
+def located(failures, location):
+    """ Returns the given failures at the given location. """
+    return [PathFailure(f, location) for f in failures]
+
+
+class Container(field.Field):
+    """ Base class of fields whose values contain other values. Values are validated in a single
+    traversal, and the locations of failures are only allocated once something fails. Rules
+    appended to a container are applied against its value as a whole, eg: to limit the length
+    of a list. Containers are not compiled by method `compile`. """
+    __slots__ = ('required',)
+
+    # Rule that the value must pass before its contents are validated.
+    container = None
+
+    def __init__(self, title, value=None, stop_on_first_error=False, required=True):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        title str                -- The title of this field.
+        value mixed              -- The value of this field. (optional)
+        stop_on_first_error bool -- Stop validating this field's contents at the first failure. (optional)
+        required bool            -- If False, empty and missing values are not validated. (optional)
+        """
+        super(Container, self).__init__(title, value, stop_on_first_error)
+        self.required = required
+
+    def check(self, value):
+        """ Validates the given value and its contents, returning a (passed, errors) tuple in the
+        format of `Field.check`. Each error is an instance of class PathFailure.
+
+        Keyword arguments:
+        value mixed -- The value to validate.
+        """
+        errors = []
+        self.collect(value, None, self.title, errors)
+        return False if errors else True, errors
+
+    def passes(self, value):
+        """ Returns True if the given value and its contents are valid, stopping at the first
+        failure without allocating any errors.
+
+        Keyword arguments:
+        value mixed -- The value to validate.
+        """
+        return self.collect(value, None, self.title, None)
+
+    def check_column(self, values):
+        """ Same as calling method `check` for each of the given values. """
+        return [self.check(v) for v in values]
+
+    def compile(self):
+        """ Containers are not compiled; returns this field, which may be called like a plan. """
+        return self
+
+    def __call__(self, value):
+        """ Same as method `check`. """
+        return self.check(value)
+
+    def collect(self, value, parent, key, errors):
+        """ Validates the given value and its contents, appending failures to errors, and returns
+        True if everything passed. If errors is None, returns at the first failure.
+
+        Keyword arguments:
+        value mixed   -- The value to validate.
+        parent Path   -- The location of the containing value, or None at the top level.
+        key mixed     -- The field title, or list index, of the value within its parent.
+        errors list   -- The list failures are appended to, or None.
+        """
+        if not value and not self.required:
+            return True
+        if not self.container.run(value):
+            if errors is not None:
+                errors.append(PathFailure(self.container.failure(value), Path(parent, key)))
+            return False
+
+        passed = True
+        if self.rules:
+            if errors is None:
+                if not field.Field.passes(self, value):
+                    return False
+            else:
+                passed, failures = field.Field.check(self, value)
+                if not passed:
+                    errors.extend(located(failures, Path(parent, key)))
+                    if self.stop_on_first_error:
+                        return False
+        return self.contents(value, parent, key, errors) and passed
+
+    def cost(self):
+        """ Returns the sum of the costs of this field's rules and the rule checking its type. """
+        return super(Container, self).cost() + self.container.cost
+
+    def contents(self, value, parent, key, errors):
+        """ Validates the contents of the given value, in the same way as method `collect`. """
+        raise NotImplementedError('This method cannot be accessed directly')
+
+
+class Nested(Container):
+    """ A field whose value is a dict validated by its own fields, which may themselves be
+    nested. Cross-field rules of its fields are applied within the dict, as by a Schema. """
+    __slots__ = ('fields', 'missing', 'graph')
+
+    container = rules.IsDict()
+
+    def __init__(self, title, fields, value=None, stop_on_first_error=False, required=True, missing=''):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        title str                -- The title of this field.
+        fields mixed             -- A Collection, Schema or list of Field instances applied against the value.
+        value dict               -- The value of this field. (optional)
+        stop_on_first_error bool -- Stop validating this field's contents at the first failure. (optional)
+        required bool            -- If False, empty and missing values are not validated. (optional)
+        missing mixed            -- The value used for fields not present in the dict. (optional)
+        """
+        super(Nested, self).__init__(title, value, stop_on_first_error, required)
+        inner = fields if isinstance(fields, schema.Schema) else schema.Schema(fields)
+        self.fields = tuple(inner)
+        self.graph = inner.graph
+        self.missing = missing
+
+    def cost(self):
+        """ Returns the sum of the costs of this field's rules and those of its fields. """
+        return super(Nested, self).cost() + sum(f.cost() for f in self.fields)
+
+    def contents(self, value, parent, key, errors):
+        """ Applies each field against the value of the same title, followed by the cross-field
+        rules of each field in dependency order. """
+        passed = True
+        node = None
+        missing = self.missing
+        graph = self.graph
+        values = [value.get(f.title, missing) for f in self.fields]
+        outcomes = [None] * len(values) if graph.order and errors is not None else None
+        for i, f in enumerate(self.fields):
+            v = values[i]
+            if isinstance(f, Container):
+                if node is None:
+                    node = Path(parent, key)
+                before = len(errors) if outcomes is not None else 0
+                ok = f.collect(v, node, f.title, errors)
+                if not ok and outcomes is not None:
+                    outcomes[i] = errors[before:] or [False]
+            elif errors is None:
+                ok = f.passes(v)
+            else:
+                ok, failures = f.check(v)
+                if not ok:
+                    if node is None:
+                        node = Path(parent, key)
+                    errors.extend(located(failures, Path(node, f.title)))
+                    if outcomes is not None:
+                        outcomes[i] = failures
+
+            if not ok:
+                if errors is None or self.stop_on_first_error:
+                    return False
+                passed = False
+
+        if not graph.order:
+            return passed
+        if errors is None:
+            return graph.passes(values)
+
+        counts = [len(o) if o else 0 for o in outcomes]
+        graph.relate(values, outcomes)
+        for i in graph.order:
+            if outcomes[i] and len(outcomes[i]) > counts[i]:
+                if node is None:
+                    node = Path(parent, key)
+                errors.extend(located(outcomes[i][counts[i]:], Path(node, self.fields[i].title)))
+                passed = False
+        return passed
+
+
+class Repeated(Container):
+    """ A field whose value is a list, each item of which is validated by a single field. Items
+    may be scalar values, validated by a Field, or dicts, validated by a Nested field. """
+    __slots__ = ('item',)
+
+    container = rules.IsList()
+
+    def __init__(self, title, item, value=None, stop_on_first_error=False, required=True):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        title str                -- The title of this field.
+        item Field               -- The field applied against each item. Its title is not used.
+        value list               -- The value of this field. (optional)
+        stop_on_first_error bool -- Stop validating items at the first failure. (optional)
+        required bool            -- If False, empty and missing values are not validated. (optional)
+        """
+        if not isinstance(item, field.Field):
+            raise TypeError('parameter :item must be an instance of class Field')
+        super(Repeated, self).__init__(title, value, stop_on_first_error, required)
+        self.item = item
+
+    def cost(self):
+        """ Returns the sum of the costs of this field's rules and those of a single item. """
+        return super(Repeated, self).cost() + self.item.cost()
+
+    def contents(self, value, parent, key, errors):
+        """ Applies the item field against each item. """
+        item = self.item
+        stop = errors is None or self.stop_on_first_error
+        passed = True
+        if isinstance(item, Container):
+            node = Path(parent, key) if value else None
+            for i, v in enumerate(value):
+                if not item.collect(v, node, i, errors):
+                    if stop:
+                        return False
+                    passed = False
+        elif errors is None:
+            passes = item.passes
+            for v in value:
+                if not passes(v):
+                    return False
+        else:
+            node = None
+            check = item.check
+            for i, v in enumerate(value):
+                ok, failures = check(v)
+                if not ok:
+                    if node is None:
+                        node = Path(parent, key)
+                    errors.extend(located(failures, Path(node, i)))
+                    if stop:
+                        return False
+                    passed = False
+        return passed
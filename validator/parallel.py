@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import multiprocessing
+import os
+import threading
+from multiprocessing.pool import ThreadPool
+
+try:
+    from concurrent import futures
+except ImportError:
+    futures = None
+
+# Default number of records sent to a worker process at a time.
+CHUNK_SIZE = 1000
+
+# Default number of fields with blocking rules run at the same time.
+MAX_CONCURRENCY = 10
+
+# Thread pools shared by every call to function `run_fields`, keyed by size.
+_pools = {}
+_pools_lock = threading.Lock()
+
+def chunks(records, chunk_size=CHUNK_SIZE):
+    """ Splits an iterable of records into lists of at most chunk_size records.
+
+    Keyword arguments:
+    records iterable -- The records to split.
+    chunk_size int   -- Maximum number of records per chunk. (optional)
+    """
+    if chunk_size < 1:
+        raise ValueError('parameter :chunk_size must be greater than 0')
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def check_chunk(args):
+    """ Validates a single chunk of records within a worker process. Defined at module level so it
+    can be pickled. Only the output of `Schema.check_many` is sent back to the parent process;
+    the records themselves are not.
+
+    Keyword arguments:
+    args tuple -- A (schema, records) tuple.
+    """
+    schema, records = args
+    return schema.check_many(records)
+
+
+def run(schema, records, workers=None, chunk_size=CHUNK_SIZE):
+    """ Validates records against the given schema using a pool of worker processes and returns
+    a list of Result instances in the same order as the given records. A
+    `concurrent.futures.ProcessPoolExecutor` is used where available, otherwise a
+    `multiprocessing.Pool`.
+
+    Keyword arguments:
+    schema Schema    -- The schema to validate records against. Must be picklable.
+    records iterable -- Mappings of field titles to the values to validate.
+    workers int      -- Number of worker processes. Defaults to the number of CPUs. (optional)
+    chunk_size int   -- Number of records sent to a worker at a time. (optional)
+    """
+    workers = workers or multiprocessing.cpu_count()
+    split = list(chunks(records, chunk_size))
+    tasks = [(schema, chunk) for chunk in split]
+
+    if futures is not None:
+        with futures.ProcessPoolExecutor(workers) as executor:
+            checked = list(executor.map(check_chunk, tasks))
+    else:
+        pool = multiprocessing.Pool(workers)
+        try:
+            checked = pool.map(check_chunk, tasks, 1)
+        finally:
+            pool.close()
+            pool.join()
+
+    return [
+        r
+        for chunk, column in zip(split, checked)
+        for r in schema.collate_many(chunk, column)
+    ]
+
+
+
+def thread_pool(max_concurrency=MAX_CONCURRENCY):
+    """ Returns a pool of max_concurrency threads, created on first use and shared by every later
+    caller asking for the same size. Pools are created again in a forked child process, which does
+    not inherit the threads of its parent.
+
+    Keyword arguments:
+    max_concurrency int -- Number of threads in the pool. (optional)
+    """
+    key = (os.getpid(), max_concurrency)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ThreadPool(max_concurrency)
+    return pool
+
+
+def run_fields(pairs, max_concurrency=MAX_CONCURRENCY):
+    """ Applies each field against its value and returns a list containing the errors of each
+    field, or None for fields that passed, in the same order. Fields with any AsyncRule are run
+    concurrently on a shared pool of max_concurrency threads while all other fields are run
+    inline by the calling thread.
+
+    Keyword arguments:
+    pairs list          -- A list of (field, value) tuples.
+    max_concurrency int -- Maximum number of fields run at the same time. (optional)
+    """
+    if max_concurrency < 1:
+        raise ValueError('parameter :max_concurrency must be greater than 0')
+
+    blocking = [i for i, (f, _) in enumerate(pairs) if f.is_async()]
+    if not blocking:
+        return [f.check(value)[1] or None for f, value in pairs]
+
+    pool = thread_pool(max_concurrency)
+    pending = {
+        i:pool.apply_async(pairs[i][0].check, (pairs[i][1],))
+        for i in blocking
+    }
+    failures = [
+        None if i in pending else f.check(value)[1] or None
+        for i, (f, value) in enumerate(pairs)
+    ]
+    for i, r in pending.iteritems():
+        failures[i] = r.get()[1] or None
+    return failures
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+""" Applies several regular expressions against a value in a single scan, and detects patterns
+prone to catastrophic backtracking. Each pattern of an Engine is wrapped in an optional lookahead
+that captures a named group, so a single match reports which patterns matched from the start of
+the value, exactly as calling `match` on each of them would.
+"""
+import re
+import slots
+import sre_constants
+import sre_parse
+import string
+import warnings
+
+# Maximum number of engines and analysed patterns kept by this module.
+CACHE_SIZE = 256
+
+_engines = {}
+_analysed = {}
+
+class BacktrackingWarning(UserWarning):
+    """ Issued when a rule's regular expression is prone to catastrophic backtracking. """
+
+
+class Engine(slots.Slotted):
+    """ Several compiled regular expressions, without groups and with the same flags, applied
+    against a value in a single scan. """
+    __slots__ = ('patterns', 'regex')
+
+    def __init__(self, patterns):
+        """ Constructor that instantiates a class instance and properties. Raises ValueError if the
+        patterns cannot be combined.
+
+        Keyword arguments:
+        patterns list -- Compiled regular expressions.
+        """
+        self.patterns = tuple(patterns)
+        if not self.patterns:
+            raise ValueError('parameter :patterns must not be empty')
+        flags = self.patterns[0].flags
+        for p in self.patterns:
+            if not combinable(p) or p.flags != flags:
+                raise ValueError('Expression `{}` cannot be combined with the others'.format(p.pattern))
+        self.regex = re.compile(
+            ''.join('(?:(?=(?P<p{}>{}))|)'.format(i, p.pattern) for i, p in enumerate(self.patterns)),
+            flags
+        )
+
+    def __len__(self):
+        """ Implements built-in len() to return number of patterns. """
+        return len(self.patterns)
+
+    def scan(self, value):
+        """ Returns a tuple with an item per pattern, which is None if the pattern does not match
+        the start of the given value, and the matched text otherwise.
+
+        Keyword arguments:
+        value str -- The value to match.
+        """
+        return self.regex.match(value).groups()
+
+    def failed(self, value):
+        """ Returns the positions of the patterns that do not match the start of the given value.
+
+        Keyword arguments:
+        value str -- The value to match.
+        """
+        return [i for i, matched in enumerate(self.scan(value)) if matched is None]
+
+
+def combinable(regex):
+    """ Returns True if the given compiled regular expression can be combined with others by an
+    Engine. Patterns with groups, whose numbers would change, and verbose patterns, whose comments
+    would swallow the patterns after them, cannot. """
+    return not regex.groups and not regex.flags & re.VERBOSE
+
+
+def engine(patterns):
+    """ Returns an Engine for the given compiled regular expressions, shared by every caller
+    combining the same patterns. The cache is emptied once it holds CACHE_SIZE engines. """
+    key = tuple(patterns)
+    try:
+        return _engines[key]
+    except KeyError:
+        pass
+    if len(_engines) >= CACHE_SIZE:
+        _engines.clear()
+    combined = _engines[key] = Engine(key)
+    return combined
+
+
+# Characters considered when comparing the characters matched by parts of a pattern.
+ALL = frozenset(xrange(256))
+
+CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: frozenset(ord(c) for c in string.digits),
+    sre_constants.CATEGORY_SPACE: frozenset(ord(c) for c in ' \t\n\r\f\v'),
+    sre_constants.CATEGORY_WORD: frozenset(ord(c) for c in string.ascii_letters + string.digits + '_'),
+}
+CATEGORIES[sre_constants.CATEGORY_NOT_DIGIT] = ALL - CATEGORIES[sre_constants.CATEGORY_DIGIT]
+CATEGORIES[sre_constants.CATEGORY_NOT_SPACE] = ALL - CATEGORIES[sre_constants.CATEGORY_SPACE]
+CATEGORIES[sre_constants.CATEGORY_NOT_WORD] = ALL - CATEGORIES[sre_constants.CATEGORY_WORD]
+
+REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+ATOMS = (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.ANY, sre_constants.IN)
+ZERO_WIDTH = (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT)
+
+def fold(chars, flags):
+    """ Adds the other case of each ASCII letter to the given characters if matching ignores case. """
+    if not flags & re.IGNORECASE:
+        return chars
+    return chars | frozenset(ord(chr(c).swapcase()) for c in chars if c < 128 and chr(c).isalpha())
+
+
+def charset(op, av, flags):
+    """ Returns the characters matched by a single-character item of a parsed pattern. """
+    if op == sre_constants.LITERAL:
+        return fold(frozenset([av]), flags)
+    if op == sre_constants.NOT_LITERAL:
+        return ALL - fold(frozenset([av]), flags)
+    if op == sre_constants.ANY:
+        return ALL
+    chars = set()
+    negate = False
+    for kind, value in av:
+        if kind == sre_constants.NEGATE:
+            negate = True
+        elif kind == sre_constants.LITERAL:
+            chars.add(value)
+        elif kind == sre_constants.RANGE:
+            chars.update(xrange(value[0], value[1] + 1))
+        else:
+            chars.update(CATEGORIES.get(value, ALL))
+    chars = fold(frozenset(chars), flags)
+    return ALL - chars if negate else chars
+
+
+def consumed(items, flags):
+    """ Returns every character that may be matched anywhere by the given parsed items. """
+    chars = frozenset()
+    for op, av in items:
+        if op in ATOMS:
+            chars |= charset(op, av, flags)
+        elif op in REPEATS:
+            chars |= consumed(av[2], flags)
+        elif op == sre_constants.SUBPATTERN:
+            chars |= consumed(av[-1], flags)
+        elif op == sre_constants.BRANCH:
+            for branch in av[1]:
+                chars |= consumed(branch, flags)
+        elif op not in ZERO_WIDTH:
+            return ALL
+    return chars
+
+
+def first(items, flags):
+    """ Returns a (characters, empty) tuple of the characters that may start a match of the given
+    parsed items, and whether they may match an empty string. """
+    chars = frozenset()
+    for op, av in items:
+        if op in ATOMS:
+            return chars | charset(op, av, flags), False
+        if op in ZERO_WIDTH:
+            continue
+        if op == sre_constants.SUBPATTERN:
+            head, empty = first(av[-1], flags)
+        elif op == sre_constants.BRANCH:
+            head, empty = frozenset(), False
+            for branch in av[1]:
+                h, e = first(branch, flags)
+                head, empty = head | h, empty or e
+        elif op in REPEATS:
+            head, empty = first(av[2], flags)
+            empty = empty or av[0] == 0
+        else:
+            return ALL, False
+        chars |= head
+        if not empty:
+            return chars, False
+    return chars, True
+
+
+def sequence(items):
+    """ Yields the items matched in order by the given parsed items, including those of groups. """
+    for op, av in items:
+        if op == sre_constants.SUBPATTERN:
+            for item in sequence(av[-1]):
+                yield item
+        else:
+            yield op, av
+
+
+def delimited(body, repeat, flags):
+    """ Returns True if the body of an unbounded repeat always matches a character that the given
+    repeat nested within it cannot, so the two repeats can never match the same text, eg: the
+    `.` in `(?:[a-z]+\\.)+`. """
+    inner = consumed(repeat[2], flags)
+    for op, av in sequence(body):
+        if av is repeat:
+            continue
+        if op in REPEATS and av[0] >= 1 and len(av[2]) == 1 and av[2][0][0] in ATOMS:
+            op, av = av[2][0]
+        if op in ATOMS and not charset(op, av, flags) & inner:
+            return True
+    return False
+
+
+def walk(items, flags, outer, follow, reasons):
+    """ Appends a description of each construct of the given parsed items prone to catastrophic
+    backtracking to reasons.
+
+    Keyword arguments:
+    items list   -- Parsed items of a pattern.
+    flags int    -- Flags the pattern is compiled with.
+    outer list   -- The body of the innermost unbounded repeat containing the items, or None.
+    follow list  -- Parsed items that may be matched after the items, eg: the next iteration of
+                    the repeat containing them.
+    reasons list -- Descriptions of the constructs found.
+    """
+    for i, (op, av) in enumerate(items):
+        after = list(items[i + 1:]) + follow
+        if op in REPEATS:
+            unbounded = av[1] == sre_constants.MAXREPEAT
+            if unbounded and outer is not None and not delimited(outer, av, flags):
+                reasons.append('an unbounded repeat is nested within another that may match the same text')
+            walk(av[2], flags, av[2] if unbounded else outer, list(av[2]) if unbounded else after, reasons)
+        elif op == sre_constants.SUBPATTERN:
+            walk(av[-1], flags, outer, after, reasons)
+        elif op == sre_constants.BRANCH:
+            if outer is not None:
+                # Common prefixes are factored out of alternatives when parsed, eg: `(a|aa)` into
+                # `a(|a)`, so alternatives are compared with what may be matched after them.
+                heads = [first(list(branch) + after, flags) for branch in av[1]]
+                for j, (head, empty) in enumerate(heads):
+                    if any(head & other or empty and e for other, e in heads[j + 1:]):
+                        reasons.append('alternatives within an unbounded repeat may match the same text')
+                        break
+            for branch in av[1]:
+                walk(branch, flags, outer, after, reasons)
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            walk(av[1], flags, outer, [], reasons)
+
+
+def backtracking(regex):
+    """ Returns a list describing each construct of the given compiled regular expression that is
+    prone to catastrophic backtracking, eg: `(a+)+` or `(a|aa)+`, which may take exponential time
+    to reject some values. An empty list does not guarantee matching takes linear time. Results
+    are cached per pattern.
+
+    Keyword arguments:
+    regex pattern -- A compiled regular expression.
+    """
+    key = (regex.pattern, regex.flags)
+    try:
+        return _analysed[key]
+    except KeyError:
+        pass
+
+    reasons = []
+    walk(sre_parse.parse(regex.pattern, regex.flags), regex.flags, None, [], reasons)
+    if len(_analysed) >= CACHE_SIZE:
+        _analysed.clear()
+    _analysed[key] = reasons
+    return reasons
+
+
+def check(regex, stacklevel=3):
+    """ Issues a BacktrackingWarning if the given compiled regular expression is prone to
+    catastrophic backtracking. Returns True if it is. """
+    reasons = backtracking(regex)
+    if reasons:
+        warnings.warn(
+            'Expression `{}` is prone to catastrophic backtracking: {}. Consider limiting the length '
+            'of values it is applied to.'.format(regex.pattern, '; '.join(sorted(set(reasons)))),
+            BacktrackingWarning,
+            stacklevel
+        )
+    return bool(reasons)
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+import cost
+import index
+import patterns
+import re
+import rule
+import rules
+import stages
+
+class Plan(object):
+    """ A Field's rules compiled into a pair of specialised functions. Built-in rules are inlined,
+    the blank and stripped forms of a value are computed at most once, and adjacent regular
+    expression rules are merged into a single pattern. If the merged pattern fails, a single scan
+    by a `patterns.Engine` reports which of the rules failed. Results are identical to `Field.check`.
+    Normalised views read by rules are computed once, up front. Memoryview values, which compiled
+    patterns cannot read, are handed to the interpreted field. """
+    def __init__(self, _field):
+        """ Constructor that instantiates a class instance and properties. Rules appended to the
+        given field afterwards are not included in this plan. Rules of fields that are reordered
+        by cost are compiled in their current order.
+
+        Keyword arguments:
+        _field Field -- The field whose rules are compiled.
+        """
+        self.field = _field.copy()
+        self.namespace = {}
+        cost_order = self.field.order()
+        if cost_order is None:
+            self.order = None
+            self.steps = self.plan(self.field.rules)
+        else:
+            self.order = list(cost_order.order)
+            self.steps = self.plan([self.field.rules[i] for i in self.order])
+        self.source = '\n'.join(self.generate_passes() + [''] + self.generate_check())
+        exec(compile(self.source, '<plan {!r}>'.format(self.field.title), 'exec'), self.namespace)
+        self.passes = self.namespace['passes']
+        self.check = self.namespace['check']
+
+    def __call__(self, value):
+        """ Same as method `check`. """
+        return self.check(value)
+
+    def bind(self, name, i, obj):
+        """ Makes obj available to the generated functions and returns the name it is bound to. """
+        name = '{}_{}'.format(name, i)
+        self.namespace[name] = obj
+        return name
+
+    def expression(self, i, r):
+        """ Returns a Python expression, in terms of `value` and `stripped`, that is true if the
+        given rule passes, ignoring 'pass_on_blank'. Rules are only inlined if their `run` method
+        has not been overridden. """
+        if self.field.cache is not None:
+            return '{}.run({}, value)'.format(self.bind('cache', i, self.field.cache), self.bind('rule', i, r))
+
+        run = getattr(type(r).run, '__func__', None)
+        subject = 'stripped' if getattr(r, 'strip', False) else 'value'
+
+        if run is rules.Matches.run.__func__:
+            return '({} == value)'.format(self.bind('match', i, r.match))
+        if run is rules.Regex.run.__func__ and r.max_length is None:
+            return self.bind('regex', i, r.regex.match) + '(value)'
+        if run is rules.IsRequired.run.__func__:
+            return 'value'
+        if run is rules.IsLength.run.__func__:
+            return '{} == {}'.format(self.length(i, r, subject), self.bind('length', i, r.length))
+        if run is rules.IsLengthBetween.run.__func__:
+            return '{} <= {} <= {}'.format(
+                self.bind('minimum', i, r.minimum), self.length(i, r, subject), self.bind('maximum', i, r.maximum)
+            )
+        if run is rules.IsInList.run.__func__:
+            return self.bind('contains', i, r.contains) + '(value)'
+        if run is rules.IsNotInList.run.__func__:
+            return 'not {}(value)'.format(self.bind('contains', i, r.contains))
+        if run is rules.IsType.run.__func__:
+            return 'isinstance(value, {})'.format(self.bind('type', i, type(r.asserted_type)))
+        return self.bind('rule', i, r) + '.run(value)'
+
+    def earlier(self, i):
+        """ Returns a function returning the failure of the first rule, in declared order, ranked
+        after the rule at ranked position i but declared before it that fails for a value, or None.
+        Returns None if there are no such rules. """
+        skipped = cost.skipped(self.order, i + 1, self.order[i])
+        if not skipped:
+            return None
+        _field = self.field
+
+        def first(value):
+            views = None if _field.pipeline is None else _field.views(value)
+            for n in skipped:
+                r = _field.rules[n]
+                subject = value if views is None else views[n]
+                if not (r.run(subject) if _field.cache is None else _field.cache.run(r, subject)):
+                    return r.failure(subject)
+            return None
+        return first
+
+    def length(self, i, r, subject):
+        """ Returns a Python expression measuring the subject in the unit of the given length rule. """
+        if r.unit is None:
+            return 'len({})'.format(subject)
+        return '{}({}, {!r})'.format(self.bind('measure', i, rules.measure), subject, r.unit)
+
+    def plan(self, _rules):
+        """ Returns a list of steps, each a dict describing a single rule or a group of adjacent
+        regular expression rules that can be merged. """
+        steps = []
+        for i, r in enumerate(_rules):
+            expression = self.expression(i, r)
+            step = {
+                'rules': [(i, r)],
+                'view': self.field.position(r),
+                'blank': r.pass_on_blank,
+                'stripped': 'stripped' in expression,
+                'expression': expression
+            }
+
+            if self.mergeable(r) and steps:
+                previous = steps[-1]
+                head = previous['rules'][0][1]
+                if self.mergeable(head) and head.pass_on_blank == r.pass_on_blank \
+                        and head.regex.flags == r.regex.flags and previous['view'] == step['view']:
+                    previous['rules'].append((i, r))
+                    continue
+            steps.append(step)
+
+        for n, step in enumerate(steps):
+            if len(step['rules']) > 1:
+                head = step['rules'][0][1]
+                merged = re.compile(
+                    ''.join('(?={})'.format(r.regex.pattern) for _, r in step['rules']),
+                    head.regex.flags
+                )
+                step['expression'] = self.bind('merged', n, merged.match) + '(value)'
+                step['scan'] = self.bind('scan', n, patterns.engine([r.regex for _, r in step['rules']]).scan)
+        return steps
+
+    def mergeable(self, r):
+        """ Returns True if the given rule is an inlined regular expression that can safely be
+        merged with its neighbours. """
+        return self.field.cache is None \
+            and getattr(type(r).run, '__func__', None) is rules.Regex.run.__func__ \
+            and r.max_length is None \
+            and patterns.combinable(r.regex)
+
+    def condition(self, step, expression):
+        """ Wraps an expression so it also passes on blank values if required by the step. """
+        if step['blank']:
+            return '(blank or {})'.format(expression)
+        return expression
+
+    def hoist(self, step, computed, indent):
+        """ Returns lines computing the blank and stripped forms of the value the first time a step
+        requires them, in the same order the interpreted rules would have. Blank values are tested
+        with `rule.is_blank`, and are not stripped by steps that pass on blank, so values without
+        a `strip` method, such as None, behave as they do in `Field.check`. """
+        lines = []
+        if step['blank'] and 'blank' not in computed:
+            lines.append(indent + 'blank = {}(value)'.format(self.bind('is', 'blank', rule.is_blank)))
+            computed.add('blank')
+        if step['stripped'] and 'stripped' not in computed:
+            if step['blank']:
+                if 'stripped unless blank' not in computed:
+                    lines.append(indent + 'if not blank:')
+                    lines.append(indent + '    stripped = value.strip()')
+                    computed.add('stripped unless blank')
+                return lines
+            if 'stripped unless blank' in computed:
+                lines.append(indent + 'if blank:')
+                lines.append(indent + '    stripped = value.strip()')
+            else:
+                lines.append(indent + 'stripped = value.strip()')
+            computed.add('stripped')
+        return lines
+
+    def views(self, indent):
+        """ Returns lines computing every normalised view read by a rule, each from the view before
+        it. Values a stage cannot be applied to are passed on unchanged, as by `Pipeline.views`. """
+        depth = max([step['view'] for step in self.steps] or [0])
+        if not depth:
+            return []
+        pipeline = self.field.pipeline
+        errors = self.bind('stage', 'errors', stages.ERRORS)
+        lines = [indent + 'view_0 = value']
+        for n in xrange(1, depth + 1):
+            stage = pipeline.stages[n - 1]
+            if stage is stages.strip:
+                call = 'view_{}.strip()'.format(n - 1)
+            elif stage is stages.casefold:
+                call = '{}(view_{})'.format(self.bind('casefold', n, index.casefold), n - 1)
+            else:
+                call = '{}(view_{})'.format(self.bind('stage', n, stage), n - 1)
+            lines += [
+                indent + 'try:',
+                indent + '    view_{} = {}'.format(n, call),
+                indent + 'except {}:'.format(errors),
+                indent + '    view_{} = view_{}'.format(n, n - 1)
+            ]
+        return lines
+
+    def subject(self, step, current, computed, indent):
+        """ Returns lines binding `value` to the view read by a step, if it differs from the view
+        currently bound, discarding the blank and stripped forms of the previous view. """
+        if step['view'] == current:
+            return []
+        computed.clear()
+        return [indent + 'value = view_{}'.format(step['view'])]
+
+    def generate_passes(self):
+        """ Returns the source lines of function `passes`, which returns True if all rules pass
+        without allocating any errors. """
+        lines = [
+            'def passes(value):',
+            '    if type(value) is memoryview:',
+            '        return {}(value)'.format(self.bind('interpreted', 'passes', self.field.passes))
+        ] + self.views('    ')
+        computed = set()
+        current = 0
+        for step in self.steps:
+            lines += self.subject(step, current, computed, '    ')
+            current = step['view']
+            lines += self.hoist(step, computed, '    ')
+            lines.append('    if not {}:'.format(self.condition(step, step['expression'])))
+            lines.append('        return False')
+        lines.append('    return True')
+        return lines
+
+    def generate_check(self):
+        """ Returns the source lines of function `check`, which returns the same (passed, errors)
+        tuple as `Field.check`. """
+        stop = self.field.stop_on_first_error
+        lines = [
+            'def check(value):',
+            '    if type(value) is memoryview:',
+            '        return {}(value)'.format(self.bind('interpreted', 'check', self.field.check)),
+            '    errors = None'
+        ]
+        if self.order is not None:
+            lines.append('    given = value')
+        lines += self.views('    ')
+        computed = set()
+        current = 0
+        for step in self.steps:
+            lines += self.subject(step, current, computed, '    ')
+            current = step['view']
+            lines += self.hoist(step, computed, '    ')
+            indent = '    '
+            merged = len(step['rules']) > 1
+            if merged:
+                lines.append('    if not {}:'.format(self.condition(step, step['expression'])))
+                indent = '        '
+                lines.append(indent + 'scanned = {}(value)'.format(step['scan']))
+
+            for k, (i, r) in enumerate(step['rules']):
+                failure = self.bind('failure', i, r.failure)
+                expression = 'scanned[{}] is not None'.format(k) if merged else self.expression(i, r)
+                lines.append(indent + 'if not {}:'.format(self.condition(step, expression)))
+                earlier = None if self.order is None else self.earlier(i)
+                if stop and earlier is not None:
+                    lines.append(indent + '    return False, [{}(given) or {}(value)]'.format(
+                        self.bind('earlier', i, earlier), failure
+                    ))
+                elif stop:
+                    lines.append(indent + '    return False, [{}(value)]'.format(failure))
+                else:
+                    lines.append(indent + '    if errors is None:')
+                    lines.append(indent + '        errors = []')
+                    lines.append(indent + '    errors.append({}(value))'.format(failure))
+        lines.append('    if errors is None:')
+        lines.append('        return True, []')
+        lines.append('    return False, errors')
+        return lines
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+""" Opt-in timing of rules and fields. While profiling is disabled, fields check a single module
+attribute and never call a timer. Once enabled with a sink, every rule run by `Field.check`,
+`Field.passes` and `Field.check_column` is timed, along with the field as a whole, and the
+timings are passed to the sink's `record` method. Compiled plans are not instrumented. Sinks are
+per process, so records validated by `Collection.run_parallel` are not timed.
+
+Usage:
+
+    with profiler.profile() as timings:
+        form.run()
+    print profiler.report(timings)
+"""
+import contextlib
+import cost
+import os
+import random
+import slots
+import tempfile
+import threading
+import time
+import timeit
+
+# The sink receiving timings, or None while profiling is disabled.
+sink = None
+
+# Number of timings kept per rule or field to estimate percentiles.
+SAMPLES = 1024
+
+def enable(_sink=None):
+    """ Starts timing rules and fields and returns the sink receiving the timings.
+
+    Keyword arguments:
+    _sink object -- Any object implementing method `record` of class Aggregator. Defaults to a new Aggregator. (optional)
+    """
+    global sink
+    sink = Aggregator() if _sink is None else _sink
+    return sink
+
+
+def disable():
+    """ Stops timing rules and fields. """
+    global sink
+    sink = None
+
+
+@contextlib.contextmanager
+def profile(_sink=None):
+    """ Times rules and fields within a with-statement, yielding the sink receiving the timings.
+
+    Keyword arguments:
+    _sink object -- Any object implementing method `record` of class Aggregator. Defaults to a new Aggregator. (optional)
+    """
+    previous = sink
+    try:
+        yield enable(_sink)
+    finally:
+        if previous is None:
+            disable()
+        else:
+            enable(previous)
+
+
+def check(_field, value):
+    """ Same as `Field.check`, while timing each rule run and the field as a whole.
+
+    Keyword arguments:
+    _field Field -- The field whose rules are applied.
+    value str    -- The value to apply the field's rules against.
+    """
+    record = sink.record
+    clock = timeit.default_timer
+    started = clock()
+
+    _rules = _field.rules
+    views = None if _field.pipeline is None else _field.views(value)
+    cost_order = _field.order()
+    order = range(len(_rules)) if cost_order is None else cost_order.order
+    cache = _field.cache
+
+    errors = []
+    failures = []
+    executed = 0
+    for i in order:
+        rule = _rules[i]
+        executed += 1
+        subject = value if views is None else views[i]
+        began = clock()
+        passed = rule.run(subject) if cache is None else cache.run(rule, subject)
+        record('rule', type(rule).__name__, clock() - began, bool(passed))
+        if not passed:
+            errors.append(rule.failure(subject))
+            failures.append(i)
+            if _field.stop_on_first_error:
+                break
+
+    if cost_order is not None:
+        ran = order[:executed]
+        if failures:
+            # As in `CostOrder.check`, the error reported is the one declared order would report.
+            for i in cost.skipped(order, executed, failures[0]):
+                rule = _rules[i]
+                ran.append(i)
+                subject = value if views is None else views[i]
+                began = clock()
+                passed = rule.run(subject) if cache is None else cache.run(rule, subject)
+                record('rule', type(rule).__name__, clock() - began, bool(passed))
+                if not passed:
+                    errors = [rule.failure(subject)]
+                    failures.append(i)
+                    break
+        cost_order.record(ran, failures)
+    record('field', _field.title, clock() - started, not errors)
+    return False if errors else True, errors
+
+
+def percentile(samples, q):
+    """ Returns the q-th quantile of the given samples, or 0.0 if there are none.
+
+    Keyword arguments:
+    samples list -- Timings in seconds.
+    q float      -- A quantile between 0 and 1.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[int(round(q * (len(ordered) - 1)))]
+
+
+class Timing(slots.Slotted):
+    """ Timings of a single rule class or field. Percentiles are estimated from a uniform sample
+    of at most `size` timings, so memory use does not grow with the number of calls. """
+    __slots__ = ('calls', 'total', 'passed', 'failed', 'samples', 'size')
+
+    def __init__(self, size=SAMPLES):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        size int -- Maximum number of timings kept to estimate percentiles. (optional)
+        """
+        self.calls = 0
+        self.total = 0.0
+        self.passed = 0
+        self.failed = 0
+        self.samples = []
+        self.size = size
+
+    def add(self, seconds, passed):
+        """ Adds a single timing.
+
+        Keyword arguments:
+        seconds float -- The time taken.
+        passed bool   -- Whether the rule or field passed.
+        """
+        self.calls += 1
+        self.total += seconds
+        if passed:
+            self.passed += 1
+        else:
+            self.failed += 1
+        if len(self.samples) < self.size:
+            self.samples.append(seconds)
+        else:
+            i = random.randint(0, self.calls - 1)
+            if i < self.size:
+                self.samples[i] = seconds
+
+    def stats(self):
+        """ Returns a dict of calls, total, mean, p50 and p99 times in seconds, and pass/fail counts. """
+        return {
+            'calls': self.calls,
+            'total': self.total,
+            'mean': self.total / self.calls if self.calls else 0.0,
+            'p50': percentile(self.samples, 0.5),
+            'p99': percentile(self.samples, 0.99),
+            'passed': self.passed,
+            'failed': self.failed
+        }
+
+
+class Aggregator(object):
+    """ Sink that keeps timings in memory, keyed by kind ('rule' or 'field') and name (the rule's
+    class name or the field's title). Safe to share between threads. """
+    def __init__(self, samples=SAMPLES):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        samples int -- Maximum number of timings kept per rule or field to estimate percentiles. (optional)
+        """
+        self.samples = samples
+        self.timings = {}
+        self.lock = threading.Lock()
+
+    def record(self, kind, name, seconds, passed):
+        """ Adds a single timing.
+
+        Keyword arguments:
+        kind str      -- Either 'rule' or 'field'.
+        name str      -- The rule's class name or the field's title.
+        seconds float -- The time taken.
+        passed bool   -- Whether the rule or field passed.
+        """
+        key = (kind, name)
+        with self.lock:
+            timing = self.timings.get(key)
+            if timing is None:
+                timing = self.timings[key] = Timing(self.samples)
+            timing.add(seconds, passed)
+
+    def stats(self, kind=None):
+        """ Returns a list of dicts, one per rule class or field, in the format of `Timing.stats`
+        with additional 'kind' and 'name' keys, slowest in total first.
+
+        Keyword arguments:
+        kind str -- Only return timings of this kind, either 'rule' or 'field'. (optional)
+        """
+        with self.lock:
+            items = self.timings.items()
+            stats = []
+            for (k, name), timing in items:
+                if kind is None or k == kind:
+                    s = timing.stats()
+                    s.update(kind=k, name=name)
+                    stats.append(s)
+        return sorted(stats, key=lambda s: (-s['total'], s['kind'], s['name']))
+
+    def clear(self):
+        """ Discards all timings. """
+        with self.lock:
+            self.timings.clear()
+
+
+class PrometheusFile(Aggregator):
+    """ Aggregator that also writes its timings to a local file in the Prometheus text format,
+    eg: for the node exporter's textfile collector. The file is replaced atomically at most once
+    every `interval` seconds while recording, and whenever method `write` is called. Only one
+    thread writes at a time, and errors writing the file while recording are ignored so they
+    never fail validation. """
+    def __init__(self, path, interval=10.0, samples=SAMPLES, clock=time.time):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        path str         -- The path of the file to write.
+        interval float   -- Minimum number of seconds between writes while recording. (optional)
+        samples int      -- Maximum number of timings kept per rule or field to estimate percentiles. (optional)
+        clock callable   -- Returns the current time in seconds. (optional)
+        """
+        super(PrometheusFile, self).__init__(samples)
+        self.path = path
+        self.interval = interval
+        self.clock = clock
+        self.written = clock()
+        self.writing = threading.Lock()
+
+    def record(self, kind, name, seconds, passed):
+        """ Same as `Aggregator.record`, writing the file if `interval` seconds have passed and no
+        other thread is writing it. """
+        super(PrometheusFile, self).record(kind, name, seconds, passed)
+        if self.clock() - self.written < self.interval or not self.writing.acquire(False):
+            return
+        try:
+            if self.clock() - self.written >= self.interval:
+                self.replace()
+        except (IOError, OSError):
+            pass
+        finally:
+            self.writing.release()
+
+    def write(self):
+        """ Writes all timings to the file. """
+        with self.writing:
+            self.replace()
+
+    def replace(self):
+        """ Writes all timings to a uniquely named temporary file and renames it over the file.
+        Callers must hold `writing`. """
+        self.written = self.clock()
+        directory, name = os.path.split(self.path)
+        fd, temporary = tempfile.mkstemp('.tmp', name + '.', directory or '.')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(prometheus(self))
+            os.chmod(temporary, 0644)
+            os.rename(temporary, self.path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+
+def label(value):
+    """ Returns the given value escaped for use as a Prometheus label value. """
+    if isinstance(value, unicode):
+        value = value.encode('utf-8')
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus(aggregator):
+    """ Returns the timings of the given aggregator in the Prometheus text format. Durations are
+    exported as summaries with 0.5 and 0.99 quantiles, and outcomes as counters.
+
+    Keyword arguments:
+    aggregator Aggregator -- The timings to export.
+    """
+    lines = []
+    for kind in ('rule', 'field'):
+        stats = sorted(aggregator.stats(kind), key=lambda s: s['name'])
+        name = 'validator_{}_seconds'.format(kind)
+        lines.append('# HELP {} Time spent validating each {}.'.format(name, kind))
+        lines.append('# TYPE {} summary'.format(name))
+        for s in stats:
+            l = '{}="{}"'.format(kind, label(s['name']))
+            lines.append('{}{{{},quantile="0.5"}} {!r}'.format(name, l, s['p50']))
+            lines.append('{}{{{},quantile="0.99"}} {!r}'.format(name, l, s['p99']))
+            lines.append('{}_sum{{{}}} {!r}'.format(name, l, s['total']))
+            lines.append('{}_count{{{}}} {}'.format(name, l, s['calls']))
+
+        name = 'validator_{}_outcomes_total'.format(kind)
+        lines.append('# HELP {} Number of times each {} passed or failed.'.format(name, kind))
+        lines.append('# TYPE {} counter'.format(name))
+        for s in stats:
+            l = '{}="{}"'.format(kind, label(s['name']))
+            lines.append('{}{{{},outcome="passed"}} {}'.format(name, l, s['passed']))
+            lines.append('{}{{{},outcome="failed"}} {}'.format(name, l, s['failed']))
+    return '\n'.join(lines) + '\n'
+
+
+def report(aggregator, n=10, kind='rule'):
+    """ Returns a table of the n rule classes, or fields, taking the most time in total.
+
+    Keyword arguments:
+    aggregator Aggregator -- The timings to report.
+    n int                 -- The number of rows. (optional)
+    kind str              -- Either 'rule' or 'field'. (optional)
+    """
+    rows = ['{:<24} {:>10} {:>12} {:>10} {:>10} {:>10} {:>8}'.format(
+        kind, 'calls', 'total (ms)', 'mean (us)', 'p50 (us)', 'p99 (us)', 'failed'
+    )]
+    for s in aggregator.stats(kind)[:n]:
+        name = s['name'].encode('utf-8') if isinstance(s['name'], unicode) else str(s['name'])
+        rows.append('{:<24} {:>10} {:>12.3f} {:>10.2f} {:>10.2f} {:>10.2f} {:>8}'.format(
+            name[:24], s['calls'], s['total'] * 1e3, s['mean'] * 1e6, s['p50'] * 1e6, s['p99'] * 1e6, s['failed']
+        ))
+    return '\n'.join(rows)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import rule
+import slots
+
+class Result(slots.Slotted):
+    """ Represents the outcome of validating a single record. Instances are created fresh for
+    every validation and are never shared. Field titles, values and failures are stored as parallel
+    sequences; the dictionary views returned by `results()`, `errors()` and `codes()` are built on
+    demand, so error messages are only formatted if they are read. """
+    __slots__ = ('titles', 'values', 'failures', 'passed', 'collated')
+
+    def __init__(self, titles, values, failures):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        titles tuple  -- Field titles, usually shared by every Result of the same schema.
+        values list   -- The value validated for each field.
+        failures list -- The list of rule.Failure instances for each field, or None for fields that passed.
+        """
+        self.titles = titles
+        self.values = values
+        self.failures = failures
+        self.passed = not any(failures)
+        self.collated = None
+
+    def __nonzero__(self):
+        """ Allows for truth testing; a result is truthy only if all rules passed. """
+        return self.passed
+
+    def __iter__(self):
+        """ Returns generator to iterate through the collated field results. """
+        for r in self.results():
+            yield r
+
+    def __len__(self):
+        """ Implements built-in len() to return number of collated field results. """
+        return len(self.titles)
+
+    def __getitem__(self, i):
+        """ Allows for self[key] access. Will raise IndexError if out of range. """
+        return self.results()[i]
+
+    def results(self):
+        """ Returns the collated results in the same format as `Collection.results()`. """
+        if self.collated is None:
+            self.collated = [
+                {
+                    'field': title,
+                    'value': value,
+                    'passed': not errors,
+                    'errors': rule.render(errors) if errors else None
+                }
+                for title, value, errors in zip(self.titles, self.values, self.failures)
+            ]
+        return self.collated
+
+    def form(self):
+        """ Returns a dict representing the validated record in field:value pairs. """
+        return dict(zip(self.titles, self.values))
+
+    def errors(self):
+        """ Returns a dict containing only a map of fields with any
+        corresponding errors or None if all rules passed.
+        """
+        return {
+            title:rule.render(errors)
+            for title, errors in zip(self.titles, self.failures)
+            if errors
+        } or None
+
+    def codes(self):
+        """ Returns a dict containing only a map of fields with any failing rules to the codes of
+        those rules, or None if all rules passed. No error messages are formatted; errors that were
+        recorded as messages rather than failures have a code of None.
+        """
+        return {
+            title:[getattr(f, 'code', None) for f in errors]
+            for title, errors in zip(self.titles, self.failures)
+            if errors
+        } or None
@@ -1,7 +1,117 @@
 # -*- coding: utf-8 -*-
+import slots
 
-class Rule(object):
+def is_blank(value):
+    """ Returns True if the given value is empty or contains only whitespace. Unlike testing
+    `value.strip()`, no stripped copy of the value is made.
+
+    Keyword arguments:
+    value mixed -- A byte string, unicode string, bytearray or memoryview.
+    """
+    if isinstance(value, memoryview):
+        for c in value:
+            if not c.isspace():
+                return False
+        return True
+    return not value or value.isspace()
+
+
+def strip(value):
+    """ Returns the given value without leading and trailing whitespace. memoryviews, which have
+    no `strip` method, are copied to a byte string first.
+
+    Keyword arguments:
+    value mixed -- A byte string, unicode string, bytearray or memoryview.
+    """
+    if isinstance(value, memoryview):
+        value = value.tobytes()
+    return value.strip()
+
+def render(failures):
+    """ Returns the error message of each of the given failures. Error messages that have already
+    been formatted are returned as they are.
+
+    Keyword arguments:
+    failures list -- Instances of class Failure or error messages.
+    """
+    return [f.render() if isinstance(f, Failure) else f for f in failures]
+
+
+class Failure(slots.Slotted):
+    """ Records that a rule failed for a field value. The error message is only formatted when the
+    failure is rendered, compared or converted to a string, so failures nobody reads cost no more
+    than this instance. Callers that only need to know why a value failed can compare `code`. """
+    __slots__ = ('rule', 'value')
+
+    def __init__(self, rule, value):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        rule Rule   -- The rule that failed.
+        value mixed -- The value of the associated field that failed the rule.
+        """
+        self.rule = rule
+        self.value = value
+
+    @property
+    def code(self):
+        """ The machine-readable code of the rule that failed. """
+        return self.rule.code
+
+    @property
+    def template(self):
+        """ The unformatted error message of the rule that failed. """
+        return self.rule.error
+
+    @property
+    def arguments(self):
+        """ The values formatted into the error message. """
+        return self.rule.arguments(self.value)
+
+    def render(self):
+        """ Returns the formatted error message. """
+        return self.rule.message(self.value)
+
+    def __str__(self):
+        """ Returns the formatted error message as a byte string. """
+        message = self.render()
+        return message.encode('utf-8') if isinstance(message, unicode) else message
+
+    def __unicode__(self):
+        """ Returns the formatted error message as a unicode string. """
+        message = self.render()
+        return message if isinstance(message, unicode) else message.decode('utf-8', 'replace')
+
+    def __repr__(self):
+        return '<Failure {}: {!r}>'.format(self.code, self.render())
+
+    def __eq__(self, other):
+        """ Failures are equal to other failures with the same code and message, and to their
+        formatted error message. """
+        if isinstance(other, Failure):
+            return self.code == other.code and self.render() == other.render()
+        return self.render() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.render())
+
+
+class Rule(slots.Slotted):
     """ Base abstract class representing a rule. All defined rules must be derived from this class. """
+    __slots__ = ('error', 'pass_on_blank', 'view')
+
+    # Set to True by rules whose outcome depends only on the field value, allowing it to be cached.
+    pure = False
+
+    # Relative cost of running this rule, used to run cheap rules first when fields are reordered.
+    cost = 10
+
+    # Machine-readable code reported by failures of this rule.
+    code = None
+
     def __init__(self, error = None, pass_on_blank = False):
         """ Constructor that instantiates a class instance and properties.
 
@@ -11,8 +121,116 @@ class Rule(object):
         """
         self.error = error
         self.pass_on_blank = pass_on_blank
+        self.view = None
+
+
+    def using(self, view):
+        """ Applies this rule against the named view of the field value, computed by the stage of
+        the same name of the field's normalisation pipeline, rather than the value as given. See
+        module `validator.stages`. Returns this rule.
 
+        Keyword arguments:
+        view str -- The name of a normalisation stage, or None for the value as given.
+        """
+        self.view = view
+        return self
 
     def run(self, field_value):
         """ Invoked once a defined rule is ready to be validated. """
-        raise NotImplementedError('This method cannot be accessed directly')
\ No newline at end of file
+        raise NotImplementedError('This method cannot be accessed directly')
+
+    def run_column(self, field_values):
+        """ Applies this rule against a whole column of values at once, returning a list of
+        booleans in the same order. Derived classes may override this with a vectorised
+        implementation; by default method `run` is called once per value.
+
+        Keyword arguments:
+        field_values list -- the values of the associated field to compare.
+        """
+        return [self.run(v) for v in field_values]
+
+    def printable(self, field_value):
+        """ Returns the given field value in a form suitable for formatting into an error message.
+        bytearrays and memoryviews are converted to byte strings, which are decoded as UTF-8 only
+        if the error message is a unicode string.
+
+        Keyword arguments:
+        field_value mixed -- the value of the associated field that failed this rule.
+        """
+        if isinstance(field_value, memoryview):
+            field_value = field_value.tobytes()
+        elif isinstance(field_value, bytearray):
+            field_value = str(field_value)
+        if isinstance(field_value, str) and isinstance(self.error, unicode):
+            return field_value.decode('utf-8', 'replace')
+        return field_value
+
+    def failure(self, field_value):
+        """ Returns an instance of class Failure recording that this rule failed for the given
+        value. The error message is not formatted until it is read.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field that failed this rule.
+        """
+        return Failure(self, field_value)
+
+    def arguments(self, field_value):
+        """ Returns the values formatted into the error message for a failed rule. The error
+        message is used as is if there are none.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field that failed this rule.
+        """
+        return ()
+
+    def message(self, field_value):
+        """ Returns the error message for a failed rule. The rule itself is never modified, so a
+        single instance may be shared between threads.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field that failed this rule.
+        """
+        arguments = self.arguments(field_value)
+        if not arguments:
+            return self.error
+        return self.error.format(*arguments)
+
+
+class AsyncRule(Rule):
+    """ Base abstract class representing a rule that blocks on I/O, such as a database or network
+    lookup. Fields with any of these rules are run concurrently by `Collection.run_async` and
+    `Schema.validate_async`; fields without them are run inline. """
+    __slots__ = ()
+
+    cost = 1000
+
+class CrossFieldRule(Rule):
+    """ Base abstract class representing a rule that compares a field's value against the values
+    of other fields of the same record, referenced by title. These rules are applied by
+    collections and schemas once the fields they depend on have passed; a field checked on its
+    own ignores them. """
+    __slots__ = ('depends',)
+
+    def __init__(self, depends, error = None, pass_on_blank = False):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        depends tuple      -- The titles of the fields this rule depends on.
+        error str          -- A user-defined error messaged for a failed rule. (optional)
+        pass_on_blank bool -- Pass through as success if field value is blank. (optional)
+        """
+        super(CrossFieldRule, self).__init__(error, pass_on_blank)
+        self.depends = tuple(depends)
+
+    def run(self, field_value, record):
+        """ Invoked once a defined rule is ready to be validated.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field to compare
+        record dict     -- A mapping of the titles of all fields of the record to their values.
+        """
+        raise NotImplementedError('This method cannot be accessed directly')
+
+    def run_column(self, field_values):
+        """ Cross-field rules cannot be applied against a column of a single field. """
+        raise NotImplementedError('Cross-field rules cannot be applied against a single column')
@@ -1,10 +1,98 @@
 # -*- coding: utf-8 -*-
+import collections
+import index
+import patterns
 import rule
 import re
 
+# Compiled patterns shared by all instances of the built-in regex rules.
+PATTERNS = {
+    'email': re.compile(r'^[a-zA-Z0-9._%-+]+@[a-zA-Z0-9._%-]+.[a-zA-Z]{2,6}$'),
+    'numeric': re.compile(r'^[0-9]*$'),
+    'alpha': re.compile(r'^[a-zA-Z]*$'),
+    'alpha_numeric': re.compile(r'^[a-zA-Z0-9]*$')
+}
+
+# Bytes 0x80 to 0xBF only ever continue a UTF-8 encoded code point.
+CONTINUATION_BYTES = ''.join(chr(c) for c in range(0x80, 0xC0))
+
+# Units in which length rules measure field values.
+UNITS = (None, 'bytes', 'chars')
+
+# Maximum number of user-defined patterns kept by function `compile_expression`.
+CACHE_SIZE = 256
+
+_cache = {}
+
+def compile_expression(expression, flags=0):
+    """ Compiles a regular expression, returning the same pattern object for repeated calls with
+    identical arguments. The cache is emptied once it holds CACHE_SIZE patterns. Raises ValueError
+    if the expression is invalid.
+
+    Keyword arguments:
+    expression str -- The regular expression to compile.
+    flags int      -- Flags from module `re` used to compile the expression. (optional)
+    """
+    key = (type(expression), expression, flags)
+    try:
+        return _cache[key]
+    except KeyError:
+        pass
+
+    try:
+        regex = re.compile(expression, flags)
+    except Exception, e:
+        raise ValueError("Expression `{}` failed with the following error: {}".format(expression, e))
+
+    if len(_cache) >= CACHE_SIZE:
+        _cache.clear()
+    _cache[key] = regex
+    return regex
+
+
+def measure(value, unit=None):
+    """ Returns the length of the given value. Byte strings, bytearrays and memoryviews are
+    measured in code points, if unit is 'chars', by counting the bytes that start a UTF-8 encoded
+    code point rather than by decoding them.
+
+    Keyword arguments:
+    value mixed -- A byte string, unicode string, bytearray or memoryview.
+    unit str    -- One of 'bytes', 'chars' or None to use built-in len(). (optional)
+    """
+    if unit is None:
+        return len(value)
+    if isinstance(value, unicode):
+        return len(value.encode('utf-8')) if unit == 'bytes' else len(value)
+    if unit == 'bytes':
+        return len(value)
+    if isinstance(value, memoryview):
+        value = value.tobytes()
+    return len(value.translate(None, CONTINUATION_BYTES))
+
+
+def measure_all(values, strip=False, unit=None):
+    """ Returns the length of each of the given values as per function `measure`.
+
+    Keyword arguments:
+    values list -- The values to measure.
+    strip bool  -- Strip whitespace from each value before measuring it. (optional)
+    unit str    -- One of 'bytes', 'chars' or None to use built-in len(). (optional)
+    """
+    if strip:
+        values = [rule.strip(v) for v in values]
+    if unit is None:
+        return [len(v) for v in values]
+    return [measure(v, unit) for v in values]
+
+
 class Matches(rule.Rule):
     """ Simple rule used to determine whether one value matches another. Commonly used
     for password confirmation. """
+    __slots__ = ('match',)
+    code = 'matches'
+    pure = True
+    cost = 1
+
     def __init__(self, match, error=None, pass_on_blank=False):
         """ Constructor that instantiates a class instance and properties.
 
@@ -25,29 +113,69 @@ class Matches(rule.Rule):
         Keyword arguments:
         field_value str -- the value of the associated field to compare.
         """
-        if self.pass_on_blank and not field_value.strip():
+        if self.pass_on_blank and rule.is_blank(field_value):
             return True
 
         if self.match != field_value:
-            self.error = self.error.format(field_value, self.match)
             return False
         return True
 
+    def run_column(self, field_values):
+        """ Vectorised form of method `run`, applied against a whole column of values at once.
+
+        Keyword arguments:
+        field_values list -- the values of the associated field to compare.
+        """
+        match = self.match
+        if self.pass_on_blank:
+            is_blank = rule.is_blank
+            return [is_blank(v) or v == match for v in field_values]
+        return [v == match for v in field_values]
+
+    def arguments(self, field_value):
+        """ Returns the values formatted into the error message for a failed rule.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field that failed this rule.
+        """
+        return self.printable(field_value), self.match
+
 
 class Regex(rule.Rule):
     """ Applies a regular expression to a given field value. """
-    def __init__(self, expression, error=None, pass_on_blank=False):
-        """ Constructor that instantiates a class instance and properties.
+    __slots__ = ('regex', 'expression', 'max_length')
+    code = 'regex'
+    pure = True
+    cost = 5
+
+    def __init__(self, expression, error=None, pass_on_blank=False, flags=0, max_length=None):
+        """ Constructor that instantiates a class instance and properties. The expression is
+        compiled once, here, and will raise ValueError if it is invalid. A BacktrackingWarning
+        is issued if the expression is prone to catastrophic backtracking and max_length is not
+        given; see function `patterns.backtracking`.
 
         Keyword arguments:
-        expression str     -- The regular expression to apply to the given field.
+        expression mixed   -- The regular expression, or compiled pattern, to apply to the given field.
         error str          -- A user-defined error messaged for a failed rule. (optional)
         pass_on_blank bool -- Pass through as success if field value is blank. (optional)
+        flags int          -- Flags from module `re` used to compile the expression. (optional)
+        max_length int     -- Values longer than this fail without being matched, bounding the time taken. (optional)
         """
         if not error:
             error = "Could not match `{}` with expression `{}`"
         super(Regex, self).__init__(error, pass_on_blank)
-        self.expression = expression
+
+        if not expression:
+            raise ValueError('This rule requires a regular expression.')
+
+        if hasattr(expression, 'match'):
+            self.regex = expression
+        else:
+            self.regex = compile_expression(expression, flags)
+        self.expression = self.regex.pattern
+        self.max_length = max_length
+        if max_length is None:
+            patterns.check(self.regex)
 
     def run(self, field_value):
         """ Invoked once a defined rule is ready to be validated.
@@ -55,58 +183,100 @@ class Regex(rule.Rule):
         Keyword arguments:
         field_value str -- the value of the associated field to compare
         """
-        if self.pass_on_blank and not field_value.strip():
+        if self.pass_on_blank and rule.is_blank(field_value):
             return True
+        if self.max_length is not None and len(field_value) > self.max_length:
+            return False
 
-        if not self.expression:
-            raise ValueError('This rule requires a regular expression.')
+        try:
+            matched = self.regex.match(field_value)
+        except TypeError:
+            if not isinstance(field_value, memoryview):
+                raise
+            matched = self.regex.match(field_value.tobytes())
+        if not matched:
+            return False
+        return True
+
+    def run_column(self, field_values):
+        """ Vectorised form of method `run`, applied against a whole column of values at once.
 
+        Keyword arguments:
+        field_values list -- the values of the associated field to compare.
+        """
+        if self.max_length is not None:
+            return [self.run(v) for v in field_values]
+        match = self.regex.match
         try:
-            regex = re.compile(self.expression)
+            if self.pass_on_blank:
+                is_blank = rule.is_blank
+                return [is_blank(v) or match(v) is not None for v in field_values]
+            return [match(v) is not None for v in field_values]
+        except TypeError:
+            return [self.run(v) for v in field_values]
 
-            if not regex.match(field_value):
-                self.error = self.error.format(field_value, self.expression)
-                return False
-        except Exception, e:
-            raise ValueError("Expression `{}` failed with the following error: {}".format(self.expression, e))
-        return True
+    def arguments(self, field_value):
+        """ Returns the values formatted into the error message for a failed rule.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field that failed this rule.
+        """
+        return self.printable(field_value), self.expression
 
 
 class IsEmail(Regex):
     """ Regex convenience derivative class used to determine if given field value is a
     valid email address. """
+    __slots__ = ()
+    code = 'email'
+    cost = 8
+
     def __init__(self, error=None, pass_on_blank=False):
         if not error:
             error = 'This is not a valid email address.'
-        super(IsEmail, self).__init__(r'^[a-zA-Z0-9._%-+]+@[a-zA-Z0-9._%-]+.[a-zA-Z]{2,6}$', error, pass_on_blank)
+        super(IsEmail, self).__init__(PATTERNS['email'], error, pass_on_blank)
 
 
 class IsNumeric(Regex):
     """ Regex convenience derivative class used to determine if given field value is numeric-only. """
+    __slots__ = ()
+    code = 'numeric'
+
     def __init__(self, error=None, pass_on_blank=False):
         if not error:
             error = 'This is not a number.'
-        super(IsNumeric, self).__init__(r'^[0-9]*$', error, pass_on_blank)
+        super(IsNumeric, self).__init__(PATTERNS['numeric'], error, pass_on_blank)
 
 
 class IsAlpha(Regex):
     """ Regex convenience derivative class used to determine if given field value is alpha-only. """
+    __slots__ = ()
+    code = 'alpha'
+
     def __init__(self, error=None, pass_on_blank=False):
         if not error:
             error = 'This is not an alpha-only string.'
-        super(IsAlpha, self).__init__(r'^[a-zA-Z]*$', error, pass_on_blank)
+        super(IsAlpha, self).__init__(PATTERNS['alpha'], error, pass_on_blank)
 
 
 class IsAlphaNumeric(Regex):
     """ Regex convenience derivative class used to determine if given field value is alpha-numeric. """
+    __slots__ = ()
+    code = 'alpha_numeric'
+
     def __init__(self, error=None, pass_on_blank=False):
         if not error:
             error = 'This is not an alpha-numeric string.'
-        super(IsAlphaNumeric, self).__init__(r'^[a-zA-Z0-9]*$', error, pass_on_blank)
+        super(IsAlphaNumeric, self).__init__(PATTERNS['alpha_numeric'], error, pass_on_blank)
 
 
 class IsRequired(rule.Rule):
     """ Used to determine if given field is empty. """
+    __slots__ = ()
+    code = 'required'
+    pure = True
+    cost = 1
+
     def __init__(self, error=None, pass_on_blank=False):
         """ Constructor that instantiates a class instance and properties.
 
@@ -124,18 +294,34 @@ class IsRequired(rule.Rule):
         Keyword arguments:
         field_value str -- the value of the associated field to compare
         """
-        if self.pass_on_blank and not field_value.strip():
+        if self.pass_on_blank and rule.is_blank(field_value):
             return True
 
         if not field_value:
             return False
         return True
 
+    def run_column(self, field_values):
+        """ Vectorised form of method `run`, applied against a whole column of values at once.
+
+        Keyword arguments:
+        field_values list -- the values of the associated field to compare.
+        """
+        if self.pass_on_blank:
+            is_blank = rule.is_blank
+            return [is_blank(v) or bool(v) for v in field_values]
+        return [bool(v) for v in field_values]
+
 
 class IsLength(rule.Rule):
     """ Used to determine whether the given associated field value's character length equals
     the given maximum amount. """
-    def __init__(self, length, strip = False, error=None, pass_on_blank=False):
+    __slots__ = ('length', 'strip', 'unit')
+    code = 'length'
+    pure = True
+    cost = 1
+
+    def __init__(self, length, strip = False, error=None, pass_on_blank=False, unit=None):
         """ Constructor that instantiates a class instance and properties.
 
         Keyword arguments:
@@ -143,12 +329,16 @@ class IsLength(rule.Rule):
         strip bool         -- Used to strip whitespace from the given field value. (optional)
         error str          -- A user-defined error messaged for a failed rule. (optional)
         pass_on_blank bool -- Pass through as success if field value is blank. (optional)
+        unit str           -- Measure length in 'bytes' or 'chars' rather than with built-in len(). (optional)
         """
         if not error:
             error = "String `{}` length does not equal `{}`"
+        if unit not in UNITS:
+            raise ValueError("parameter :unit must be one of None, 'bytes' or 'chars'")
         super(IsLength, self).__init__(error, pass_on_blank)
         self.length = int(length)
         self.strip = bool(strip)
+        self.unit = unit
 
     def run(self, field_value):
         """ Determines if field_value character length equal self.length.
@@ -156,18 +346,44 @@ class IsLength(rule.Rule):
         Keyword arguments:
         field_value str -- the value of the associated field to compare
         """
-        if self.pass_on_blank and not field_value.strip():
+        if self.pass_on_blank and rule.is_blank(field_value):
             return True
 
-        if len((field_value.strip() if self.strip else field_value)) != self.length:
-            self.error = self.error.format(field_value, self.length)
+        value = rule.strip(field_value) if self.strip else field_value
+        if (len(value) if self.unit is None else measure(value, self.unit)) != self.length:
             return False
         return True
 
+    def run_column(self, field_values):
+        """ Vectorised form of method `run`, applied against a whole column of values at once.
+
+        Keyword arguments:
+        field_values list -- the values of the associated field to compare.
+        """
+        length = self.length
+        if self.pass_on_blank:
+            blanks = [rule.is_blank(v) for v in field_values]
+            lengths = iter(measure_all([v for v, b in zip(field_values, blanks) if not b], self.strip, self.unit))
+            return [b or next(lengths) == length for b in blanks]
+        return [l == length for l in measure_all(field_values, self.strip, self.unit)]
+
+    def arguments(self, field_value):
+        """ Returns the values formatted into the error message for a failed rule.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field that failed this rule.
+        """
+        return self.printable(field_value), self.length
+
 
 class IsLengthBetween(rule.Rule):
     """ Used to determine whether the given associated field value's character length is
     within the given range. """
+    __slots__ = ('minimum', 'maximum', 'strip', 'unit')
+    code = 'length_between'
+    pure = True
+    cost = 1
+
     def __init__(self, minimum, maximum, **kwargs):
         """ Constructor that instantiates a class instance and properties.
 
@@ -177,13 +393,17 @@ class IsLengthBetween(rule.Rule):
         strip bool         -- Used to strip whitespace from the given field value. (optional)
         error str          -- A user-defined error messaged for a failed rule. (optional)
         pass_on_blank bool -- Pass through as success if field value is blank. (optional)
+        unit str           -- Measure length in 'bytes' or 'chars' rather than with built-in len(). (optional)
         """
         if not kwargs.get('error', None):
             kwargs['error'] = "String `{}` length is not within `{}` and `{}`"
+        if kwargs.get('unit', None) not in UNITS:
+            raise ValueError("parameter :unit must be one of None, 'bytes' or 'chars'")
         super(IsLengthBetween, self).__init__(kwargs.get('error', None), kwargs.get('pass_on_blank', False))
         self.minimum = int(minimum)
         self.maximum = int(maximum)
         self.strip = kwargs.get('strip', False)
+        self.unit = kwargs.get('unit', None)
 
     def run(self, field_value):
         """ Determines if field_value character length is between self.minimum and self.maximum.
@@ -191,32 +411,113 @@ class IsLengthBetween(rule.Rule):
         Keyword arguments:
         field_value str -- the value of the associated field to compare
         """
-        if self.pass_on_blank and not field_value.strip():
+        if self.pass_on_blank and rule.is_blank(field_value):
             return True
 
-        if self.minimum <= len((field_value.strip() if self.strip else field_value)) <= self.maximum:
+        value = rule.strip(field_value) if self.strip else field_value
+        if self.minimum <= (len(value) if self.unit is None else measure(value, self.unit)) <= self.maximum:
             return True
-
-        self.error = self.error.format(field_value, self.minimum, self.maximum)
         return False
 
+    def run_column(self, field_values):
+        """ Vectorised form of method `run`, applied against a whole column of values at once.
+
+        Keyword arguments:
+        field_values list -- the values of the associated field to compare.
+        """
+        minimum, maximum = self.minimum, self.maximum
+        if self.pass_on_blank:
+            blanks = [rule.is_blank(v) for v in field_values]
+            lengths = iter(measure_all([v for v, b in zip(field_values, blanks) if not b], self.strip, self.unit))
+            return [b or minimum <= next(lengths) <= maximum for b in blanks]
+        return [minimum <= l <= maximum for l in measure_all(field_values, self.strip, self.unit)]
+
+    def arguments(self, field_value):
+        """ Returns the values formatted into the error message for a failed rule.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field that failed this rule.
+        """
+        return self.printable(field_value), self.minimum, self.maximum
+
 
 class IsInList(rule.Rule):
-    """ Used to determine if the associated field's value exists within the specified list. """
-    def __init__(self, given_list, strip = False, error=None, pass_on_blank=False):
-        """ Constructor that instantiates a class instance and properties.
+    """ Used to determine if the associated field's value exists within the specified list. The
+    list is indexed once, on construction, so lookups take constant time regardless of its size. """
+    __slots__ = ('given_list', 'strip', 'casefold', 'normalise', 'normalised', 'entries', 'index')
+    code = 'in_list'
+    pure = True
+    cost = 2
+
+    def __init__(self, given_list, strip = False, error=None, pass_on_blank=False, casefold=False, normalise=None):
+        """ Constructor that instantiates a class instance and properties. Any normalisation is
+        applied to both the entries of given_list and the field value.
 
         Keyword arguments:
-        given_list list          -- List containing values to evaluate.
+        given_list list    -- List containing values to evaluate.
         strip bool         -- Used to strip whitespace from the given field value. (optional)
         error str          -- A user-defined error messaged for a failed rule. (optional)
         pass_on_blank bool -- Pass through as success if field value is blank. (optional)
+        casefold bool      -- Used to compare string values case-insensitively. (optional)
+        normalise callable -- Applied to string values before comparison, eg: unicode normalisation. (optional)
         """
         if not error:
             error = "Value of `{}` is not within the list"
         super(IsInList, self).__init__(error, pass_on_blank)
         self.given_list = given_list
         self.strip = strip
+        self.casefold = casefold
+        self.normalise = normalise
+        self.normalised = bool(strip or casefold or normalise)
+        self.load(given_list)
+
+    def load(self, given_list):
+        """ Builds the index used to look up field values from the given list.
+
+        Keyword arguments:
+        given_list list -- List containing values to evaluate.
+        """
+        self.entries = [self.prepare(v) for v in given_list] if self.normalised else list(given_list)
+        try:
+            self.index = frozenset(self.entries)
+        except TypeError:
+            self.index = None
+
+    def prepare(self, value):
+        """ Applies this rule's normalisation to the given value. Bytearrays and memoryviews are
+        copied into byte strings so they can be hashed. Other non-string values are returned
+        unmodified.
+
+        Keyword arguments:
+        value mixed -- The value to normalise.
+        """
+        if isinstance(value, (bytearray, memoryview)):
+            value = value.tobytes() if isinstance(value, memoryview) else str(value)
+        if not isinstance(value, basestring):
+            return value
+        if self.strip:
+            value = value.strip()
+        if self.casefold:
+            value = index.casefold(value)
+        if self.normalise:
+            value = self.normalise(value)
+        return value
+
+    def contains(self, field_value):
+        """ Returns True if the normalised field_value is an entry of the normalised list. Values
+        that cannot be hashed are compared against each entry instead.
+
+        Keyword arguments:
+        field_value mixed -- the value of the associated field to look up.
+        """
+        if self.normalised or isinstance(field_value, (bytearray, memoryview)):
+            field_value = self.prepare(field_value)
+        if self.index is not None:
+            try:
+                return field_value in self.index
+            except TypeError:
+                pass
+        return field_value in self.entries
 
     def run(self, field_value):
         """ Checks if field_value is included within self.given_list.
@@ -224,17 +525,122 @@ class IsInList(rule.Rule):
         Keyword arguments:
         field_value str -- the value of the associated field to compare
         """
-        if self.pass_on_blank and not field_value.strip():
+        if self.pass_on_blank and rule.is_blank(field_value):
             return True
 
-        if (field_value.strip() if self.strip else field_value) not in self.given_list:
-            self.error = self.error.format(field_value)
-            return False
-        return True
+        return self.contains(field_value)
+
+    def run_column(self, field_values):
+        """ Vectorised form of method `run`, applied against a whole column of values at once.
+
+        Keyword arguments:
+        field_values list -- the values of the associated field to compare.
+        """
+        index = self.index
+        if index is not None and not self.normalised:
+            try:
+                outcomes = [v in index for v in field_values]
+            except TypeError:
+                outcomes = [self.contains(v) for v in field_values]
+        else:
+            outcomes = [self.contains(v) for v in field_values]
+        if self.pass_on_blank:
+            is_blank = rule.is_blank
+            return [is_blank(v) or o for v, o in zip(field_values, outcomes)]
+        return outcomes
+
+    def arguments(self, field_value):
+        """ Returns the values formatted into the error message for a failed rule.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field that failed this rule.
+        """
+        return (self.printable(field_value),)
+
+
+class IsNotInList(IsInList):
+    """ Used to determine if the associated field's value does not exist within the specified
+    list, eg: a blocklist. Shares the index built by class IsInList. """
+    __slots__ = ()
+    code = 'not_in_list'
+
+    def __init__(self, given_list, strip = False, error=None, pass_on_blank=False, casefold=False, normalise=None):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        given_list list    -- List containing values to evaluate.
+        strip bool         -- Used to strip whitespace from the given field value. (optional)
+        error str          -- A user-defined error messaged for a failed rule. (optional)
+        pass_on_blank bool -- Pass through as success if field value is blank. (optional)
+        casefold bool      -- Used to compare string values case-insensitively. (optional)
+        normalise callable -- Applied to string values before comparison, eg: unicode normalisation. (optional)
+        """
+        if not error:
+            error = "Value of `{}` is within the list"
+        super(IsNotInList, self).__init__(given_list, strip, error, pass_on_blank, casefold, normalise)
+
+    def run(self, field_value):
+        """ Checks if field_value is not included within self.given_list.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field to compare
+        """
+        if self.pass_on_blank and rule.is_blank(field_value):
+            return True
+
+        return not self.contains(field_value)
+
+    def run_column(self, field_values):
+        """ Vectorised form of method `run`, applied against a whole column of values at once.
+
+        Keyword arguments:
+        field_values list -- the values of the associated field to compare.
+        """
+        outcomes = super(IsNotInList, self).run_column(field_values)
+        if self.pass_on_blank:
+            is_blank = rule.is_blank
+            return [is_blank(v) or not o for v, o in zip(field_values, outcomes)]
+        return [not o for o in outcomes]
+
+
+class IsInIndex(IsInList):
+    """ Variant of class IsInList for very large lists, such as postcodes or product codes. Entries
+    are read from a sorted index file, built by module `validator.index`, through mmap rather than
+    loaded into memory, so processes share the operating system's page cache. """
+    __slots__ = ()
+    cost = 20
+
+    def __init__(self, path, strip = False, error=None, pass_on_blank=False, casefold=False, normalise=None):
+        """ Constructor that instantiates a class instance and properties. Normalisation is only
+        applied to the field value; entries must have been normalised when the index was built.
+
+        Keyword arguments:
+        path mixed         -- The path of an index file built by module `validator.index`, or a SortedIndex.
+        strip bool         -- Used to strip whitespace from the given field value. (optional)
+        error str          -- A user-defined error messaged for a failed rule. (optional)
+        pass_on_blank bool -- Pass through as success if field value is blank. (optional)
+        casefold bool      -- Used to compare string values case-insensitively. (optional)
+        normalise callable -- Applied to string values before comparison, eg: unicode normalisation. (optional)
+        """
+        super(IsInIndex, self).__init__(path, strip, error, pass_on_blank, casefold, normalise)
+
+    def load(self, path):
+        """ Maps the index file at the given path.
+
+        Keyword arguments:
+        path mixed -- The path of an index file built by module `validator.index`, or a SortedIndex.
+        """
+        self.entries = ()
+        self.index = path if isinstance(path, index.SortedIndex) else index.SortedIndex(path)
 
 
 class IsType(rule.Rule):
     """ Rule that compares the associated field's value against a specified data type. """
+    __slots__ = ('asserted_type',)
+    code = 'type'
+    pure = True
+    cost = 1
+
     def __init__(self, asserted_type, error=None, pass_on_blank=False):
         """ Constructor that instantiates a class instance and properties.
 
@@ -254,10 +660,239 @@ class IsType(rule.Rule):
         Keyword arguments:
         field_value str -- the value of the associated field to compare
         """
-        if self.pass_on_blank and not field_value.strip():
+        if self.pass_on_blank and rule.is_blank(field_value):
             return True
 
         if not isinstance(field_value, type(self.asserted_type)):
-            self.error = self.error.format(type(field_value), self.asserted_type)
             return False
-        return True
\ No newline at end of file
+        return True
+
+    def run_column(self, field_values):
+        """ Vectorised form of method `run`, applied against a whole column of values at once.
+
+        Keyword arguments:
+        field_values list -- the values of the associated field to compare.
+        """
+        asserted_type = type(self.asserted_type)
+        if self.pass_on_blank:
+            is_blank = rule.is_blank
+            return [is_blank(v) or isinstance(v, asserted_type) for v in field_values]
+        return [isinstance(v, asserted_type) for v in field_values]
+
+    def arguments(self, field_value):
+        """ Returns the values formatted into the error message for a failed rule.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field that failed this rule.
+        """
+        return type(field_value), self.asserted_type
+
+
+class IsDict(rule.Rule):
+    """ Rule that determines if the associated field's value is a dict, or any other mapping. """
+    __slots__ = ()
+    code = 'dict'
+    pure = True
+    cost = 1
+
+    def __init__(self, error=None, pass_on_blank=False):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        error str          -- A user-defined error messaged for a failed rule. (optional)
+        pass_on_blank bool -- Pass through as success if field value is empty. (optional)
+        """
+        if not error:
+            error = "Value of type `{}` is not a mapping"
+        super(IsDict, self).__init__(error, pass_on_blank)
+
+    def run(self, field_value):
+        """ Determines if field_value is a mapping.
+
+        Keyword arguments:
+        field_value mixed -- the value of the associated field to compare
+        """
+        if self.pass_on_blank and not field_value:
+            return True
+        return isinstance(field_value, collections.Mapping)
+
+    def arguments(self, field_value):
+        """ Returns the values formatted into the error message for a failed rule.
+
+        Keyword arguments:
+        field_value mixed -- the value of the associated field that failed this rule.
+        """
+        return (type(field_value).__name__,)
+
+
+class IsList(rule.Rule):
+    """ Rule that determines if the associated field's value is a list or tuple. """
+    __slots__ = ()
+    code = 'list'
+    pure = True
+    cost = 1
+
+    def __init__(self, error=None, pass_on_blank=False):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        error str          -- A user-defined error messaged for a failed rule. (optional)
+        pass_on_blank bool -- Pass through as success if field value is empty. (optional)
+        """
+        if not error:
+            error = "Value of type `{}` is not a list"
+        super(IsList, self).__init__(error, pass_on_blank)
+
+    def run(self, field_value):
+        """ Determines if field_value is a list or tuple.
+
+        Keyword arguments:
+        field_value mixed -- the value of the associated field to compare
+        """
+        if self.pass_on_blank and not field_value:
+            return True
+        return isinstance(field_value, (list, tuple))
+
+    def arguments(self, field_value):
+        """ Returns the values formatted into the error message for a failed rule.
+
+        Keyword arguments:
+        field_value mixed -- the value of the associated field that failed this rule.
+        """
+        return (type(field_value).__name__,)
+
+
+def filled(value):
+    """ Returns True if the given value is neither None nor a blank string. """
+    if value is None:
+        return False
+    if isinstance(value, (basestring, bytearray, memoryview)):
+        return not rule.is_blank(value)
+    return True
+
+
+class EqualsField(rule.CrossFieldRule):
+    """ Used to determine if the associated field's value equals the value of another field of
+    the same record, eg: a password confirmation. """
+    __slots__ = ()
+    code = 'equals_field'
+    pure = True
+    cost = 1
+
+    def __init__(self, other, error=None, pass_on_blank=False):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        other str          -- The title of the field to compare against.
+        error str          -- A user-defined error messaged for a failed rule. (optional)
+        pass_on_blank bool -- Pass through as success if field value is blank. (optional)
+        """
+        if not error:
+            error = "Value of `{}` does not match field `{}`"
+        super(EqualsField, self).__init__((other,), error, pass_on_blank)
+
+    def run(self, field_value, record):
+        """ Compares field_value against the value of the other field.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field to compare
+        record dict     -- A mapping of the titles of all fields of the record to their values.
+        """
+        if self.pass_on_blank and rule.is_blank(field_value):
+            return True
+
+        return field_value == record[self.depends[0]]
+
+    def arguments(self, field_value):
+        """ Returns the values formatted into the error message for a failed rule.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field that failed this rule.
+        """
+        return self.printable(field_value), self.depends[0]
+
+
+class RequiredIf(rule.CrossFieldRule):
+    """ Used to require a value for the associated field if another field of the same record has
+    a value, or has a given value. """
+    __slots__ = ('equals',)
+    code = 'required_if'
+    pure = True
+    cost = 1
+
+    def __init__(self, other, equals=None, error=None):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        other str    -- The title of the field this field depends on.
+        equals mixed -- Only require a value if the other field equals this value. (optional)
+        error str    -- A user-defined error messaged for a failed rule. (optional)
+        """
+        if not error:
+            error = "This field requires a value if field `{}` is given"
+        super(RequiredIf, self).__init__((other,), error, False)
+        self.equals = equals
+
+    def run(self, field_value, record):
+        """ Determines if field_value has a value where required.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field to compare
+        record dict     -- A mapping of the titles of all fields of the record to their values.
+        """
+        other = record[self.depends[0]]
+        if self.equals is None:
+            required = filled(other)
+        else:
+            required = other == self.equals
+        return not required or filled(field_value)
+
+    def arguments(self, field_value):
+        """ Returns the values formatted into the error message for a failed rule.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field that failed this rule.
+        """
+        return (self.depends[0],)
+
+
+class AtLeastOneOf(rule.CrossFieldRule):
+    """ Used to require a value for at least one of the associated field and the given fields of
+    the same record, eg: a phone number or an email address. """
+    __slots__ = ()
+    code = 'at_least_one_of'
+    pure = True
+    cost = 1
+
+    def __init__(self, others, error=None):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        others list -- The titles of the other fields, any of which may have a value instead.
+        error str   -- A user-defined error messaged for a failed rule. (optional)
+        """
+        if not error:
+            error = "This field requires a value if none of `{}` are given"
+        super(AtLeastOneOf, self).__init__(others, error, False)
+
+    def run(self, field_value, record):
+        """ Determines if field_value, or the value of any of the other fields, is given.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field to compare
+        record dict     -- A mapping of the titles of all fields of the record to their values.
+        """
+        if filled(field_value):
+            return True
+        for title in self.depends:
+            if filled(record[title]):
+                return True
+        return False
+
+    def arguments(self, field_value):
+        """ Returns the values formatted into the error message for a failed rule.
+
+        Keyword arguments:
+        field_value str -- the value of the associated field that failed this rule.
+        """
+        return ('`, `'.join(self.depends),)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import batch
+import columns
+import cost
+import field
+import graph
+import parallel
+import result
+
+class Schema(object):
+    """ A reusable, read-only set of fields and rules that may be applied against any number of
+    records. Values are supplied per call to `validate`, so a single schema can be built once and
+    shared by every request in the process. """
+    def __init__(self, fields, missing=''):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        fields mixed  -- A Collection instance, or list of Field instances, describing the schema.
+        missing mixed -- The value used for fields not present in a validated record. (optional)
+        """
+        self.fields = []
+        for f in fields:
+            if not isinstance(f, field.Field):
+                raise TypeError('parameter :fields must be a Collection or list of class Field instances')
+            self.fields.append(f.copy())
+        self.fields = tuple(self.fields)
+        self.titles = tuple(f.title for f in self.fields)
+        self.missing = missing
+        self.fail_fast = cost.FailFast(self.fields)
+        self.graph = graph.Graph(self.fields)
+
+    def __iter__(self):
+        """ Returns generator to iterate through assigned fields. """
+        for f in self.fields:
+            yield f
+
+    def __len__(self):
+        """ Implements built-in len() to return number of assigned fields. """
+        return len(self.fields)
+
+    def __getitem__(self, i):
+        """ Allows for self[key] access. Will raise IndexError if out of range. """
+        return self.fields[i]
+
+    def validate(self, record):
+        """ Applies all fields and their rules against the given record and returns a new
+        instance of class Result. The schema itself is never modified.
+
+        Keyword arguments:
+        record dict -- A mapping of field titles to the values to validate.
+        """
+        missing = self.missing
+        values = [record.get(title, missing) for title in self.titles]
+        return result.Result(self.titles, values, self.graph.relate(values, [
+            f.check(value)[1] or None
+            for f, value in zip(self.fields, values)
+        ]))
+
+    def validate_async(self, record, max_concurrency=parallel.MAX_CONCURRENCY):
+        """ Same as method `validate`, except fields with any AsyncRule, such as uniqueness or
+        blocklist lookups, are run concurrently on a pool of threads. Rules within a single field
+        are still run in order.
+
+        Keyword arguments:
+        record dict         -- A mapping of field titles to the values to validate.
+        max_concurrency int -- Maximum number of fields run at the same time. (optional)
+        """
+        missing = self.missing
+        values = [record.get(title, missing) for title in self.titles]
+        return result.Result(self.titles, values, self.graph.relate(values, parallel.run_fields(
+            zip(self.fields, values),
+            max_concurrency
+        )))
+
+    def passes(self, record):
+        """ Returns True if all fields and their rules pass for the given record, stopping at the
+        first failing field. No results are built. Fields are checked cheapest first; the number
+        of fields skipped is counted by `self.fail_fast`.
+
+        Keyword arguments:
+        record dict -- A mapping of field titles to the values to validate.
+        """
+        missing = self.missing
+        values = [record.get(title, missing) for title in self.titles]
+        return self.fail_fast.passes(values) and self.graph.passes(values)
+
+    def stream(self, records, failures_only=False, max_failures=None):
+        """ Lazily validates records from any iterable, including unbounded generators, yielding
+        an (index, Result) tuple for each record. Neither records nor results are retained, so
+        memory use does not grow with the length of the stream.
+
+        Keyword arguments:
+        records iterable   -- Mappings of field titles to the values to validate.
+        failures_only bool -- Only yield records that failed validation. (optional)
+        max_failures int   -- Stop once this many records have failed validation. (optional)
+        """
+        failures = 0
+        for index, record in enumerate(records):
+            if failures_only:
+                if self.passes(record):
+                    continue
+                r = self.validate(record)
+            else:
+                r = self.validate(record)
+                if r.passed:
+                    yield index, r
+                    continue
+
+            yield index, r
+            failures += 1
+            if max_failures is not None and failures >= max_failures:
+                return
+
+    def check_many(self, records):
+        """ Applies all fields and their rules against every given record, column-wise, and
+        returns a list per field of (passed, errors) tuples in the same order as the records.
+
+        Keyword arguments:
+        records list -- Mappings of field titles to the values to validate.
+        """
+        missing = self.missing
+        return [
+            f.check_column([r.get(f.title, missing) for r in records])
+            for f in self.fields
+        ]
+
+    def collate_many(self, records, checked):
+        """ Builds a list of Result instances from the output of method `check_many`.
+
+        Keyword arguments:
+        records list -- The records given to method `check_many`.
+        checked list -- The output of method `check_many` for the given records.
+        """
+        missing = self.missing
+        titles = self.titles
+        failures = [[] for _ in records]
+        for column in checked:
+            for row, (_, errors) in zip(failures, column):
+                row.append(errors or None)
+        relate = self.graph.relate
+        collated = []
+        for r, row in zip(records, failures):
+            values = [r.get(title, missing) for title in titles]
+            collated.append(result.Result(titles, values, relate(values, row)))
+        return collated
+
+    def validate_many(self, records):
+        """ Applies all fields and their rules against every given record and returns a list of
+        Result instances in the same order. Work is organised column-wise; each rule is applied
+        against all values of its field at once.
+
+        Keyword arguments:
+        records iterable -- Mappings of field titles to the values to validate.
+        """
+        records = list(records)
+        return self.collate_many(records, self.check_many(records))
+
+    def report(self, records, chunk_size=parallel.CHUNK_SIZE):
+        """ Applies all fields and their rules against records from any iterable and returns an
+        instance of class `batch.BatchReport`, which stores each distinct error message once and
+        each failure as a few integers. Records are validated chunk by chunk with method
+        `validate_many`, and results are discarded once added to the report.
+
+        Keyword arguments:
+        records iterable -- Mappings of field titles to the values to validate.
+        chunk_size int   -- Number of records validated at a time. (optional)
+        """
+        report = batch.BatchReport(self.titles)
+        for chunk in parallel.chunks(records, chunk_size):
+            report.extend(self.validate_many(chunk))
+        return report
+
+    def validate_columns(self, _columns):
+        """ Applies all fields and their rules against columns of values, rather than records, and
+        returns an instance of class `columns.Report`. NumPy arrays are validated with vectorised
+        operations where possible.
+
+        Keyword arguments:
+        _columns dict -- A map of field titles to NumPy arrays, `array.array`s or lists of values.
+        """
+        return columns.validate(self.fields, _columns, self.missing)
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+
+class Slotted(object):
+    """ Base class for classes using __slots__. Provides pickling support for every protocol,
+    including attributes of derived classes that do not define __slots__. """
+    __slots__ = ()
+
+    def __getstate__(self):
+        """ Returns a dict of all assigned slot and instance attributes. """
+        state = dict(getattr(self, '__dict__', {}))
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if name not in ('__dict__', '__weakref__') and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        """ Restores all attributes returned by method `__getstate__`. """
+        for name, value in state.iteritems():
+            setattr(self, name, value)
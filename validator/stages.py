@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+""" Normalisation stages declared once per field, such as stripping whitespace, case folding,
+Unicode normalisation and coercion. Stages are applied in order, and each stage produces a view
+of the field value named after it that includes every stage before it. Rules read the value as
+given unless they name a view with method `Rule.using`, so each view is computed at most once per
+validation however many rules read it:
+
+    field.Field('country', normalise=['strip', 'casefold']).append([
+          rules.IsRequired().using('strip')
+        , rules.IsInList(['gb', 'us']).using('casefold')
+    ])
+
+Values that a stage cannot be applied to, eg: 'abc' coerced by 'int', are passed on unchanged,
+so rules such as IsType report them.
+"""
+import decimal
+import index
+import operator
+import slots
+import unicodedata
+
+def strip(value):
+    """ Returns the given string without leading and trailing whitespace. memoryviews are copied
+    to a byte string first. """
+    if type(value) is memoryview:
+        value = value.tobytes()
+    return value.strip()
+
+
+def casefold(value):
+    """ Returns the given string in lower case, including non-ASCII letters, as per function
+    `index.casefold`. memoryviews are copied to a byte string first. """
+    if type(value) is memoryview:
+        value = value.tobytes()
+    return index.casefold(value)
+
+
+class UnicodeForm(slots.Slotted):
+    """ Stage applying a Unicode normalisation form. Byte strings are decoded as UTF-8 and encoded
+    again afterwards. """
+    __slots__ = ('form',)
+
+    def __init__(self, form):
+        """ Constructor that instantiates a class instance and properties.
+
+        Keyword arguments:
+        form str -- One of 'NFC', 'NFD', 'NFKC' or 'NFKD'.
+        """
+        self.form = form
+
+    def __call__(self, value):
+        if isinstance(value, unicode):
+            return unicodedata.normalize(self.form, value)
+        if isinstance(value, memoryview):
+            value = value.tobytes()
+        return unicodedata.normalize(self.form, str(value).decode('utf-8')).encode('utf-8')
+
+
+# Stages that may be named by fields.
+STAGES = {
+    'strip': strip,
+    'casefold': casefold,
+    'nfc': UnicodeForm('NFC'),
+    'nfd': UnicodeForm('NFD'),
+    'nfkc': UnicodeForm('NFKC'),
+    'nfkd': UnicodeForm('NFKD'),
+    'int': int,
+    'float': float,
+    'decimal': decimal.Decimal
+}
+
+# Errors raised by stages that cannot be applied to a value.
+ERRORS = (ValueError, TypeError, AttributeError, ArithmeticError)
+
+# Faster equivalents of stages, for values other than memoryviews.
+CALLERS = {
+    strip: operator.methodcaller('strip'),
+    casefold: index.casefold
+}
+
+class Pipeline(slots.Slotted):
+    """ An ordered list of normalisation stages. View 0 is the value as given, and view n is the
+    value after the first n stages. """
+    __slots__ = ('names', 'stages', 'callers')
+
+    def __init__(self, stages):
+        """ Constructor that instantiates a class instance and properties. Raises ValueError if a
+        stage is unknown or named twice.
+
+        Keyword arguments:
+        stages list -- Names of stages in module attribute STAGES, or (name, callable) tuples.
+        """
+        self.names = []
+        self.stages = []
+        for stage in stages:
+            if isinstance(stage, basestring):
+                if stage not in STAGES:
+                    raise ValueError('Unknown normalisation stage `{}`'.format(stage))
+                name, function = stage, STAGES[stage]
+            else:
+                name, function = stage
+            if name in self.names:
+                raise ValueError('Normalisation stage `{}` is given more than once'.format(name))
+            self.names.append(name)
+            self.stages.append(function)
+        self.names = tuple(self.names)
+        self.stages = tuple(self.stages)
+        self.callers = tuple(CALLERS.get(stage, stage) for stage in self.stages)
+
+    def __getstate__(self):
+        """ Faster equivalents of stages cannot be pickled, and are rebuilt once unpickled. """
+        return {'names': self.names, 'stages': self.stages}
+
+    def __setstate__(self, state):
+        self.names = state['names']
+        self.stages = state['stages']
+        self.callers = tuple(CALLERS.get(stage, stage) for stage in self.stages)
+
+    def __len__(self):
+        """ Implements built-in len() to return number of stages. """
+        return len(self.stages)
+
+    def position(self, view):
+        """ Returns the position of the view with the given name, or 0 for None. Raises ValueError
+        if there is no such stage.
+
+        Keyword arguments:
+        view str -- The name of a stage, or None for the value as given.
+        """
+        if view is None:
+            return 0
+        try:
+            return self.names.index(view) + 1
+        except ValueError:
+            raise ValueError('Unknown view `{}`; stages are `{}`'.format(view, '`, `'.join(self.names)))
+
+    def views(self, value, depth):
+        """ Returns a list of the views of the given value up to and including the given position.
+
+        Keyword arguments:
+        value mixed -- The value as given.
+        depth int   -- The position of the last view required.
+        """
+        views = [value]
+        if type(value) is memoryview:
+            value = value.tobytes()
+        for stage in self.callers[:depth]:
+            try:
+                value = stage(value)
+            except ERRORS:
+                pass
+            views.append(value)
+        return views
+
+    def columns(self, values, depth):
+        """ Same as method `views` for a whole column of values, returning a column per view.
+
+        Keyword arguments:
+        values list -- The values as given.
+        depth int   -- The position of the last view required.
+        """
+        columns = [values]
+        for stage in self.stages[:depth]:
+            column = []
+            for value in values:
+                try:
+                    value = stage(value)
+                except ERRORS:
+                    pass
+                column.append(value)
+            columns.append(column)
+            values = column
+        return columns